@@ -0,0 +1,101 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+import sys
+
+from benchmarks.compare import (
+    compare_results,
+    default_threshold,
+    format_comparison,
+    read_results,
+    write_results,
+)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks the search, predict and archive I/O of simple_learn",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    run = commands.add_parser("run", help="run the benchmarks and write the results")
+    run.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="numbers of samples of the synthetic datasets (default: 500 2000)",
+    )
+    run.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="timed calls of the predict and archive benchmarks (default: 5)",
+    )
+    run.add_argument(
+        "--groups",
+        nargs="+",
+        choices=["fit", "search", "predict", "archive"],
+        help="benchmark groups to run (default: all)",
+    )
+    run.add_argument(
+        "--output", "-o", default="benchmark_results.json", help="JSON results path"
+    )
+
+    compare = commands.add_parser("compare", help="compare results against a baseline")
+    compare.add_argument("baseline", help="JSON results of the baseline")
+    compare.add_argument("results", help="JSON results to compare")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=default_threshold,
+        help="relative change reported as a regression (default: 0.1)",
+    )
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    if args.command == "run":
+        # Imported here so comparing results does not import simple_learn
+        from benchmarks.suite import run_suite
+
+        results = run_suite(args.sizes, args.repeat, args.groups)
+        write_results(results, args.output)
+        print(f"Wrote {len(results['benchmarks'])} benchmarks to {args.output}")
+        return 0
+
+    rows = compare_results(
+        read_results(args.baseline), read_results(args.results), args.threshold
+    )
+    print(format_comparison(rows))
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(
+            f"\n{len(regressions)} benchmarks regressed by more than {args.threshold:.0%}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
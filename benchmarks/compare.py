@@ -0,0 +1,116 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+# Relative change of a benchmark reported as a regression by default
+default_threshold = 0.1
+
+
+def read_results(path):
+    """Reads the results of a benchmark run.
+
+    Parameters
+    ----------
+    path : str
+        The path of the JSON results
+
+    Returns
+    -------
+    dict
+        The metadata and benchmarks of the run
+    """
+
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def write_results(results, path):
+    """Writes the results of a benchmark run as JSON.
+
+    Parameters
+    ----------
+    results : dict
+        The metadata and benchmarks of the run
+    path : str
+        The path of the JSON results
+    """
+
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+        results_file.write("\n")
+
+
+def compare_results(baseline, results, threshold=default_threshold):
+    """Compares every benchmark of a run against a baseline run.
+
+    The change of a benchmark is relative to its baseline value
+    and positive when the benchmark got worse, whether a smaller
+    or a larger value is better.
+
+    Parameters
+    ----------
+    baseline : dict
+        The results of the baseline run
+    results : dict
+        The results of the compared run
+    threshold : float, optional
+        The relative change above which a benchmark regressed
+
+    Returns
+    -------
+    list
+        The (name, baseline value, value, change, regressed) of
+        every benchmark of both runs, sorted by name
+    """
+
+    rows = []
+    old, new = baseline["benchmarks"], results["benchmarks"]
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name]["value"], new[name]["value"]
+        change = (after - before) / before if before else 0.0
+        if new[name]["higher_is_better"]:
+            change = -change
+        rows.append((name, before, after, change, change > threshold))
+    return rows
+
+
+def format_comparison(rows):
+    """Formats the comparison of two runs as a table.
+
+    Parameters
+    ----------
+    rows : list
+        The rows returned by compare_results
+
+    Returns
+    -------
+    str
+        The table of every benchmark, regressions are marked
+    """
+
+    width = max([len("benchmark")] + [len(row[0]) for row in rows])
+    lines = [f"{'benchmark':<{width}}  {'baseline':>12}  {'current':>12}  change"]
+    for name, before, after, change, regressed in rows:
+        mark = "  REGRESSION" if regressed else ""
+        lines.append(
+            f"{name:<{width}}  {before:>12.6g}  {after:>12.6g}  {change:+7.1%}{mark}"
+        )
+    return "\n".join(lines)
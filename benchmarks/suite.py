@@ -0,0 +1,286 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+import sklearn
+from sklearn.datasets import make_classification, make_regression
+
+from simple_learn.classifiers import SimpleClassifier, SimpleClassifierList
+from simple_learn.classifiers import param_grid as classifier_grid
+from simple_learn.regressors import SimpleRegressor, SimpleRegressorList
+from simple_learn.regressors import param_grid as regressor_grid
+from simple_learn.search import import_estimators, search_models
+from simple_learn.search.scoring import classifier_scoring, regressor_scoring
+from simple_learn.version import version
+
+# Number of samples of the synthetic datasets benchmarked by default
+default_sizes = [500, 2000]
+
+# Smallest number of rows predicted when measuring throughput
+min_predict_rows = 10000
+
+# Groups of benchmarks the suite runs, predict and archive reuse the fit
+benchmark_groups = ["fit", "search", "predict", "archive"]
+
+# Whether a larger value is better, for every unit of measurement
+higher_is_better = {"s": False, "rows/s": True, "bytes": False}
+
+
+def make_datasets(n_samples, n_features=20, random_state=0):
+    """Creates the synthetic classification and regression
+    datasets of a benchmark size.
+
+    Parameters
+    ----------
+    n_samples : int
+        The number of samples of both datasets
+    n_features : int, optional
+        The number of features of both datasets
+    random_state : int, optional
+        The seed of both datasets
+
+    Returns
+    -------
+    dict
+        The (features, labels) of the classifier and regressor
+        datasets
+    """
+
+    clf_x, clf_y = make_classification(
+        n_samples=n_samples,
+        n_features=n_features,
+        n_informative=n_features // 2,
+        n_classes=3,
+        random_state=random_state,
+    )
+    rgr_x, rgr_y = make_regression(
+        n_samples=n_samples,
+        n_features=n_features,
+        n_informative=n_features // 2,
+        noise=0.1,
+        random_state=random_state,
+    )
+    return {"classifier": (clf_x, clf_y), "regressor": (rgr_x, rgr_y)}
+
+
+def _timed(function, repeat=1):
+    # The median wall-clock seconds of repeated calls
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations))
+
+
+def _record(results, name, value, unit):
+    results[name] = {
+        "value": float(value),
+        "unit": unit,
+        "higher_is_better": higher_is_better[unit],
+    }
+
+
+def bench_fit(results, data, size):
+    """Times the model search of every simple_learn class.
+
+    Parameters
+    ----------
+    results : dict
+        The benchmark results, updated in place
+    data : dict
+        The datasets returned by make_datasets
+    size : int
+        The number of samples of the datasets
+
+    Returns
+    -------
+    dict
+        The fitted SimpleClassifier and SimpleRegressor
+    """
+
+    models = {}
+    for ModelClass, kind in [
+        (SimpleClassifier, "classifier"),
+        (SimpleClassifierList, "classifier"),
+        (SimpleRegressor, "regressor"),
+        (SimpleRegressorList, "regressor"),
+    ]:
+        model = ModelClass()
+        train_x, train_y = data[kind]
+        duration = _timed(lambda: model.fit(train_x, train_y, use_cache=False))
+        _record(results, f"fit/{ModelClass.__name__}/n={size}", duration, "s")
+        if ModelClass in [SimpleClassifier, SimpleRegressor]:
+            models[ModelClass.__name__] = model
+    return models
+
+
+def bench_search(results, data, size):
+    """Measures the search time of every model algorithm, the
+    seconds spent fitting and scoring its candidates.
+
+    Parameters
+    ----------
+    results : dict
+        The benchmark results, updated in place
+    data : dict
+        The datasets returned by make_datasets
+    size : int
+        The number of samples of the datasets
+    """
+
+    for grid, scoring, kind in [
+        (classifier_grid, classifier_scoring, "classifier"),
+        (regressor_grid, regressor_scoring, "regressor"),
+    ]:
+        train_x, train_y = data[kind]
+        search_results = search_models(
+            import_estimators(grid.model_import_map),
+            grid.model_param_map,
+            train_x,
+            train_y,
+            3,
+            scoring,
+            classifier=kind == "classifier",
+            refit="auto",
+            defer_refit=True,
+        )
+        for result in search_results:
+            if result.search_duration is not None:
+                name = f"search/{kind}/{result.name}/n={size}"
+                _record(results, name, result.search_duration, "s")
+
+
+def bench_predict(results, models, data, size, repeat=5):
+    """Measures the single row latency and the throughput of
+    predict, with and without compiling the model.
+
+    Parameters
+    ----------
+    results : dict
+        The benchmark results, updated in place
+    models : dict
+        The fitted models returned by bench_fit
+    data : dict
+        The datasets returned by make_datasets
+    size : int
+        The number of samples of the datasets
+    repeat : int, optional
+        The number of timed calls, their median is recorded
+    """
+
+    for name, model in models.items():
+        pred_x = data["classifier" if name == "SimpleClassifier" else "regressor"][0]
+        rows = np.resize(pred_x, (max(min_predict_rows, len(pred_x)), pred_x.shape[1]))
+        for variant in ["", "compiled/"]:
+            if variant:
+                try:
+                    model.compile()
+                except ValueError:
+                    break
+            predictor = model.compiled if variant else model.sk_model
+            prefix = f"predict/{name}/{variant}"
+            latency = _timed(lambda: predictor.predict(pred_x[:1]), repeat)
+            _record(results, f"{prefix}latency/n={size}", latency, "s")
+            duration = _timed(lambda: model.predict(rows), repeat)
+            _record(
+                results, f"{prefix}throughput/n={size}", len(rows) / duration, "rows/s"
+            )
+        model.compiled = None
+
+
+def bench_archive(results, models, size, repeat=5):
+    """Times saving and loading the archive of every fitted model
+    and records its size.
+
+    Parameters
+    ----------
+    results : dict
+        The benchmark results, updated in place
+    models : dict
+        The fitted models returned by bench_fit
+    size : int
+        The number of samples of the datasets
+    repeat : int, optional
+        The number of timed calls, their median is recorded
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, model in models.items():
+            path = os.path.join(directory, name)
+            duration = _timed(lambda: model.save(path), repeat)
+            _record(results, f"archive/{name}/save/n={size}", duration, "s")
+            nbytes = os.path.getsize(f"{path}.zip")
+            _record(results, f"archive/{name}/size/n={size}", nbytes, "bytes")
+            loaded = type(model)()
+            duration = _timed(lambda: loaded.load(f"{path}.zip"), repeat)
+            _record(results, f"archive/{name}/load/n={size}", duration, "s")
+
+
+def run_suite(sizes=None, repeat=5, groups=None):
+    """Runs the benchmarks on synthetic datasets of every size.
+
+    Parameters
+    ----------
+    sizes : list, optional
+        The numbers of samples of the benchmarked datasets
+    repeat : int, optional
+        The number of timed calls of the predict and archive
+        benchmarks, their median is recorded
+    groups : list, optional
+        The benchmark groups to run, by default fit, search,
+        predict and archive
+
+    Returns
+    -------
+    dict
+        The metadata of the environment and the value, unit and
+        direction of every benchmark
+    """
+
+    sizes = default_sizes if sizes is None else sizes
+    groups = benchmark_groups if groups is None else groups
+    results = {}
+    for size in sizes:
+        data = make_datasets(size)
+        models = bench_fit(results, data, size) if "fit" in groups else {}
+        if "search" in groups:
+            bench_search(results, data, size)
+        if "predict" in groups and models:
+            bench_predict(results, models, data, size, repeat)
+        if "archive" in groups and models:
+            bench_archive(results, models, size, repeat)
+    metadata = {
+        "simple_learn": version,
+        "sklearn": sklearn.__version__,
+        "numpy": np.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "sizes": list(sizes),
+        "repeat": repeat,
+    }
+    return {"metadata": metadata, "benchmarks": results}
@@ -87,5 +87,30 @@ function run_tests {
     python -W ignore -m unittest tests/classifiers/simple_classifier_list_tests.py -v
     python -W ignore -m unittest tests/regressors/simple_regressor_tests.py -v
     python -W ignore -m unittest tests/regressors/simple_regressor_list_tests.py -v
+    python -W ignore -m unittest tests/search/search_models_tests.py -v
+    python -W ignore -m unittest tests/search/adaptive_tests.py -v
+    python -W ignore -m unittest tests/search/score_cache_tests.py -v
+    python -W ignore -m unittest tests/search/candidate_table_tests.py -v
+    python -W ignore -m unittest tests/search/shared_data_tests.py -v
+    python -W ignore -m unittest tests/search/stream_tests.py -v
+    python -W ignore -m unittest tests/search/incremental_tests.py -v
+    python -W ignore -m unittest tests/inference/chunked_tests.py -v
+    python -W ignore -m unittest tests/inference/compiled_tests.py -v
+    python -W ignore -m unittest tests/inference/async_predictor_tests.py -v
+    python -W ignore -m unittest tests/encoders/archive_tests.py -v
+    python -W ignore -m unittest tests/registry/model_registry_tests.py -v
+    python -W ignore -m unittest tests/serve/server_tests.py -v
+    python -W ignore -m unittest tests/search/estimators_tests.py -v
+    python -W ignore -m unittest tests/benchmarks/compare_tests.py -v
+    python -W ignore -m unittest tests/search/events_tests.py -v
+    python -W ignore -m unittest tests/search/memory_tests.py -v
+    python -W ignore -m unittest tests/search/isolation_tests.py -v
 
 }
+
+function run_benchmarks {
+    python -m benchmarks run --output benchmark_results.json
+    if [ -n "$1" ]; then
+        python -m benchmarks compare "$1" benchmark_results.json
+    fi
+}
@@ -25,13 +25,17 @@ from simple_learn.version import version
 with open("simple_learn/README.md", "r") as fh:
     long_description = fh.read()
 
-requirements = ["numpy", "scikit-learn>=0.23.1"]
+requirements = ["numpy", "scikit-learn>=0.24"]
 simple_packages = [
     "simple_learn",
     "simple_learn.classifiers",
     "simple_learn.regressors",
     "simple_learn.encoders",
     "simple_learn.simple_logging",
+    "simple_learn.search",
+    "simple_learn.inference",
+    "simple_learn.registry",
+    "simple_learn.serve",
 ]
 
 setup(
@@ -18,11 +18,28 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from simple_learn.classifiers import *
-from simple_learn.encoders import *
-from simple_learn.regressors import *
-from simple_learn.simple_logging import *
+from simple_learn._lazy import lazy_exports
 from simple_learn.version import version as current_version
 
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "SimpleClassifier": "simple_learn.classifiers",
+        "SimpleClassifierList": "simple_learn.classifiers",
+        "SimpleClassifierListObject": "simple_learn.classifiers",
+        "SimpleRegressor": "simple_learn.regressors",
+        "SimpleRegressorList": "simple_learn.regressors",
+        "SimpleRegressorListObject": "simple_learn.regressors",
+        "classifiers": "simple_learn.classifiers",
+        "encoders": "simple_learn.encoders",
+        "inference": "simple_learn.inference",
+        "registry": "simple_learn.registry",
+        "regressors": "simple_learn.regressors",
+        "search": "simple_learn.search",
+        "serve": "simple_learn.serve",
+        "simple_logging": "simple_learn.simple_logging",
+    },
+)
+
 __name__ = "simple_learn"
 __version__ = current_version
@@ -0,0 +1,68 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import importlib
+import sys
+
+
+def lazy_exports(package, exports):
+    """Builds the module __getattr__ and __dir__ of a package whose
+    public names are only imported on first use.
+
+    Importing a package then costs nothing until one of its names
+    is used, the imported names are cached in the package. Python
+    3.6 has no module __getattr__, the names are imported with the
+    package instead.
+
+    Parameters
+    ----------
+    package : str
+        The name of the package
+    exports : dict
+        The module of every public name, a name whose module is
+        package.name is the submodule itself
+
+    Returns
+    -------
+    tuple
+        The __getattr__, __dir__ and __all__ of the package, the
+        submodules are left out of __all__
+    """
+
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(exports[name])
+        if exports[name] != f"{package}.{name}":
+            module = getattr(module, name)
+        namespace[name] = module
+        return module
+
+    def __dir__():
+        return sorted(set(namespace) | set(exports))
+
+    if sys.version_info < (3, 7):
+        for name in exports:
+            __getattr__(name)
+
+    public = [name for name in exports if exports[name] != f"{package}.{name}"]
+    return __getattr__, __dir__, public
@@ -18,8 +18,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from simple_learn.classifiers.simple_classifier import SimpleClassifier
-from simple_learn.classifiers.simple_classifier_list import (
-    SimpleClassifierList,
-    SimpleClassifierListObject,
+from simple_learn._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "SimpleClassifier": "simple_learn.classifiers.simple_classifier",
+        "SimpleClassifierList": "simple_learn.classifiers.simple_classifier_list",
+        "SimpleClassifierListObject": "simple_learn.classifiers.simple_classifier_list",
+    },
 )
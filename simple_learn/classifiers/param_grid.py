@@ -77,3 +77,18 @@ model_param_map = {
     },
     "SGDClassifier": {"alpha": [0.0001, 0.001, 0.01, 0.1, 1, 10]},
 }
+
+# Module of every model algorithm, only the searched ones are imported
+model_import_map = {
+    "BernoulliNB": "sklearn.naive_bayes",
+    "ComplementNB": "sklearn.naive_bayes",
+    "DecisionTreeClassifier": "sklearn.tree",
+    "ExtraTreeClassifier": "sklearn.tree",
+    "GradientBoostingClassifier": "sklearn.ensemble",
+    "HistGradientBoostingClassifier": "sklearn.ensemble",
+    "KNeighborsClassifier": "sklearn.neighbors",
+    "Perceptron": "sklearn.linear_model",
+    "RandomForestClassifier": "sklearn.ensemble",
+    "RidgeClassifier": "sklearn.linear_model",
+    "SGDClassifier": "sklearn.linear_model",
+}
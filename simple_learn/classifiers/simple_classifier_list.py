@@ -20,18 +20,28 @@
 
 import json
 import logging
-import time
 
 import numpy as np
-from sklearn.metrics import f1_score, jaccard_score
-from sklearn.model_selection import GridSearchCV
-from sklearn.utils import all_estimators
-from tqdm import tqdm
 
 from simple_learn.classifiers import SimpleClassifier
-from simple_learn.classifiers.param_grid import model_param_map
+from simple_learn.classifiers.param_grid import (
+    model_import_map,
+    model_param_map,
+)
 from simple_learn.encoders import simple_model_encoder
-from simple_learn.simple_logging import custom_logging
+from simple_learn.search import CandidateTable, ScoreCache, search_models
+from simple_learn.search.estimators import import_estimators
+from simple_learn.search.events import SearchEvents
+from simple_learn.search.scoring import classifier_scoring
+from simple_learn.search.shared_data import open_data
+from simple_learn.simple_logging import custom_logging, event_sinks
+
+# Ranking metric for each scoring option
+metric_map = {
+    "auto": "Training Accuracy",
+    "jaccard": "Jaccard Score",
+    "f1": "F1 Score",
+}
 
 
 class SimpleClassifierListObject:
@@ -64,6 +74,7 @@ class SimpleClassifierListObject:
             "Rank": self.rank,
             "Training Duration": "{}s".format(self.clf.train_duration),
             "GridSearch Duration": "{}s".format(self.clf.gridsearch_duration),
+            "Peak Memory": "{}MB".format(self.clf.peak_memory),
             "Parameters": self.clf.attributes,
             "Metrics": self.clf.metrics,
             "Index": self.rank - 1,
@@ -79,6 +90,7 @@ class SimpleClassifierListObject:
             "Rank": self.rank,
             "Training Duration": "{}s".format(self.clf.train_duration),
             "GridSearch Duration": "{}s".format(self.clf.gridsearch_duration),
+            "Peak Memory": "{}MB".format(self.clf.peak_memory),
             "Parameters": self.clf.attributes,
             "Metrics": self.clf.metrics,
             "Index": self.rank - 1,
@@ -99,29 +111,42 @@ class SimpleClassifierList:
     ----------
     ranked_list : list
         the ranked list of SimpleClassifiers
+    failed_models : list
+        the list of failed model algorithms
+    failure_reasons : dict
+        the reason every failed model algorithm failed
+    truncated_models : list
+        the list of model algorithms cut short by the time budget
     metric : str {auto, jaccard, f1}
         the scoring metric for ranking models
+    cv_results : simple_learn.search.CandidateTable
+        the cross validation results of every evaluated candidate
     logger : logging.Logger
         logger for notifying user of warnings
 
     Methods
     -------
-    fit(train_x, train_y, folds=3)
+    fit(train_x, train_y, folds=3, search="grid", ...)
         Fits a given dataset onto SimpleClassifier and
         creates a ranked list based on scores
     pop(index=0)
         Removes a SimpleClassifier at a specific index
         for usage
+    rerank(scoring)
+        Ranks the list by another scoring metric without
+        refitting
+    top_k(k=1, scoring=None, algorithm=None)
+        Selects the best evaluated candidates of every model
+        algorithm
     """
 
     def __init__(self, scoring="auto"):
         self.ranked_list = []
+        self.failed_models = []
+        self.failure_reasons = {}
+        self.truncated_models = []
+        self.cv_results = CandidateTable([], [], {}, [], [])
         self.logger = logging.getLogger()
-        metric_map = {
-            "auto": "Training Accuracy",
-            "jaccard": "Jaccard Score",
-            "f1": "F1 Score",
-        }
         self.metric = metric_map[scoring]
 
     def __str__(self):
@@ -142,7 +167,22 @@ class SimpleClassifierList:
             r += 1
         return "\n".join(res) if len(res) > 1 else "The List is Empty!"
 
-    def fit(self, train_x, train_y, folds=3):
+    def fit(
+        self,
+        train_x,
+        train_y,
+        folds=3,
+        search="grid",
+        time_budget=None,
+        n_iter=20,
+        use_cache=False,
+        defer_refit=True,
+        max_samples=None,
+        callbacks=None,
+        memory_budget=None,
+        timeout=None,
+        random_state=0,
+    ):
         """Trains all classification models from
         parameter grid by running model algorithm search.
 
@@ -151,61 +191,124 @@ class SimpleClassifierList:
 
         Parameters
         ----------
-        train_x : numpy.ndarray
-            The features for training classification model
-        train_y : numpy.ndarray
-            The corresponding label for feature array
+        train_x : numpy.ndarray or str
+            The features for training classification model, or the path
+            of a .npy file that is memory mapped instead of loaded
+        train_y : numpy.ndarray or str
+            The corresponding label for feature array, or the path
+            of a .npy file
         folds : int, optional
             The number of folds for cross validation
+        search : str {grid, halving, adaptive}, optional
+            The hyper-parameter search strategy, halving evaluates
+            candidates on growing budgets and drops the weakest,
+            adaptive samples candidates guided by previous scores
+        time_budget : float, optional
+            The wall-clock seconds available for the search, once
+            they run out the best model found so far is kept
+        n_iter : int, optional
+            The number of candidates evaluated per model algorithm
+            by the adaptive search
+        use_cache : bool, optional
+            Whether to reuse the scores of candidates evaluated on the
+            same data by earlier searches, kept in the score cache
+            directory
+        defer_refit : bool, optional
+            Whether to refit the best candidate of each model
+            algorithm only once its SimpleClassifier is popped or used for
+            prediction
+        max_samples : int, optional
+            The largest number of samples to search on, larger
+            datasets are searched on a random subsample, without it
+            every model algorithm holds as many samples in memory as
+            its workers can fit
+        callbacks : list, optional
+            The sinks called with every search event, by default a
+            progress bar, an empty list searches without writing to
+            the terminal
+        memory_budget : int, optional
+            The bytes available to the worker processes of the search,
+            fewer fits run at once and the candidates that can't fit
+            it are skipped
+        timeout : float, optional
+            The wall-clock seconds every model algorithm may search
+            for, counted from its first fit however many of its fits
+            run in parallel, one that runs longer or crashes its
+            worker is added to the failed models and the search
+            carries on
+        random_state : int, optional
+            The seed of the adaptive search and of the max_samples
+            subsample, the same seed searches the same candidates
         """
+        train_x, train_y = open_data(
+            train_x, train_y, max_samples=max_samples, random_state=random_state
+        )
         log = logging.getLogger(__name__)
         log.setLevel(logging.INFO)
-        log.addHandler(custom_logging.TqdmLoggingHandler())
-        with tqdm(
-            total=(len(model_param_map)),
-            desc="Fitting Models",
-            unit=" Algorithm",
-            ncols=100,
-        ) as progressbar:
-            estimators = all_estimators(type_filter="classifier")
-            for name, ClassifierClass in estimators:
-                if name in model_param_map:
-                    param_grid = model_param_map[name]
-                    grid_clf = GridSearchCV(
-                        ClassifierClass(),
-                        param_grid,
-                        cv=folds,
-                        scoring="accuracy",
-                        verbose=0,
-                        n_jobs=-1,
-                    )
-                    progressbar.update(1)
-                    start = time.time()
-                    try:
-                        grid_clf.fit(train_x, train_y)
-                    except BaseException as error:
-                        log.info(f"{name} failed due to, Error : {error}.")
-                        continue
-                    end = time.time()
-                    clf = SimpleClassifier()
-                    clf.metrics["Training Accuracy"] = grid_clf.best_score_
-                    pred_y = grid_clf.predict(train_x)
-                    clf.metrics["Jaccard Score"] = jaccard_score(
-                        train_y, pred_y, average="macro"
+        if callbacks is None:
+            log.addHandler(custom_logging.TqdmLoggingHandler())
+            callbacks = [event_sinks.TqdmSink(desc="Fitting Models", unit=" Algorithm")]
+        with SearchEvents(callbacks) as events:
+            estimators = import_estimators(model_import_map)
+            results = search_models(
+                estimators,
+                model_param_map,
+                train_x,
+                train_y,
+                folds,
+                classifier_scoring,
+                classifier=True,
+                search=search,
+                time_budget=time_budget,
+                n_iter=n_iter,
+                cache=ScoreCache() if use_cache else None,
+                events=events,
+                memory_budget=memory_budget,
+                algorithm_timeout=timeout,
+                random_state=random_state,
+                refit="auto",
+                defer_refit=defer_refit,
+            )
+            for grid_clf in results:
+                name = grid_clf.name
+                if grid_clf.truncated:
+                    self.truncated_models.append(name)
+                if grid_clf.error is not None:
+                    self.failed_models.append(name)
+                    self.failure_reasons[name] = (
+                        f"{type(grid_clf.error).__name__}: {grid_clf.error}"
                     )
-                    clf.metrics["F1 Score"] = f1_score(train_y, pred_y, average="macro")
+                    log.info(f"{name} failed due to, Error : {grid_clf.error}.")
+                    continue
+                clf = SimpleClassifier()
+                scores = grid_clf.best_scores()
+                for scoring, metric in metric_map.items():
+                    clf.metrics[metric] = scores[scoring]
+                if grid_clf.best_estimator_ is None:
+                    clf._defer_refit(grid_clf, train_x, train_y)
+                else:
                     clf.sk_model = grid_clf.best_estimator_
-                    clf.name = name
-                    clf.attributes = grid_clf.best_params_
-                    clf.train_duration = grid_clf.refit_time_
-                    clf.gridsearch_duration = end - start
-                    self.ranked_list.append(clf)
+                clf.name = name
+                clf.attributes = grid_clf.best_params_
+                clf.train_duration = grid_clf.refit_time_
+                clf.gridsearch_duration = grid_clf.search_duration
+                clf.peak_memory = (
+                    None
+                    if grid_clf.peak_memory is None
+                    else round(grid_clf.peak_memory / 2**20, 1)
+                )
+                self.ranked_list.append(clf)
+            self.cv_results = CandidateTable.from_results(
+                results,
+                {metric: (scoring, 1) for scoring, metric in metric_map.items()},
+            )
             metrik = lambda clf: clf.metrics[self.metric]
             self.ranked_list.sort(reverse=True, key=metrik)
 
     def pop(self, index=0):
         """Removes SimpleClassifier from a specific
-        index in ranked list.
+        index in ranked list and fits its model if the
+        refit was deferred.
 
         Parameters
         ----------
@@ -214,4 +317,43 @@ class SimpleClassifierList:
             being removed from ranked list
         """
 
-        return self.ranked_list.pop(index)
+        clf = self.ranked_list.pop(index)
+        clf.materialize()
+        return clf
+
+    def rerank(self, scoring):
+        """Ranks the list by another scoring metric without
+        refitting any model.
+
+        Parameters
+        ----------
+        scoring : str {auto, jaccard, f1}
+            The scoring metric for ranking models
+        """
+
+        self.metric = metric_map[scoring]
+        metrik = lambda clf: clf.metrics[self.metric]
+        self.ranked_list.sort(reverse=True, key=metrik)
+
+    def top_k(self, k=1, scoring=None, algorithm=None):
+        """Selects the best evaluated candidates of every
+        model algorithm from the cross validation results.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of candidates per model algorithm
+        scoring : str {auto, jaccard, f1}, optional
+            The scoring metric for ranking candidates, defaults to
+            the scoring metric of the list
+        algorithm : str, optional
+            The model algorithm to select candidates from
+
+        Returns
+        -------
+        simple_learn.search.CandidateTable
+            The selected candidates ordered from best to worst
+        """
+
+        metric = self.metric if scoring is None else metric_map[scoring]
+        return self.cv_results.filter(algorithm=algorithm).top_k(metric, k=k)
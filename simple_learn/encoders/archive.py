@@ -0,0 +1,276 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import os
+import pickle
+import struct
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+from joblib import load
+
+from simple_learn.inference.compiled import CompiledModel
+
+# Byte alignment of the raw array buffers inside an archive
+buffer_alignment = 64
+
+# Size of a zip local file header without its name and extra field
+_local_header_size = 30
+
+# Arrays smaller than this stay inside the pickle stream
+min_buffer_bytes = 64 * 1024
+
+# Out-of-band buffers need pickle protocol 5, from Python 3.8 on,
+# older interpreters keep every array inside the pickle stream
+_out_of_band = pickle.HIGHEST_PROTOCOL >= 5
+
+# Extra field id used to pad entries to the buffer alignment
+_padding_id = 0xD935
+
+
+def _entry_names(prefix):
+    return {
+        "metadata": f"{prefix}.json",
+        "model": f"{prefix}.pkl",
+        "buffers": f"{prefix}_buffers/",
+        "legacy": f"{prefix}.joblib",
+        "compiled": f"{prefix}_compiled.npz",
+    }
+
+
+def _aligned_info(zf, name, size):
+    # Pads the local header so the entry data starts aligned
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    info.file_size = size
+    start = zf.fp.tell() + _local_header_size + len(name.encode("utf-8"))
+    if size * 1.05 > zipfile.ZIP64_LIMIT:
+        # zipfile appends its zip64 extra field after the padding
+        start += 20
+    padding = -(start + 4) % buffer_alignment
+    info.extra = struct.pack("<HH", _padding_id, padding) + bytes(padding)
+    return info
+
+
+def _write(file, prefix, metadata, sk_model, compiled):
+    names = _entry_names(prefix)
+    buffers = []
+
+    def out_of_band(buffer):
+        if buffer.raw().nbytes < min_buffer_bytes:
+            return True
+        buffers.append(buffer)
+        return False
+
+    if _out_of_band:
+        model = pickle.dumps(sk_model, protocol=5, buffer_callback=out_of_band)
+    else:
+        model = pickle.dumps(sk_model, protocol=4)
+    with zipfile.ZipFile(file, mode="w", allowZip64=True) as zf:
+        zf.writestr(names["metadata"], metadata)
+        zf.writestr(names["model"], model)
+        for index, buffer in enumerate(buffers):
+            data = buffer.raw()
+            info = _aligned_info(zf, f"{names['buffers']}{index}", data.nbytes)
+            with zf.open(info, mode="w") as fp:
+                fp.write(data)
+        if compiled is not None:
+            with zf.open(names["compiled"], mode="w") as fp:
+                compiled.save(fp)
+
+
+def write_archive(file, prefix, metadata, sk_model, compiled=None):
+    """Writes a model archive straight into a file without
+    temporary files.
+
+    From Python 3.8 on, the large arrays of the sklearn model are
+    stored uncompressed and aligned, so they can be memory mapped
+    when the archive is read. Archives written to a path appear atomically, a reader
+    never sees a partially written archive.
+
+    Parameters
+    ----------
+    file : str or file-like object
+        The path of the archive, or a writable file object
+    prefix : str
+        The name prefix of the archive entries
+    metadata : str
+        The JSON description of the model
+    sk_model : sklearn.base.BaseEstimator
+        The fitted sklearn model
+    compiled : simple_learn.inference.CompiledModel, optional
+        The compiled form of the sklearn model
+    """
+
+    if not isinstance(file, (str, os.PathLike)):
+        _write(file, prefix, metadata, sk_model, compiled)
+        return
+
+    directory = os.path.dirname(os.path.abspath(file))
+    fd, path = tempfile.mkstemp(prefix=".simple_learn_", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            _write(fp, prefix, metadata, sk_model, compiled)
+            fp.flush()
+            os.fsync(fp.fileno())
+        # mkstemp creates the file readable by its owner only
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(path, 0o666 & ~umask)
+        os.replace(path, file)
+    except BaseException:
+        os.remove(path)
+        raise
+
+
+def read_metadata(file, prefix):
+    """Reads the JSON description of the model in an archive
+
+    Parameters
+    ----------
+    file : str or file-like object
+        The path of the archive, or a readable file object
+    prefix : str
+        The name prefix of the archive entries
+
+    Returns
+    -------
+    dict
+        The description of the model
+    """
+
+    with zipfile.ZipFile(file) as zf:
+        return json.loads(zf.read(_entry_names(prefix)["metadata"]).decode("UTF-8"))
+
+
+def archive_nbytes(file, prefix):
+    """Returns the bytes a model of an archive holds once read,
+    from the sizes of its entries without reading them
+
+    The pickle stream and the array buffers collected while saving
+    are stored uncompressed, so their entry sizes are the memory
+    of the read model.
+
+    Parameters
+    ----------
+    file : str or file-like object
+        The path of the archive, or a readable file object
+    prefix : str
+        The name prefix of the archive entries
+
+    Returns
+    -------
+    int
+        The number of bytes
+    """
+
+    names = _entry_names(prefix)
+    with zipfile.ZipFile(file) as zf:
+        return sum(
+            info.file_size
+            for info in zf.infolist()
+            if info.filename != names["metadata"] and info.filename.startswith(prefix)
+        )
+
+
+def _data_offset(zf, info):
+    zf.fp.seek(info.header_offset)
+    header = zf.fp.read(_local_header_size)
+    name_size, extra_size = struct.unpack("<HH", header[26:30])
+    return info.header_offset + _local_header_size + name_size + extra_size
+
+
+def read_model(file, prefix, mmap=False):
+    """Reads the sklearn model of an archive, archives saved
+    as joblib files are read as well.
+
+    Parameters
+    ----------
+    file : str or file-like object
+        The path of the archive, or a readable file object
+    prefix : str
+        The name prefix of the archive entries
+    mmap : bool, optional
+        Whether to map the model arrays from the archive instead of
+        reading them, only for paths
+
+    Returns
+    -------
+    sklearn.base.BaseEstimator
+        The fitted sklearn model
+    """
+
+    names = _entry_names(prefix)
+    mapped = mmap and isinstance(file, (str, os.PathLike))
+    with zipfile.ZipFile(file) as zf:
+        if names["model"] not in zf.namelist():
+            with zf.open(names["legacy"]) as fp:
+                return load(fp)
+
+        infos = {
+            int(info.filename[len(names["buffers"]) :]): info
+            for info in zf.infolist()
+            if info.filename.startswith(names["buffers"])
+        }
+        buffers = []
+        for index in range(len(infos)):
+            info = infos[index]
+            if mapped and info.compress_type == zipfile.ZIP_STORED:
+                buffers.append(
+                    np.memmap(
+                        file,
+                        dtype=np.uint8,
+                        mode="c",
+                        offset=_data_offset(zf, info),
+                        shape=(info.file_size,),
+                    )
+                )
+            else:
+                buffers.append(bytearray(zf.read(info)))
+        if not buffers:
+            return pickle.loads(zf.read(names["model"]))
+        return pickle.loads(zf.read(names["model"]), buffers=buffers)
+
+
+def read_compiled(file, prefix):
+    """Reads the compiled form of the model in an archive
+
+    Parameters
+    ----------
+    file : str or file-like object
+        The path of the archive, or a readable file object
+    prefix : str
+        The name prefix of the archive entries
+
+    Returns
+    -------
+    simple_learn.inference.CompiledModel
+        The compiled model, None if the model was not compiled
+    """
+
+    name = _entry_names(prefix)["compiled"]
+    with zipfile.ZipFile(file) as zf:
+        if name not in zf.namelist():
+            return None
+        with zf.open(name) as fp:
+            return CompiledModel.load(fp)
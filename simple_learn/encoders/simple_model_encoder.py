@@ -25,6 +25,8 @@ import numpy as np
 
 class npEncoder(json.JSONEncoder):
     def default(self, obj):
-        if isinstance(obj, np.int32):
-            return int(obj)
+        if isinstance(obj, (np.integer, np.floating, np.bool_)):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
         return json.JSONEncoder.default(self, obj)
@@ -0,0 +1,263 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import os
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+
+class AsyncPredictor:
+    """
+    A class used to batch the predictions of concurrent callers
+    into vectorized predict calls on a thread pool
+
+    Callers are queued until max_batch_size rows are waiting or the
+    oldest has waited max_wait seconds since it was queued, then the
+    whole batch is predicted at once and every caller receives its
+    own rows. The next batch is gathered while the previous ones are
+    predicted, up to max_concurrency batches at once. At most
+    max_pending callers are queued, further callers wait for room
+    before their rows are accepted.
+
+    ...
+
+    Attributes
+    ----------
+    model : object
+        the fitted model, any object with a predict method
+    max_batch_size : int
+        the number of rows that flushes a batch
+    max_wait : float
+        the seconds the oldest caller of a batch waits for more rows
+    max_pending : int
+        the number of callers queued before new callers wait
+    max_concurrency : int
+        the number of batches predicted at once
+    executor : concurrent.futures.Executor
+        the pool running predict, the loop default when None
+    requests : int
+        the number of predicted callers
+    batches : int
+        the number of predict calls
+    rows : int
+        the number of predicted rows
+    max_rows : int
+        the rows of the largest batch
+
+    Methods
+    -------
+    predict(rows)
+        Predicts a 2D array of rows
+    predict_one(row)
+        Predicts a single row
+    stats()
+        Returns the batch size and latency counters
+    close()
+        Stops the batching task
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch_size=64,
+        max_wait=0.002,
+        max_pending=1024,
+        executor=None,
+        max_concurrency=None,
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        if max_concurrency is None:
+            max_concurrency = os.cpu_count() or 1
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+        self.max_rows = 0
+        self._latencies = deque(maxlen=10000)
+        self._queue = None
+        self._task = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _start(self):
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def predict(self, rows):
+        """Predicts the rows within a batch shared with the
+        other waiting callers
+
+        Parameters
+        ----------
+        rows : numpy.ndarray
+            The 2D feature array of the rows
+
+        Returns
+        -------
+        numpy.ndarray
+            The predictions of the rows
+        """
+
+        rows = np.asarray(rows)
+        if rows.ndim != 2:
+            raise ValueError(f"Expected a 2D array of rows, got {rows.ndim}D")
+        self._start()
+        future = asyncio.get_event_loop().create_future()
+        await self._queue.put((rows, future, time.perf_counter()))
+        return await future
+
+    async def predict_one(self, row):
+        """Predicts a single row within a batch shared with the
+        other waiting callers
+
+        Parameters
+        ----------
+        row : numpy.ndarray
+            The 1D feature array of the row
+
+        Returns
+        -------
+        object
+            The prediction of the row
+        """
+
+        predictions = await self.predict(np.asarray(row)[np.newaxis, :])
+        return predictions[0]
+
+    def stats(self):
+        """Returns the batch size and latency counters
+
+        Returns
+        -------
+        dict
+            The number of requests, batches and rows, the mean and
+            largest batch size and the latency percentiles in seconds
+            of the most recent requests
+        """
+
+        latencies = np.array(self._latencies)
+        percentiles = (
+            np.percentile(latencies, [50, 99]) if len(latencies) else [np.nan] * 2
+        )
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_rows,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "latency_p50": float(percentiles[0]),
+            "latency_p99": float(percentiles[1]),
+        }
+
+    async def close(self):
+        """Stops the batching task, callers still queued or
+        predicted are cancelled
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            while not self._queue.empty():
+                self._queue.get_nowait()[1].cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        running = set()
+        try:
+            while True:
+                pending = [await self._queue.get()]
+                size = len(pending[0][0])
+                # The oldest caller waits max_wait from when it was queued
+                deadline = pending[0][2] + self.max_wait
+                while size < self.max_batch_size:
+                    timeout = deadline - time.perf_counter()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    pending.append(item)
+                    size += len(item[0])
+
+                # Callers with a different number of features are
+                # predicted apart so one bad caller cannot fail the others
+                groups = defaultdict(list)
+                for item in pending:
+                    groups[item[0].shape[1]].append(item)
+                running.add(
+                    asyncio.gather(
+                        *[self._predict_group(loop, group) for group in groups.values()]
+                    )
+                )
+                running = {batch for batch in running if not batch.done()}
+                if len(running) >= self.max_concurrency:
+                    _, running = await asyncio.wait(
+                        running, return_when=asyncio.FIRST_COMPLETED
+                    )
+        finally:
+            for batch in running:
+                batch.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def _predict_group(self, loop, group):
+        rows = np.concatenate([rows for rows, _, _ in group])
+        self.batches += 1
+        self.rows += len(rows)
+        self.max_rows = max(self.max_rows, len(rows))
+        try:
+            predictions = await loop.run_in_executor(
+                self.executor, self.model.predict, rows
+            )
+        except asyncio.CancelledError:
+            for _, future, _ in group:
+                future.cancel()
+            raise
+        except Exception as error:
+            for _, future, _ in group:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        start = 0
+        now = time.perf_counter()
+        for rows, future, queued in group:
+            if not future.done():
+                future.set_result(predictions[start : start + len(rows)])
+            start += len(rows)
+            self.requests += 1
+            self._latencies.append(now - queued)
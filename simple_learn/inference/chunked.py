@@ -0,0 +1,150 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from joblib import effective_n_jobs
+from sklearn.utils import _safe_indexing
+
+# Rows predicted at a time unless the caller chooses otherwise
+default_chunk_size = 10000
+
+
+def _num_samples(pred_x):
+    return pred_x.shape[0] if hasattr(pred_x, "shape") else len(pred_x)
+
+
+def _open(pred_x):
+    if isinstance(pred_x, (str, os.PathLike)):
+        return np.load(pred_x, mmap_mode="r")
+    return pred_x
+
+
+def _chunks(n_samples, chunk_size):
+    return [
+        slice(start, min(start + chunk_size, n_samples))
+        for start in range(0, n_samples, chunk_size)
+    ]
+
+
+def predict_iter(
+    estimator, pred_x, chunk_size=default_chunk_size, n_jobs=-1, method="predict"
+):
+    """Yields the predictions of a fitted model one chunk of
+    samples at a time, in the order of the samples.
+
+    Chunks are predicted by a pool of threads, most sklearn models
+    release the GIL while predicting. Only n_jobs chunks are in
+    flight at once, so memory is bounded by the chunk size instead
+    of the number of samples.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The fitted model
+    pred_x : numpy.ndarray or str
+        The feature array, or the path of a .npy file that is
+        memory mapped instead of loaded
+    chunk_size : int, optional
+        The number of samples predicted at a time
+    n_jobs : int, optional
+        The number of threads, -1 uses every core
+    method : str, optional
+        The prediction method of the model
+
+    Yields
+    ------
+    numpy.ndarray
+        The predictions of the next chunk
+    """
+
+    pred_x = _open(pred_x)
+    predict = getattr(estimator, method)
+    chunks = _chunks(_num_samples(pred_x), chunk_size)
+    n_jobs = min(effective_n_jobs(n_jobs), max(1, len(chunks)))
+    if n_jobs == 1:
+        for chunk in chunks:
+            yield predict(_safe_indexing(pred_x, chunk))
+        return
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            if len(in_flight) == n_jobs:
+                yield in_flight.popleft().result()
+            in_flight.append(executor.submit(predict, _safe_indexing(pred_x, chunk)))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def predict_chunked(
+    estimator,
+    pred_x,
+    chunk_size=default_chunk_size,
+    n_jobs=-1,
+    method="predict",
+    out=None,
+):
+    """Predicts a large feature array in chunks of samples
+    written into a single preallocated output array.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The fitted model
+    pred_x : numpy.ndarray or str
+        The feature array, or the path of a .npy file that is
+        memory mapped instead of loaded
+    chunk_size : int, optional
+        The number of samples predicted at a time
+    n_jobs : int, optional
+        The number of threads, -1 uses every core
+    method : str, optional
+        The prediction method of the model
+    out : numpy.ndarray, optional
+        The array receiving the predictions, allocated from the
+        first chunk when not given
+
+    Returns
+    -------
+    numpy.ndarray
+        The predictions of every sample
+    """
+
+    pred_x = _open(pred_x)
+    n_samples = _num_samples(pred_x)
+    if n_samples <= chunk_size and out is None:
+        return getattr(estimator, method)(pred_x)
+
+    start = 0
+    for predictions in predict_iter(
+        estimator, pred_x, chunk_size=chunk_size, n_jobs=n_jobs, method=method
+    ):
+        predictions = np.asarray(predictions)
+        if out is None:
+            out = np.empty(
+                (n_samples,) + predictions.shape[1:], dtype=predictions.dtype
+            )
+        out[start : start + len(predictions)] = predictions
+        start += len(predictions)
+    return out
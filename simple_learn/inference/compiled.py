@@ -0,0 +1,274 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+
+# Model families that can be compiled into arrays
+compiled_kinds = ["linear", "forest", "boosting"]
+
+
+def _flatten_trees(trees, classifier):
+    # Every tree is appended to one set of node arrays, leaves point
+    # to themselves so all trees are traversed for the same depth
+    feature, threshold, left, right, missing_left, value, roots = (
+        [],
+        [],
+        [],
+        [],
+        [],
+        [],
+        [],
+    )
+    offset = 0
+    for tree in trees:
+        is_leaf = tree.children_left == -1
+        nodes = np.arange(tree.node_count) + offset
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+        right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+        missing = getattr(tree, "missing_go_to_left", None)
+        if missing is None:
+            missing = np.zeros(tree.node_count, dtype=bool)
+        missing_left.append(np.asarray(missing, dtype=bool))
+        if classifier:
+            # Older sklearn stores class counts instead of fractions,
+            # every node is normalized like predict_proba does
+            counts = tree.value[:, 0, :]
+            total = counts.sum(axis=1)[:, np.newaxis]
+            total[total == 0.0] = 1.0
+            value.append(counts / total)
+        else:
+            value.append(tree.value[:, 0, 0])
+        roots.append(offset)
+        offset += tree.node_count
+    return {
+        "feature": np.concatenate(feature).astype(np.intp),
+        "threshold": np.concatenate(threshold),
+        "left": np.concatenate(left).astype(np.intp),
+        "right": np.concatenate(right).astype(np.intp),
+        "missing_left": np.concatenate(missing_left),
+        "value": np.concatenate(value),
+        "roots": np.array(roots, dtype=np.intp),
+        "depth": np.array(max(tree.max_depth for tree in trees)),
+    }
+
+
+def compile_model(estimator):
+    """Flattens a fitted model into NumPy arrays whose
+    predictions exactly match the model.
+
+    Tree ensembles become node arrays traversed for every sample
+    and tree at once, linear models a coefficient matrix. Both
+    repeat the arithmetic of sklearn in the same order.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The fitted model
+
+    Returns
+    -------
+    CompiledModel
+        The compiled model
+
+    Raises
+    ------
+    ValueError
+        If the model is not a single output linear model, decision
+        tree, random forest or gradient boosting model
+    """
+
+    # sklearn is only imported to compile, loading and predicting
+    # with a compiled model only needs NumPy
+    from sklearn.base import is_classifier
+    from sklearn.ensemble._forest import BaseForest
+    from sklearn.ensemble._gb import BaseGradientBoosting
+    from sklearn.linear_model._base import LinearClassifierMixin, LinearModel
+    from sklearn.linear_model._stochastic_gradient import BaseSGDRegressor
+    from sklearn.tree import BaseDecisionTree
+
+    classifier = is_classifier(estimator)
+    arrays = {}
+    if getattr(estimator, "n_outputs_", 1) != 1:
+        kind = None
+    elif isinstance(estimator, (LinearClassifierMixin, LinearModel, BaseSGDRegressor)):
+        kind = "linear"
+        arrays["coef"] = np.asarray(estimator.coef_)
+        arrays["intercept"] = np.asarray(estimator.intercept_)
+    elif isinstance(estimator, (BaseDecisionTree, BaseForest)):
+        kind = "forest"
+        trees = getattr(estimator, "estimators_", [estimator])
+        arrays.update(_flatten_trees([tree.tree_ for tree in trees], classifier))
+    elif isinstance(estimator, BaseGradientBoosting) and estimator.init in [
+        None,
+        "zero",
+    ]:
+        kind = "boosting"
+        stages = estimator.estimators_
+        arrays.update(_flatten_trees([tree.tree_ for tree in stages.ravel()], False))
+        arrays["column"] = np.tile(np.arange(stages.shape[1]), stages.shape[0])
+        arrays["scale"] = np.array(estimator.learning_rate)
+        arrays["init"] = estimator._raw_predict_init(
+            np.zeros((1, estimator.n_features_in_), dtype=np.float32)
+        )[0]
+    else:
+        kind = None
+
+    if kind is None:
+        raise ValueError(
+            f"{type(estimator).__name__} cannot be compiled, only single output "
+            "linear models, decision trees, random forests and gradient "
+            "boosting models can"
+        )
+    if classifier:
+        arrays["classes"] = np.asarray(estimator.classes_)
+    return CompiledModel(kind, arrays)
+
+
+class CompiledModel:
+    """
+    A class used to predict with a model flattened into NumPy
+    arrays, without the validation and dispatch overhead of
+    sklearn on every call
+
+    ...
+
+    Attributes
+    ----------
+    kind : str
+        the model family, one of compiled_kinds
+    arrays : dict
+        the arrays describing the model
+    classifier : bool
+        whether the model predicts class labels
+
+    Methods
+    -------
+    predict(pred_x)
+        Predicts label of samples in prediction array
+    save(file)
+        Writes the arrays into a .npz file
+    load(file)
+        Reads a CompiledModel from a .npz file
+    """
+
+    def __init__(self, kind, arrays):
+        self.kind = kind
+        self.arrays = arrays
+        self.classifier = "classes" in arrays
+
+    def _apply(self, pred_x):
+        arrays = self.arrays
+        rows = np.arange(len(pred_x))[:, np.newaxis]
+        node = np.repeat(arrays["roots"][np.newaxis, :], len(pred_x), axis=0)
+        # Models compiled before missing values were routed send
+        # NaN features right, like sklearn without missing support
+        missing_left = arrays.get("missing_left")
+        for _ in range(int(arrays["depth"])):
+            values = pred_x[rows, arrays["feature"][node]]
+            go_left = values <= arrays["threshold"][node]
+            if missing_left is not None:
+                go_left |= np.isnan(values) & missing_left[node]
+            node = np.where(go_left, arrays["left"][node], arrays["right"][node])
+        return arrays["value"][node]
+
+    def _predict_linear(self, pred_x):
+        scores = pred_x @ self.arrays["coef"].T + self.arrays["intercept"]
+        if not self.classifier:
+            return scores.ravel() if scores.ndim > 1 else scores
+        if scores.ndim > 1 and scores.shape[1] == 1:
+            scores = scores.ravel()
+        if scores.ndim == 1:
+            return self.arrays["classes"][(scores > 0).astype(np.intp)]
+        return self.arrays["classes"][scores.argmax(axis=1)]
+
+    def _predict_forest(self, pred_x):
+        leaves = self._apply(pred_x)
+        out = np.zeros((len(pred_x),) + leaves.shape[2:], dtype=np.float64)
+        for tree in range(leaves.shape[1]):
+            out += leaves[:, tree]
+        out /= leaves.shape[1]
+        if self.classifier:
+            return self.arrays["classes"].take(np.argmax(out, axis=1), axis=0)
+        return out
+
+    def _predict_boosting(self, pred_x):
+        leaves = self._apply(pred_x)
+        raw = np.repeat(self.arrays["init"][np.newaxis, :], len(pred_x), axis=0)
+        scale = float(self.arrays["scale"])
+        for tree, column in enumerate(self.arrays["column"]):
+            raw[:, column] += scale * leaves[:, tree]
+        if not self.classifier:
+            return raw.ravel()
+        if raw.shape[1] == 1:
+            return self.arrays["classes"][(raw.ravel() >= 0).astype(int)]
+        return self.arrays["classes"][np.argmax(raw, axis=1)]
+
+    def predict(self, pred_x):
+        """Predicts label of samples in prediction array
+        with the compiled arrays
+
+        Parameters
+        ----------
+        pred_x : numpy.ndarray or scipy.sparse matrix
+            The feature array for predicting labels, sparse arrays
+            are densified one call at a time, so predict sparse
+            data in chunks
+        """
+
+        if hasattr(pred_x, "toarray"):
+            pred_x = pred_x.toarray()
+        if self.kind == "linear":
+            return self._predict_linear(np.asarray(pred_x))
+        pred_x = np.asarray(pred_x, dtype=np.float32)
+        if self.kind == "forest":
+            return self._predict_forest(pred_x)
+        return self._predict_boosting(pred_x)
+
+    def save(self, file):
+        """Writes the compiled arrays into a .npz file
+
+        Parameters
+        ----------
+        file : str or file-like object
+            The destination of the arrays
+        """
+
+        np.savez(file, kind=np.array(self.kind), **self.arrays)
+
+    @classmethod
+    def load(cls, file):
+        """Reads a CompiledModel from a .npz file
+
+        Parameters
+        ----------
+        file : str or file-like object
+            The .npz file written by save
+
+        Returns
+        -------
+        CompiledModel
+            The compiled model
+        """
+
+        with np.load(file, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        return cls(str(arrays.pop("kind")), arrays)
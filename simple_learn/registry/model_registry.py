@@ -0,0 +1,357 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+
+from simple_learn.classifiers import SimpleClassifier
+from simple_learn.encoders.archive import archive_nbytes, read_metadata
+from simple_learn.regressors import SimpleRegressor
+
+# Model class of every archive entry prefix
+archive_kinds = {
+    "simple_classifier": SimpleClassifier,
+    "simple_regressor": SimpleRegressor,
+}
+
+
+def _version_key(version):
+    return (0, int(version), "") if version.isdigit() else (1, 0, version)
+
+
+def archive_kind(path):
+    """Finds the model class and entry prefix of an archive
+
+    Parameters
+    ----------
+    path : str
+        The path of the archive
+
+    Returns
+    -------
+    tuple
+        The entry prefix and model class
+
+    Raises
+    ------
+    ValueError
+        If the archive holds neither model class
+    """
+
+    with zipfile.ZipFile(path) as zf:
+        entries = zf.namelist()
+    for prefix, model_class in archive_kinds.items():
+        if f"{prefix}.json" in entries:
+            return prefix, model_class
+    raise ValueError(f"{path} is not a simple_learn model archive")
+
+
+def load_model(path, mmap=False, lazy=False):
+    """Loads the model of an archive into the matching class
+
+    Parameters
+    ----------
+    path : str
+        The path of the archive
+    mmap : bool, optional
+        Whether to map the model arrays from the archive
+    lazy : bool, optional
+        Whether to defer reading the model to its first use
+
+    Returns
+    -------
+    SimpleClassifier or SimpleRegressor
+        The loaded model
+    """
+
+    _, model_class = archive_kind(path)
+    model = model_class()
+    model.load(path, mmap=mmap, lazy=lazy)
+    return model
+
+
+def model_nbytes(path):
+    """Estimates the memory held by the model of an archive once
+    loaded, from the sizes of its pickle stream, array buffers and
+    compiled arrays.
+
+    Parameters
+    ----------
+    path : str
+        The path of the archive
+
+    Returns
+    -------
+    int
+        The estimated number of bytes
+    """
+
+    prefix, _ = archive_kind(path)
+    return archive_nbytes(path, prefix)
+
+
+class ModelRegistry:
+    """
+    A class used to serve the archives of a directory by name
+    and version
+
+    Archives are stored as <directory>/<name>/<version>.zip and
+    indexed by their metadata without reading their models. Loaded
+    models are kept in a pool limited by a byte budget, the least
+    recently used ones are evicted first.
+
+    ...
+
+    Attributes
+    ----------
+    directory : str
+        the directory holding the archives
+    max_bytes : int
+        the byte budget of the loaded models
+    mmap : bool
+        whether models are memory mapped from their archives
+    index : dict
+        the archive path, model class and metadata of every
+        (name, version)
+    loaded_bytes : int
+        the estimated bytes held by the loaded models
+
+    Methods
+    -------
+    refresh()
+        Indexes the archives of the directory
+    names()
+        Returns the name of every model
+    versions(name)
+        Returns the versions of a model, oldest first
+    metadata(name, version=None)
+        Returns the metadata of a model
+    get(name, version=None)
+        Returns a loaded model
+    register(name, model, version=None)
+        Saves a model as a new version
+    evict(name=None, version=None)
+        Drops loaded models from the pool
+    """
+
+    def __init__(self, directory, max_bytes=1024**3, mmap=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.mmap = mmap
+        self.index = {}
+        self.loaded_bytes = 0
+        self._stamps = {}
+        self._pool = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.refresh()
+
+    def refresh(self):
+        """Indexes the archives of the directory, reading only
+        the metadata of archives added or changed since the last
+        refresh. Loaded models of changed archives are evicted.
+        """
+
+        index, stamps = {}, {}
+        for name in sorted(os.listdir(self.directory)):
+            folder = os.path.join(self.directory, name)
+            if not os.path.isdir(folder):
+                continue
+            for filename in os.listdir(folder):
+                if not filename.endswith(".zip"):
+                    continue
+                path = os.path.join(folder, filename)
+                key = (name, filename[: -len(".zip")])
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if self._stamps.get(key) == stamp and key in self.index:
+                    index[key], stamps[key] = self.index[key], stamp
+                    continue
+                try:
+                    prefix, model_class = archive_kind(path)
+                except ValueError:
+                    continue
+                index[key] = (path, model_class, read_metadata(path, prefix))
+                stamps[key] = stamp
+        with self._lock:
+            # Models read from an archive that changed or disappeared are stale
+            for key in list(self._pool):
+                if stamps.get(key) != self._stamps.get(key):
+                    self.loaded_bytes -= self._pool.pop(key)[1]
+            self.index = index
+            self._stamps = stamps
+
+    def names(self):
+        """Returns the name of every indexed model
+
+        Returns
+        -------
+        list
+            The sorted model names
+        """
+
+        return sorted({name for name, _ in self.index})
+
+    def versions(self, name):
+        """Returns the indexed versions of a model
+
+        Parameters
+        ----------
+        name : str
+            The name of the model
+
+        Returns
+        -------
+        list
+            The versions, oldest first
+        """
+
+        return sorted(
+            (version for model, version in self.index if model == name),
+            key=_version_key,
+        )
+
+    def _key(self, name, version):
+        if version is None:
+            versions = self.versions(name)
+            if not versions:
+                self.refresh()
+                versions = self.versions(name)
+            if not versions:
+                raise KeyError(f"No model named '{name}' in {self.directory}")
+            version = versions[-1]
+        key = (name, str(version))
+        if key not in self.index:
+            self.refresh()
+        if key not in self.index:
+            raise KeyError(f"No version {version} of model '{name}'")
+        return key
+
+    def metadata(self, name, version=None):
+        """Returns the metadata of a model without loading it
+
+        Parameters
+        ----------
+        name : str
+            The name of the model
+        version : str, optional
+            The version of the model, the latest by default
+
+        Returns
+        -------
+        dict
+            The Type, Parameters, Metrics and durations of the model
+        """
+
+        return self.index[self._key(name, version)][2]
+
+    def get(self, name, version=None):
+        """Returns a loaded model, reading its archive when it
+        is not in the pool
+
+        Parameters
+        ----------
+        name : str
+            The name of the model
+        version : str, optional
+            The version of the model, the latest by default
+
+        Returns
+        -------
+        SimpleClassifier or SimpleRegressor
+            The loaded model
+        """
+
+        key = self._key(name, version)
+        with self._lock:
+            if key in self._pool:
+                self._pool.move_to_end(key)
+                return self._pool[key][0]
+            path = self.index[key][0]
+
+        model = load_model(path, mmap=self.mmap)
+        nbytes = model_nbytes(path)
+
+        with self._lock:
+            if key in self._pool:
+                self._pool.move_to_end(key)
+                return self._pool[key][0]
+            if nbytes > self.max_bytes:
+                return model
+            while self.loaded_bytes + nbytes > self.max_bytes:
+                _, (_, evicted) = self._pool.popitem(last=False)
+                self.loaded_bytes -= evicted
+            self._pool[key] = (model, nbytes)
+            self.loaded_bytes += nbytes
+        return model
+
+    def register(self, name, model, version=None):
+        """Saves a model as a new version in the registry
+
+        Parameters
+        ----------
+        name : str
+            The name of the model
+        model : SimpleClassifier or SimpleRegressor
+            The fitted model
+        version : str, optional
+            The version of the model, one more than the latest
+            numeric version by default
+
+        Returns
+        -------
+        str
+            The version of the saved model
+        """
+
+        if version is None:
+            numeric = [int(v) for v in self.versions(name) if v.isdigit()]
+            version = max(numeric, default=0) + 1
+        version = str(version)
+        folder = os.path.join(self.directory, name)
+        os.makedirs(folder, exist_ok=True)
+        model.save(os.path.join(folder, version))
+        self.evict(name, version)
+        self.refresh()
+        return version
+
+    def evict(self, name=None, version=None):
+        """Drops loaded models from the pool
+
+        Parameters
+        ----------
+        name : str, optional
+            The name of the models to drop, every model by default
+        version : str, optional
+            The version to drop, every version by default
+        """
+
+        with self._lock:
+            for key in list(self._pool):
+                if name is not None and key[0] != name:
+                    continue
+                if version is not None and key[1] != str(version):
+                    continue
+                self.loaded_bytes -= self._pool.pop(key)[1]
@@ -18,8 +18,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from simple_learn.regressors.simple_regressor import SimpleRegressor
-from simple_learn.regressors.simple_regressor_list import (
-    SimpleRegressorList,
-    SimpleRegressorListObject,
+from simple_learn._lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "SimpleRegressor": "simple_learn.regressors.simple_regressor",
+        "SimpleRegressorList": "simple_learn.regressors.simple_regressor_list",
+        "SimpleRegressorListObject": "simple_learn.regressors.simple_regressor_list",
+    },
 )
@@ -68,3 +68,14 @@ model_param_map = {
         "loss": ["linear", "square", "exponential"],
     },
 }
+
+# Module of every model algorithm, only the searched ones are imported
+model_import_map = {
+    "SGDRegressor": "sklearn.linear_model",
+    "KNeighborsRegressor": "sklearn.neighbors",
+    "DecisionTreeRegressor": "sklearn.tree",
+    "RandomForestRegressor": "sklearn.ensemble",
+    "GradientBoostingRegressor": "sklearn.ensemble",
+    "HistGradientBoostingRegressor": "sklearn.ensemble",
+    "AdaBoostRegressor": "sklearn.ensemble",
+}
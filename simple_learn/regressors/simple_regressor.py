@@ -18,23 +18,26 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import ast
 import json
 import logging
 import os
-import time
-import zipfile
+import threading
 
 import numpy as np
-from joblib import dump, load
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.model_selection import GridSearchCV
-from sklearn.utils import all_estimators
-from tqdm import tqdm
 
 from simple_learn.encoders import simple_model_encoder
-from simple_learn.regressors.param_grid import model_param_map
-from simple_learn.simple_logging import custom_logging
+from simple_learn.encoders.archive import (
+    read_compiled,
+    read_metadata,
+    read_model,
+    write_archive,
+)
+from simple_learn.inference import compile_model, predict_chunked, predict_iter
+from simple_learn.inference.chunked import default_chunk_size
+from simple_learn.regressors.param_grid import (
+    model_import_map,
+    model_param_map,
+)
 
 
 class SimpleRegressor:
@@ -46,7 +49,11 @@ class SimpleRegressor:
         name : str
             the optimal model algorithm for given dataset
         sk_learn : str
-            the sklearn model used for prediction
+            the sklearn model used for prediction, fitted or read on
+            first use when its refit or load was deferred
+        compiled : simple_learn.inference.CompiledModel
+            the NumPy arrays form of the sklearn model used for prediction,
+            None until compile
         attributes : dict
             a dictionary used to keep track of model hyper-parameters
         metrics : dict
@@ -55,32 +62,75 @@ class SimpleRegressor:
             the duration of the gridsearch being used in hyper-parameter tuning
         train_duration : time.time
             the duration of model training
+        peak_memory : float
+            the peak resident memory in MB of a worker searching the
+            model algorithm
         failed_models : list
             the list of failed model algorithms
+        failure_reasons : dict
+            the reason every failed model algorithm failed
+        truncated_models : list
+            the list of model algorithms cut short by the time budget
         logger : logging.Logger
             logger for notifying user of warnings
         Methods
         -------
-        fit(train_x, train_y, folds=3)
+        fit(train_x, train_y, folds=3, search="grid", ...)
             Fits a given dataset onto SimpleRegressor
-        predict(pred_x)
+        fit_stream(batches, holdout=0.2)
+            Fits a stream of batches onto SimpleRegressor
+        update(new_x, new_y, growth=0.1)
+            Updates the fitted model with new samples
+        predict(pred_x, chunk_size=10000, n_jobs=-1)
             Predicts label of samples in prediction array
+        predict_iter(pred_x, chunk_size=10000, n_jobs=-1)
+            Yields labels of prediction array chunk by chunk
+        materialize()
+            Fits or reads the sklearn model if it was deferred
+        compile()
+            Compiles the sklearn model into NumPy arrays for prediction
         save(self, name="simple_classifier")
             Creates a zip archive of the SimpleRegressor object
-        load(self, simple_archive)
+        load(self, simple_archive, mmap=False, lazy=False)
             Loads data from zip archive into SimpleRegressor object
         """
 
     def __init__(self):
         self.name = "Empty Model"
+        self._lock = threading.Lock()
+        self._pending_refit = None
+        self._pending_load = None
         self.sk_model = None
         self.attributes = dict()
         self.metrics = dict()
         self.gridsearch_duration = None
         self.train_duration = None
+        self.peak_memory = None
         self.failed_models = []
+        self.failure_reasons = {}
+        self.truncated_models = []
         self.logger = logging.getLogger()
 
+    @property
+    def sk_model(self):
+        return self.materialize()
+
+    @sk_model.setter
+    def sk_model(self, sk_model):
+        self._sk_model = sk_model
+        self._pending_refit = None
+        self._pending_load = None
+        self.compiled = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
     def __str__(self):
 
         for k in self.attributes:
@@ -91,6 +141,7 @@ class SimpleRegressor:
             "Type": self.name,
             "Training Duration": "{}s".format(self.train_duration),
             "GridSearch Duration": "{}s".format(self.gridsearch_duration),
+            "Peak Memory": "{}MB".format(self.peak_memory),
             "Parameters": self.attributes,
             "Metrics": self.metrics,
         }
@@ -104,6 +155,7 @@ class SimpleRegressor:
             "Type": self.name,
             "Training Duration": "{}s".format(self.train_duration),
             "GridSearch Duration": "{}s".format(self.gridsearch_duration),
+            "Peak Memory": "{}MB".format(self.peak_memory),
             "Parameters": self.attributes,
             "Metrics": self.metrics,
         }
@@ -111,133 +163,394 @@ class SimpleRegressor:
         repr_out = json.dumps(attr, cls=simple_model_encoder.npEncoder, indent=4)
         return repr_out
 
-    def fit(self, train_x, train_y, folds=3):
+    def fit(
+        self,
+        train_x,
+        train_y,
+        folds=3,
+        search="grid",
+        time_budget=None,
+        n_iter=20,
+        use_cache=False,
+        defer_refit=True,
+        max_samples=None,
+        callbacks=None,
+        memory_budget=None,
+        timeout=None,
+        random_state=0,
+    ):
         """Trains the optimal regression model
                  on given dataset by running model algorithm search.
                  If the argument folds isn't passed, the default
                  value(3) is used.
                  Parameters
                  ----------
-                 train_x : numpy.ndarray
-                     The features for training classification model
-                 train_y : numpy.ndarray
-                     The corresponding label for feature array
+                 train_x : numpy.ndarray or str
+                     The features for training classification model, or the path
+                     of a .npy file that is memory mapped instead of loaded
+                 train_y : numpy.ndarray or str
+                     The corresponding label for feature array, or the path
+                     of a .npy file
                  folds : int, optional
                      The number of folds for cross validation
+                 search : str {grid, halving, adaptive}, optional
+                     The hyper-parameter search strategy, halving evaluates
+                     candidates on growing budgets and drops the weakest,
+                     adaptive samples candidates guided by previous scores
+                 time_budget : float, optional
+                     The wall-clock seconds available for the search, once
+                     they run out the best model found so far is kept
+                 n_iter : int, optional
+                     The number of candidates evaluated per model algorithm
+                     by the adaptive search
+                 use_cache : bool, optional
+                     Whether to reuse the scores of candidates evaluated on the
+                     same data by earlier searches, kept in the score cache
+                     directory
+                 defer_refit : bool, optional
+                     Whether to select the optimal model algorithm from the
+                     cross validation scores and refit only its best
+                     candidate, instead of refitting the best candidate of
+                     every model algorithm
+                 max_samples : int, optional
+                     The largest number of samples to search on, larger
+                     datasets are searched on a random subsample, without it
+                     every model algorithm holds as many samples in memory as
+                     its workers can fit
+                 callbacks : list, optional
+                     The sinks called with every search event, by default a
+                     progress bar, an empty list searches without writing to
+                     the terminal
+                 memory_budget : int, optional
+                     The bytes available to the worker processes of the search,
+                     fewer fits run at once and the candidates that can't fit
+                     it are skipped
+                 timeout : float, optional
+                     The wall-clock seconds every model algorithm may search
+                     for, counted from its first fit however many of its fits
+                     run in parallel, one that runs longer or crashes its
+                     worker is added to the failed models and the search
+                     carries on
+                 random_state : int, optional
+                     The seed of the adaptive search and of the max_samples
+                     subsample, the same seed searches the same candidates
+                 """
+        # The search stack is only imported to fit, loading a
+        # saved model and predicting with it don't need it
+        from simple_learn.search import ScoreCache, search_models
+        from simple_learn.search.estimators import import_estimators
+        from simple_learn.search.events import SearchEvents
+        from simple_learn.search.scoring import regressor_scoring
+        from simple_learn.search.shared_data import open_data
+        from simple_learn.simple_logging import custom_logging, event_sinks
+
+        train_x, train_y = open_data(
+            train_x, train_y, max_samples=max_samples, random_state=random_state
+        )
+        log = logging.getLogger(__name__)
+        log.setLevel(logging.INFO)
+        if callbacks is None:
+            log.addHandler(custom_logging.TqdmLoggingHandler())
+            callbacks = [event_sinks.TqdmSink(desc="Fitting Models", unit=" Algorithm")]
+        with SearchEvents(callbacks) as events:
+            estimators = import_estimators(model_import_map)
+            results = search_models(
+                estimators,
+                model_param_map,
+                train_x,
+                train_y,
+                folds,
+                regressor_scoring,
+                classifier=False,
+                search=search,
+                time_budget=time_budget,
+                n_iter=n_iter,
+                cache=ScoreCache() if use_cache else None,
+                error_score="raise",
+                events=events,
+                memory_budget=memory_budget,
+                algorithm_timeout=timeout,
+                random_state=random_state,
+                refit="auto",
+                defer_refit=defer_refit,
+            )
+            self._keep_best(results, train_x, train_y, log)
+
+    def fit_stream(self, batches, holdout=0.2):
+        """Trains the optimal regression model in a single
+                 pass over a stream of batches.
+                 Only the model algorithms supporting partial_fit take part,
+                 every candidate is trained on every batch at once and scored
+                 on a holdout of each batch before training on it. Memory
+                 stays constant however large the stream is.
+                 Parameters
+                 ----------
+                 batches : iterable
+                     The (features, labels) of every batch
+                 holdout : float, optional
+                     The fraction of every batch scored instead of trained on
                  """
+        from tqdm import tqdm
+
+        from simple_learn.search import StreamSearch
+        from simple_learn.search.estimators import import_estimators
+        from simple_learn.search.scoring import regressor_scoring
+        from simple_learn.simple_logging import custom_logging
+
         log = logging.getLogger(__name__)
         log.setLevel(logging.INFO)
         log.addHandler(custom_logging.TqdmLoggingHandler())
-        with tqdm(
-            total=(len(model_param_map)),
-            desc="Fitting Models",
-            unit=" Algorithm",
-            ncols=100,
-        ) as progressbar:
-            estimators = all_estimators(type_filter="regressor")
-            for name, RegressionClass in estimators:
-                if name in model_param_map:
-                    param_grid = model_param_map[name]
-                    grid_rgr = GridSearchCV(
-                        RegressionClass(),
-                        param_grid,
-                        cv=folds,
-                        scoring="neg_root_mean_squared_error",
-                        verbose=0,
-                        n_jobs=-1,
-                        error_score="raise",
+        with tqdm(desc="Streaming Batches", unit=" Batch", ncols=100) as progressbar:
+            estimators = import_estimators(model_import_map, partial_fit=True)
+            search = StreamSearch(
+                estimators,
+                model_param_map,
+                regressor_scoring,
+                holdout=holdout,
+                refit="auto",
+            )
+            results = search.run(
+                batches, on_batch_end=lambda n_batches: progressbar.update(1)
+            )
+            self._keep_best(results, None, None, log)
+
+    def _keep_best(self, results, train_x, train_y, log):
+        for grid_rgr in results:
+            name = grid_rgr.name
+            if grid_rgr.truncated:
+                self.truncated_models.append(name)
+            if grid_rgr.error is not None:
+                self.failed_models.append(name)
+                self.failure_reasons[name] = (
+                    f"{type(grid_rgr.error).__name__}: {grid_rgr.error}"
+                )
+                log.info(f"{name} failed due to, Error : {grid_rgr.error}.")
+        results = [grid_rgr for grid_rgr in results if grid_rgr.error is None]
+        results.sort(key=lambda grid_rgr: grid_rgr.best_score_, reverse=True)
+
+        # Only the optimal model algorithm is refit, a failed refit
+        # falls back to the next best one
+        for grid_rgr in results:
+            if grid_rgr.best_estimator_ is None:
+                try:
+                    grid_rgr.refit_best(train_x, train_y)
+                except Exception as error:
+                    self.failed_models.append(grid_rgr.name)
+                    self.failure_reasons[grid_rgr.name] = (
+                        f"{type(error).__name__}: {error}"
                     )
-                    progressbar.update(1)
-                    start = time.time()
-                    try:
-                        grid_rgr.fit(train_x, train_y)
-                    except BaseException as error:
-                        self.failed_models.append(name)
-                        log.info(f"{name} failed due to, Error : {error}.")
-                        continue
-
-                    end = time.time()
-                    if self.metrics.get(
-                        "Training Score"
-                    ) is None or -grid_rgr.best_score_ < self.metrics.get(
-                        "Training Score"
-                    ):
-                        self.metrics["Training Score"] = -grid_rgr.best_score_
-                        pred_y = grid_rgr.predict(train_x)
-                        self.metrics["Mean Absolute Error"] = mean_absolute_error(
-                            train_y, pred_y
-                        )
-                        self.metrics["Mean Square Error"] = mean_squared_error(
-                            train_y, pred_y
-                        )
-                        self.metrics["R-Squared"] = r2_score(train_y, pred_y)
-                        self.sk_model = grid_rgr.best_estimator_
-                        self.name = name
-                        self.attributes = grid_rgr.best_params_
-                        self.train_duration = grid_rgr.refit_time_
-                        self.gridsearch_duration = end - start
-
-    def predict(self, pred_x):
+                    log.info(f"{grid_rgr.name} failed due to, Error : {error}.")
+                    continue
+            self._set_metrics(grid_rgr.best_scores())
+            self.sk_model = grid_rgr.best_estimator_
+            self.name = grid_rgr.name
+            self.attributes = grid_rgr.best_params_
+            self.train_duration = grid_rgr.refit_time_
+            self.gridsearch_duration = grid_rgr.search_duration
+            self.peak_memory = (
+                None
+                if grid_rgr.peak_memory is None
+                else round(grid_rgr.peak_memory / 2**20, 1)
+            )
+            break
+
+    def _set_metrics(self, scores):
+        self.metrics["Training Score"] = -scores["auto"]
+        self.metrics["Mean Absolute Error"] = -scores["mae"]
+        self.metrics["Mean Square Error"] = -scores["mse"]
+        self.metrics["R-Squared"] = scores["r2"]
+
+    def update(self, new_x, new_y, growth=0.1, train_x=None, train_y=None):
+        """Updates the fitted regression model with new
+                 samples without searching its hyper-parameters again.
+                 Models supporting partial_fit keep learning from the new
+                 samples, warm started ensembles add new trees or stages fit
+                 on them and every other model is refit with the same
+                 hyper-parameters on the previous training data followed by
+                 the new samples, or on the new samples alone with a warning
+                 when the previous training data isn't given. The metrics are
+                 scored on the new samples before the model learns from them.
+                 Parameters
+                 ----------
+                 new_x : numpy.ndarray
+                     The features of the new samples
+                 new_y : numpy.ndarray
+                     The corresponding label for feature array
+                 growth : float, optional
+                     The fraction of trees or stages a warm started ensemble
+                     adds
+                 train_x : numpy.ndarray, optional
+                     The features the model was trained on so far, only
+                     used by models that are refit
+                 train_y : numpy.ndarray, optional
+                     The corresponding label for the previous feature array
+                 Returns
+                 -------
+                 str {partial_fit, warm_start, refit}
+                     The update path taken
+                 """
+        from simple_learn.search.incremental import update_estimator
+        from simple_learn.search.scoring import (
+            regressor_scoring,
+            score_estimator,
+        )
+
+        self._set_metrics(
+            score_estimator(self.sk_model, regressor_scoring, new_x, new_y)
+        )
+        sk_model, path, duration = update_estimator(
+            self.sk_model,
+            new_x,
+            new_y,
+            growth=growth,
+            train_x=train_x,
+            train_y=train_y,
+        )
+        self.sk_model = sk_model
+        self.attributes = {
+            param: sk_model.get_params()[param] for param in self.attributes
+        }
+        self.train_duration = duration
+        return path
+
+    def _defer_refit(self, result, train_x, train_y):
+        self._sk_model = None
+        self._pending_refit = (result, train_x, train_y)
+
+    def materialize(self):
+        """Fits the sklearn model on the training data if its
+        refit was deferred by the search, or reads it from the
+        archive if its load was deferred
+
+        Concurrent callers wait for a single fit or read.
+
+        Returns
+        -------
+        sklearn.base.BaseEstimator
+            The fitted sklearn model
+        """
+
+        if self._pending_refit is None and self._pending_load is None:
+            return self._sk_model
+        with self._lock:
+            if self._pending_load is not None:
+                simple_archive, mmap = self._pending_load
+                self.compiled = read_compiled(simple_archive, "simple_regressor")
+                self._sk_model = read_model(
+                    simple_archive, "simple_regressor", mmap=mmap
+                )
+                self._pending_load = None
+            if self._pending_refit is not None:
+                result, train_x, train_y = self._pending_refit
+                self._sk_model = result.refit_best(train_x, train_y)
+                self._pending_refit = None
+                self.train_duration = result.refit_time_
+                self.gridsearch_duration = result.search_duration
+        return self._sk_model
+
+    def compile(self):
+        """Compiles the sklearn model into NumPy arrays used
+                by predict instead of the sklearn model.
+                Decision trees, random forests, gradient boosting and linear
+                models predict the same labels without the per call overhead
+                of sklearn. The compiled arrays are saved with the archive.
+                Returns
+                -------
+                simple_learn.inference.CompiledModel
+                    The compiled model
+                """
+        compiled = compile_model(self.sk_model)
+        self.compiled = compiled
+        return compiled
+
+    def _predictor(self):
+        sk_model = self.materialize()
+        return sk_model if self.compiled is None else self.compiled
+
+    def predict(self, pred_x, chunk_size=default_chunk_size, n_jobs=-1):
         """Predicts class label based on input
                 feature array
+                Large feature arrays are predicted in chunks of samples by a
+                pool of threads and written into a single output array.
+                Parameters
+                ----------
+                pred_x : numpy.ndarray or str
+                    The feature array for predicting class labels, or the path
+                    of a .npy file that is memory mapped instead of loaded
+                chunk_size : int, optional
+                    The number of samples predicted at a time
+                n_jobs : int, optional
+                    The number of threads, -1 uses every core
+                """
+        return predict_chunked(
+            self._predictor(), pred_x, chunk_size=chunk_size, n_jobs=n_jobs
+        )
+
+    def predict_iter(self, pred_x, chunk_size=default_chunk_size, n_jobs=-1):
+        """Yields the predicted labels of the feature array one
+                chunk of samples at a time, in the order of the samples
                 Parameters
                 ----------
-                pred_x : numpy.ndarray
-                    The feature array for predicting class labels
+                pred_x : numpy.ndarray or str
+                    The feature array for predicting class labels, or the path
+                    of a .npy file that is memory mapped instead of loaded
+                chunk_size : int, optional
+                    The number of samples predicted at a time
+                n_jobs : int, optional
+                    The number of threads, -1 uses every core
                 """
-        return self.sk_model.predict(pred_x)
+        return predict_iter(
+            self._predictor(), pred_x, chunk_size=chunk_size, n_jobs=n_jobs
+        )
 
     def save(self, name="simple_regressor"):
         """Creates a zip archive file from SimpleRegressor
         attributes and sklearn model
 
+        The archive is streamed straight to its destination, a path
+        is replaced atomically once the archive is complete.
+
         Parameters
         ----------
-        name : str, optional
-            The name of the zip archive file to create
+        name : str or file-like object, optional
+            The name of the zip archive file to create, or a writable
+            file object receiving the archive
         """
 
-        dump(self.sk_model, "simple_regressor.joblib")
-
-        rgr_str = str(self)
-        rgr_dict = json.loads(rgr_str)
-        with open("simple_regressor.json", "w") as fp:
-            json.dump(rgr_dict, fp)
-
-        zip_name = "{n}.zip".format(n=name)
-        zf = zipfile.ZipFile(zip_name, mode="w")
-        try:
-            zf.write("simple_regressor.json")
-            zf.write("simple_regressor.joblib")
-        finally:
-            zf.close()
-
-        os.remove("simple_regressor.json")
-        os.remove("simple_regressor.joblib")
+        if isinstance(name, (str, os.PathLike)):
+            name = "{n}.zip".format(n=name)
+        write_archive(name, "simple_regressor", str(self), self.sk_model, self.compiled)
 
-    def load(self, simple_archive):
+    def load(self, simple_archive, mmap=False, lazy=False):
         """Creates a SimpleRegressor object from a
         zip archive file
 
         Parameters
         ----------
-        simple_archive : str
-            The path to the zip archive file
+        simple_archive : str or file-like object
+            The path to the zip archive file, or a readable file object
+        mmap : bool, optional
+            Whether to map the arrays of the sklearn model straight
+            from the archive file instead of reading them
+        lazy : bool, optional
+            Whether to only read the metadata and defer reading the
+            sklearn model to its first use or materialize
         """
 
-        zf = zipfile.ZipFile(simple_archive)
         try:
-            byte_str = zf.read("simple_regressor.json")
-            dict_str = byte_str.decode("UTF-8")
-            rgr_dict = ast.literal_eval(dict_str)
+            rgr_dict = read_metadata(simple_archive, "simple_regressor")
             self.name = rgr_dict["Type"]
             self.gridsearch_duration = rgr_dict["GridSearch Duration"]
+            self.peak_memory = rgr_dict.get("Peak Memory")
             self.train_duration = rgr_dict["Training Duration"]
             self.attributes = rgr_dict["Parameters"]
             self.metrics = rgr_dict["Metrics"]
 
-            rgr_joblib = zf.extract("simple_regressor.joblib")
-            self.sk_model = load(rgr_joblib)
-            os.remove("simple_regressor.joblib")
+            if isinstance(simple_archive, (str, os.PathLike)):
+                simple_archive = os.path.abspath(simple_archive)
+            self.sk_model = None
+            self._pending_load = (simple_archive, mmap)
+            if not lazy:
+                self.materialize()
         except KeyError:
             self.logger.exception("Archive file was not in correct format")
@@ -20,17 +20,32 @@
 
 import json
 import logging
-import time
 
 import numpy as np
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.model_selection import GridSearchCV
-from sklearn.utils import all_estimators
-from tqdm import tqdm
 
 from simple_learn.encoders import simple_model_encoder
 from simple_learn.regressors import SimpleRegressor
-from simple_learn.regressors.param_grid import model_param_map
+from simple_learn.regressors.param_grid import (
+    model_import_map,
+    model_param_map,
+)
+from simple_learn.search import CandidateTable, ScoreCache, search_models
+from simple_learn.search.estimators import import_estimators
+from simple_learn.search.events import SearchEvents
+from simple_learn.search.scoring import regressor_scoring
+from simple_learn.search.shared_data import open_data
+from simple_learn.simple_logging import event_sinks
+
+# Ranking metric for each scoring option
+metric_map = {
+    "auto": "Training Score",
+    "mae": "Mean Absolute Error",
+    "mse": "Mean Squared Error",
+    "r2": "R-Squared",
+}
+
+# Metrics where lower values rank higher
+error_metrics = ["Training Score", "Mean Absolute Error", "Mean Squared Error"]
 
 
 class SimpleRegressorListObject:
@@ -63,6 +78,7 @@ class SimpleRegressorListObject:
             "Rank": self.rank,
             "Training Duration": "{}s".format(self.rgr.train_duration),
             "GridSearch Duration": "{}s".format(self.rgr.gridsearch_duration),
+            "Peak Memory": "{}MB".format(self.rgr.peak_memory),
             "Parameters": self.rgr.attributes,
             "Metrics": self.rgr.metrics,
             "Index": self.rank - 1,
@@ -77,6 +93,7 @@ class SimpleRegressorListObject:
             "Rank": self.rank,
             "Training Duration": "{}s".format(self.rgr.train_duration),
             "GridSearch Duration": "{}s".format(self.rgr.gridsearch_duration),
+            "Peak Memory": "{}MB".format(self.rgr.peak_memory),
             "Parameters": self.rgr.attributes,
             "Metrics": self.rgr.metrics,
             "Index": self.rank - 1,
@@ -96,28 +113,38 @@ class SimpleRegressorList:
     ----------
     ranked_list : list
         the ranked list of SimpleRegressors
+    failed_models : list
+        the list of failed model algorithms
+    failure_reasons : dict
+        the reason every failed model algorithm failed
+    truncated_models : list
+        the list of model algorithms cut short by the time budget
     metric : str {auto, mae, mse, r2}
         the scoring metric for ranking models
+    cv_results : simple_learn.search.CandidateTable
+        the cross validation results of every evaluated candidate
     logger : logging.Logger
         logger for notifying user of warnings
 
     Methods
     -------
-    fit(train_x, train_y, folds=3)
+    fit(train_x, train_y, folds=3, search="grid", ...)
         Fits a given dataset onto SimpleRegressor and creates a ranked list based
         on scores
     pop(index = 0)
         Removes a SimpleRegressor at a specific index for usage
+    rerank(scoring)
+        Ranks the list by another scoring metric without refitting
+    top_k(k=1, scoring=None, algorithm=None)
+        Selects the best evaluated candidates of every model algorithm
     """
 
     def __init__(self, scoring="auto"):
         self.ranked_list = []
-        metric_map = {
-            "auto": "Training Score",
-            "mae": "Mean Absolute Error",
-            "mse": "Mean Squared Error",
-            "r2": "R-Squared",
-        }
+        self.failed_models = []
+        self.failure_reasons = {}
+        self.truncated_models = []
+        self.cv_results = CandidateTable([], [], {}, [], [])
         self.metric = metric_map[scoring]
         self.logger = logging.getLogger()
 
@@ -139,7 +166,22 @@ class SimpleRegressorList:
             r += 1
         return "\n".join(res) if len(res) > 1 else "The List is Empty!"
 
-    def fit(self, train_x, train_y, folds=3):
+    def fit(
+        self,
+        train_x,
+        train_y,
+        folds=3,
+        search="grid",
+        time_budget=None,
+        n_iter=20,
+        use_cache=False,
+        defer_refit=True,
+        max_samples=None,
+        callbacks=None,
+        memory_budget=None,
+        timeout=None,
+        random_state=0,
+    ):
         """
         Trains all regressors from parameter grid by running model algorithm search.
 
@@ -147,62 +189,130 @@ class SimpleRegressorList:
 
         Parameters
         ----------
-        train_x : numpy.ndarray
-            The features for training regression model
-        train_y : numpy.ndarray
-            The corresponding label for feature array
+        train_x : numpy.ndarray or str
+            The features for training regression model, or the path
+            of a .npy file that is memory mapped instead of loaded
+        train_y : numpy.ndarray or str
+            The corresponding label for feature array, or the path
+            of a .npy file
         folds : int, optional
             The number of folds for cross validation
+        search : str {grid, halving, adaptive}, optional
+            The hyper-parameter search strategy, halving evaluates
+            candidates on growing budgets and drops the weakest,
+            adaptive samples candidates guided by previous scores
+        time_budget : float, optional
+            The wall-clock seconds available for the search, once
+            they run out the best model found so far is kept
+        n_iter : int, optional
+            The number of candidates evaluated per model algorithm
+            by the adaptive search
+        use_cache : bool, optional
+            Whether to reuse the scores of candidates evaluated on the
+            same data by earlier searches, kept in the score cache
+            directory
+        defer_refit : bool, optional
+            Whether to refit the best candidate of each model
+            algorithm only once its SimpleRegressor is popped or used for
+            prediction
+        max_samples : int, optional
+            The largest number of samples to search on, larger
+            datasets are searched on a random subsample, without it
+            every model algorithm holds as many samples in memory as
+            its workers can fit
+        callbacks : list, optional
+            The sinks called with every search event, by default a
+            progress bar, an empty list searches without writing to
+            the terminal
+        memory_budget : int, optional
+            The bytes available to the worker processes of the search,
+            fewer fits run at once and the candidates that can't fit
+            it are skipped
+        timeout : float, optional
+            The wall-clock seconds every model algorithm may search
+            for, counted from its first fit however many of its fits
+            run in parallel, one that runs longer or crashes its
+            worker is added to the failed models and the search
+            carries on
+        random_state : int, optional
+            The seed of the adaptive search and of the max_samples
+            subsample, the same seed searches the same candidates
         """
 
-        estimators = all_estimators(type_filter="regressor")
-        with tqdm(
-            total=(len(model_param_map)),
-            desc="Creating Regressor List",
-            unit=" Regressor",
-            ncols=100,
-        ) as progressbar:
-            for name, RegressionClass in estimators:
-                if name in model_param_map:
-                    param_grid = model_param_map[name]
-                    grid_rgr = GridSearchCV(
-                        RegressionClass(),
-                        param_grid,
-                        cv=folds,
-                        scoring="neg_root_mean_squared_error",
-                        verbose=0,
-                        n_jobs=-1,
-                        error_score="raise",
+        train_x, train_y = open_data(
+            train_x, train_y, max_samples=max_samples, random_state=random_state
+        )
+        if callbacks is None:
+            callbacks = [
+                event_sinks.TqdmSink(desc="Creating Regressor List", unit=" Regressor")
+            ]
+        with SearchEvents(callbacks) as events:
+            estimators = import_estimators(model_import_map)
+            results = search_models(
+                estimators,
+                model_param_map,
+                train_x,
+                train_y,
+                folds,
+                regressor_scoring,
+                classifier=False,
+                search=search,
+                time_budget=time_budget,
+                n_iter=n_iter,
+                cache=ScoreCache() if use_cache else None,
+                error_score="raise",
+                events=events,
+                memory_budget=memory_budget,
+                algorithm_timeout=timeout,
+                random_state=random_state,
+                refit="auto",
+                defer_refit=defer_refit,
+            )
+            for grid_rgr in results:
+                name = grid_rgr.name
+                if grid_rgr.truncated:
+                    self.truncated_models.append(name)
+                if grid_rgr.error is not None:
+                    self.failed_models.append(name)
+                    self.failure_reasons[name] = (
+                        f"{type(grid_rgr.error).__name__}: {grid_rgr.error}"
                     )
-                    progressbar.update(1)
-                    start = time.time()
-                    try:
-                        grid_rgr.fit(train_x, train_y)
-                    except BaseException as error:
-                        self.logger.warning(f"{name} failed due to, Error : {error}.")
-                        continue
-                    end = time.time()
-                    rgr = SimpleRegressor()
-                    rgr.metrics["Training Score"] = -grid_rgr.best_score_
-                    pred_y = grid_rgr.predict(train_x)
-                    rgr.metrics["Mean Absolute Error"] = mean_absolute_error(
-                        train_y, pred_y
+                    self.logger.warning(
+                        f"{name} failed due to, Error : {grid_rgr.error}."
                     )
-                    rgr.metrics["Mean Squared Error"] = mean_squared_error(
-                        train_y, pred_y
-                    )
-                    rgr.metrics["R-Squared"] = r2_score(train_y, pred_y)
+                    continue
+                rgr = SimpleRegressor()
+                scores = grid_rgr.best_scores()
+                for scoring, metric in metric_map.items():
+                    sign = -1 if metric in error_metrics else 1
+                    rgr.metrics[metric] = sign * scores[scoring]
+                if grid_rgr.best_estimator_ is None:
+                    rgr._defer_refit(grid_rgr, train_x, train_y)
+                else:
                     rgr.sk_model = grid_rgr.best_estimator_
-                    rgr.name = name
-                    rgr.attributes = grid_rgr.best_params_
-                    rgr.train_duration = grid_rgr.refit_time_
-                    rgr.gridsearch_duration = end - start
-                    self.ranked_list.append(rgr)
-                metrik = lambda rgr: rgr.metrics[self.metric]
-                self.ranked_list.sort(reverse=False, key=metrik)
+                rgr.name = name
+                rgr.attributes = grid_rgr.best_params_
+                rgr.train_duration = grid_rgr.refit_time_
+                rgr.gridsearch_duration = grid_rgr.search_duration
+                rgr.peak_memory = (
+                    None
+                    if grid_rgr.peak_memory is None
+                    else round(grid_rgr.peak_memory / 2**20, 1)
+                )
+                self.ranked_list.append(rgr)
+            self.cv_results = CandidateTable.from_results(
+                results,
+                {
+                    metric: (scoring, -1 if metric in error_metrics else 1)
+                    for scoring, metric in metric_map.items()
+                },
+            )
+            metrik = lambda rgr: rgr.metrics[self.metric]
+            self.ranked_list.sort(reverse=self.metric not in error_metrics, key=metrik)
 
     def pop(self, index=0):
-        """Removes SimpleRegressor from a specific index in ranked list.
+        """Removes SimpleRegressor from a specific index in ranked list and fits its
+        model if the refit was deferred.
 
         Parameters
         ----------
@@ -211,4 +321,44 @@ class SimpleRegressorList:
             being removed from ranked list
         """
 
-        return self.ranked_list.pop(index)
+        rgr = self.ranked_list.pop(index)
+        rgr.materialize()
+        return rgr
+
+    def rerank(self, scoring):
+        """Ranks the list by another scoring metric without refitting any model.
+
+        Parameters
+        ----------
+        scoring : str {auto, mae, mse, r2}
+            The scoring metric for ranking models
+        """
+
+        self.metric = metric_map[scoring]
+        metrik = lambda rgr: rgr.metrics[self.metric]
+        self.ranked_list.sort(reverse=self.metric not in error_metrics, key=metrik)
+
+    def top_k(self, k=1, scoring=None, algorithm=None):
+        """Selects the best evaluated candidates of every model algorithm from the
+        cross validation results.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of candidates per model algorithm
+        scoring : str {auto, mae, mse, r2}, optional
+            The scoring metric for ranking candidates, defaults to the scoring
+            metric of the list
+        algorithm : str, optional
+            The model algorithm to select candidates from
+
+        Returns
+        -------
+        simple_learn.search.CandidateTable
+            The selected candidates ordered from best to worst
+        """
+
+        metric = self.metric if scoring is None else metric_map[scoring]
+        return self.cv_results.filter(algorithm=algorithm).top_k(
+            metric, k=k, greater_is_better=metric not in error_metrics
+        )
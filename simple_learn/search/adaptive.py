@@ -0,0 +1,229 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+import numbers
+
+import numpy as np
+from sklearn.utils import check_random_state
+
+
+def _is_ordinal(values):
+    return all(
+        isinstance(value, numbers.Number) and not isinstance(value, bool)
+        for value in values
+    )
+
+
+class TPESampler:
+    """
+    A class used to propose hyper-parameter candidates from a
+    grid with a tree-structured Parzen estimator
+
+    Every grid entry is treated as a search space. The evaluated
+    candidates are split into the best scoring fraction and the
+    rest, a smoothed density is fitted to each group and new
+    candidates are drawn where the best candidates are dense and
+    the others sparse. Numeric grid entries are smoothed over
+    neighbouring values, all other entries are categorical.
+
+    ...
+
+    Attributes
+    ----------
+    params : list
+        the names of the hyper-parameters
+    choices : list
+        the grid values of every hyper-parameter
+    size : int
+        the number of candidates in the grid
+    gamma : float
+        the fraction of evaluated candidates treated as good
+    n_startup : int
+        the number of random candidates before the model is used
+    n_samples : int
+        the number of samples drawn to pick each candidate
+    random_state : numpy.random.RandomState
+        the random number generator
+
+    Methods
+    -------
+    propose(candidates, scores, n)
+        Proposes up to n unseen candidates
+    """
+
+    def __init__(
+        self, param_grid, gamma=0.25, n_startup=5, n_samples=24, random_state=None
+    ):
+        self.params = sorted(param_grid)
+        self.choices = [list(param_grid[param]) for param in self.params]
+        self.size = int(np.prod([len(values) for values in self.choices]))
+        self.gamma = gamma
+        self.n_startup = n_startup
+        self.n_samples = n_samples
+        self.random_state = check_random_state(random_state)
+        self._ordinal = [_is_ordinal(values) for values in self.choices]
+
+    def _encode(self, candidate):
+        return tuple(
+            next(i for i, value in enumerate(values) if value == candidate[param])
+            for param, values in zip(self.params, self.choices)
+        )
+
+    def _decode(self, indices):
+        return {
+            param: values[i]
+            for param, values, i in zip(self.params, self.choices, indices)
+        }
+
+    def _random(self):
+        return tuple(self.random_state.randint(len(values)) for values in self.choices)
+
+    def _density(self, observed, dim):
+        n_choices = len(self.choices[dim])
+        density = np.ones(n_choices) / n_choices
+        if self._ordinal[dim]:
+            grid = np.arange(n_choices)
+            bandwidth = max(1.0, n_choices / 10)
+            for indices in observed:
+                density += np.exp(-0.5 * ((grid - indices[dim]) / bandwidth) ** 2)
+        else:
+            for indices in observed:
+                density[indices[dim]] += 1.0
+        return density / density.sum()
+
+    def propose(self, candidates, scores, n):
+        """Proposes hyper-parameter candidates that have not
+        been evaluated yet
+
+        Parameters
+        ----------
+        candidates : list
+            The evaluated hyper-parameter combinations
+        scores : numpy.ndarray
+            The mean cross validation score of every evaluated
+            candidate, failed candidates are nan
+        n : int
+            The number of candidates to propose
+
+        Returns
+        -------
+        list
+            Up to n unseen hyper-parameter combinations
+        """
+
+        seen = {self._encode(candidate) for candidate in candidates}
+        n = min(n, self.size - len(seen))
+        proposals = []
+
+        if len(candidates) >= self.n_startup:
+            ranked = np.where(np.isnan(scores), -np.inf, scores)
+            order = np.argsort(-ranked, kind="stable")
+            n_good = max(1, int(math.ceil(self.gamma * len(candidates))))
+            good = [self._encode(candidates[i]) for i in order[:n_good]]
+            bad = [self._encode(candidates[i]) for i in order[n_good:]]
+            good_density = [self._density(good, dim) for dim in range(len(self.params))]
+            bad_density = [self._density(bad, dim) for dim in range(len(self.params))]
+
+            samples = set()
+            for _ in range(self.n_samples * n):
+                samples.add(
+                    tuple(
+                        self.random_state.choice(len(density), p=density)
+                        for density in good_density
+                    )
+                )
+            ratios = {
+                sample: sum(
+                    np.log(good_density[dim][i]) - np.log(bad_density[dim][i])
+                    for dim, i in enumerate(sample)
+                )
+                for sample in samples - seen
+            }
+            for sample in sorted(ratios, key=ratios.get, reverse=True)[:n]:
+                proposals.append(sample)
+                seen.add(sample)
+
+        # Fill up with random candidates, enumerating small grids
+        # once rejection sampling stops finding unseen candidates
+        attempts = 0
+        while len(proposals) < n and attempts < 100 * n:
+            sample = self._random()
+            attempts += 1
+            if sample not in seen:
+                proposals.append(sample)
+                seen.add(sample)
+        if len(proposals) < n:
+            for sample in np.ndindex(*[len(values) for values in self.choices]):
+                if len(proposals) == n:
+                    break
+                if sample not in seen:
+                    proposals.append(sample)
+                    seen.add(sample)
+
+        return [self._decode(indices) for indices in proposals]
+
+
+class AdaptiveProposer:
+    """
+    A class used to drive the adaptive search of every model
+    algorithm from a SearchScheduler
+
+    Model algorithms whose whole grid fits in the evaluation
+    count are evaluated exhaustively.
+
+    ...
+
+    Attributes
+    ----------
+    param_map : dict
+        the hyper-parameter grid of every model algorithm
+    n_iter : int
+        the number of candidates evaluated per model algorithm
+    batch_size : int
+        the number of candidates proposed at once
+    random_state : numpy.random.RandomState
+        the random number generator shared by the samplers
+    """
+
+    def __init__(self, param_map, n_iter=20, batch_size=1, random_state=None):
+        self.param_map = param_map
+        self.n_iter = n_iter
+        self.batch_size = batch_size
+        self.random_state = check_random_state(random_state)
+        self._samplers = {}
+
+    def __call__(self, result):
+        if result.name not in self._samplers:
+            self._samplers[result.name] = TPESampler(
+                self.param_map[result.name], random_state=self.random_state
+            )
+        sampler = self._samplers[result.name]
+
+        remaining = min(self.n_iter, sampler.size) - len(result.candidates)
+        if remaining <= 0:
+            return []
+        if sampler.size <= self.n_iter:
+            return sampler.propose(result.candidates, None, remaining)
+
+        scores = result.test_scores.mean(axis=1)
+        return sampler.propose(
+            result.candidates, scores, min(self.batch_size, remaining)
+        )
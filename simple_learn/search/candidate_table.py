@@ -0,0 +1,240 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+
+
+class CandidateTable:
+    """
+    A class used to keep the cross validation results of every
+    evaluated candidate in columnar form
+
+    Queries only index numpy columns, so candidates can be
+    re-ranked and filtered without training any model.
+
+    ...
+
+    Attributes
+    ----------
+    algorithms : numpy.ndarray
+        the model algorithm of every candidate
+    params : numpy.ndarray
+        the hyper-parameters of every candidate
+    fold_scores : dict
+        the score of every candidate and fold for each metric
+    mean_scores : dict
+        the mean score of every candidate for each metric
+    fit_times : numpy.ndarray
+        the mean fit duration of every candidate
+    score_times : numpy.ndarray
+        the mean scoring duration of every candidate
+
+    Methods
+    -------
+    from_results(results, metrics)
+        Creates a CandidateTable from search results
+    take(indices)
+        Selects candidates by position
+    filter(algorithm=None, mask=None)
+        Selects candidates by model algorithm or boolean mask
+    sort(metric, greater_is_better=True)
+        Orders candidates from best to worst
+    top_k(metric, k=1, greater_is_better=True)
+        Selects the best k candidates of every model algorithm
+    """
+
+    def __init__(self, algorithms, params, fold_scores, fit_times, score_times):
+        self.algorithms = np.asarray(algorithms, dtype=str)
+        self.params = np.empty(len(params), dtype=object)
+        self.params[:] = list(params)
+        self.fold_scores = fold_scores
+        self.mean_scores = {
+            metric: scores.mean(axis=1) for metric, scores in fold_scores.items()
+        }
+        self.fit_times = np.asarray(fit_times, dtype=float)
+        self.score_times = np.asarray(score_times, dtype=float)
+
+    @classmethod
+    def from_results(cls, results, metrics):
+        """Creates a CandidateTable from the successful searches
+        of many model algorithms
+
+        Parameters
+        ----------
+        results : list
+            The ModelSearchResult of every model algorithm
+        metrics : dict
+            The (search metric, sign) of each metric name, the sign
+            is applied to the search scores and -1 turns a negated
+            error back into an error
+
+        Returns
+        -------
+        CandidateTable
+            The results of every evaluated candidate
+        """
+
+        results = [result for result in results if result.error is None]
+        n_folds = max([result.test_scores.shape[1] for result in results] + [0])
+        results = [
+            result for result in results if result.test_scores.shape[1] == n_folds
+        ]
+        algorithms = [
+            result.name for result in results for _ in range(len(result.candidates))
+        ]
+        params = [candidate for result in results for candidate in result.candidates]
+
+        def stack(arrays):
+            if not arrays:
+                return np.empty((0, n_folds))
+            return np.vstack(arrays)
+
+        def scores(result, metric):
+            if not result.metrics:
+                return result.test_scores
+            return result.metric_scores[metric]
+
+        fold_scores = {
+            name: sign * stack([scores(result, metric) for result in results])
+            for name, (metric, sign) in metrics.items()
+        }
+        fit_times = stack([result.fit_times for result in results]).mean(axis=1)
+        score_times = stack([result.score_times for result in results]).mean(axis=1)
+        return cls(algorithms, params, fold_scores, fit_times, score_times)
+
+    def __len__(self):
+        return len(self.algorithms)
+
+    def __getitem__(self, index):
+        row = {
+            "Type": str(self.algorithms[index]),
+            "Parameters": self.params[index],
+            "Fit Duration": "{}s".format(self.fit_times[index]),
+            "Score Duration": "{}s".format(self.score_times[index]),
+        }
+        for metric, scores in self.mean_scores.items():
+            row[metric] = scores[index]
+        return row
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def take(self, indices):
+        """Selects candidates by position
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            The positions of the selected candidates
+
+        Returns
+        -------
+        CandidateTable
+            The selected candidates in the given order
+        """
+
+        indices = np.asarray(indices, dtype=int)
+        return CandidateTable(
+            self.algorithms[indices],
+            self.params[indices],
+            {metric: scores[indices] for metric, scores in self.fold_scores.items()},
+            self.fit_times[indices],
+            self.score_times[indices],
+        )
+
+    def filter(self, algorithm=None, mask=None):
+        """Selects candidates by model algorithm or boolean mask
+
+        Parameters
+        ----------
+        algorithm : str, optional
+            The model algorithm to keep
+        mask : numpy.ndarray, optional
+            The boolean mask of candidates to keep
+
+        Returns
+        -------
+        CandidateTable
+            The selected candidates
+        """
+
+        keep = np.ones(len(self), dtype=bool)
+        if algorithm is not None:
+            keep &= self.algorithms == algorithm
+        if mask is not None:
+            keep &= np.asarray(mask, dtype=bool)
+        return self.take(np.flatnonzero(keep))
+
+    def _sort_key(self, metric, greater_is_better):
+        if metric not in self.mean_scores:
+            raise ValueError(
+                f"'{metric}' was not cross validated, use one of "
+                f"{list(self.mean_scores)}"
+            )
+        key = self.mean_scores[metric]
+        key = -key if greater_is_better else key
+        return np.where(np.isnan(key), np.inf, key)
+
+    def sort(self, metric, greater_is_better=True):
+        """Orders candidates from best to worst
+
+        Parameters
+        ----------
+        metric : str
+            The metric to order by
+        greater_is_better : bool, optional
+            Whether higher values of the metric are better
+
+        Returns
+        -------
+        CandidateTable
+            The ordered candidates
+        """
+
+        key = self._sort_key(metric, greater_is_better)
+        return self.take(np.argsort(key, kind="stable"))
+
+    def top_k(self, metric, k=1, greater_is_better=True):
+        """Selects the best k candidates of every model algorithm
+
+        Parameters
+        ----------
+        metric : str
+            The metric to rank by
+        k : int, optional
+            The number of candidates kept per model algorithm
+        greater_is_better : bool, optional
+            Whether higher values of the metric are better
+
+        Returns
+        -------
+        CandidateTable
+            The selected candidates ordered from best to worst
+        """
+
+        key = self._sort_key(metric, greater_is_better)
+        order = np.lexsort((key, self.algorithms))
+        grouped = self.algorithms[order]
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = grouped[1:] != grouped[:-1]
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))
+        selected = order[np.arange(len(order)) - group_start < k]
+        return self.take(selected[np.argsort(key[selected], kind="stable")])
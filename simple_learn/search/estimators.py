@@ -0,0 +1,54 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import importlib
+
+
+def import_estimators(import_map, partial_fit=False):
+    """Imports the estimator classes of the model algorithms
+    instead of importing every sklearn module to find them.
+
+    Model algorithms missing from the installed sklearn are
+    skipped.
+
+    Parameters
+    ----------
+    import_map : dict
+        The module of every model algorithm
+    partial_fit : bool, optional
+        Whether to only keep the estimators supporting partial_fit
+
+    Returns
+    -------
+    list
+        The (name, estimator class) of every model algorithm, sorted
+        by name
+    """
+
+    estimators = []
+    for name in sorted(import_map):
+        try:
+            EstimatorClass = getattr(importlib.import_module(import_map[name]), name)
+        except (ImportError, AttributeError):
+            continue
+        if partial_fit and not hasattr(EstimatorClass, "partial_fit"):
+            continue
+        estimators.append((name, EstimatorClass))
+    return estimators
@@ -0,0 +1,254 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+
+import numpy as np
+
+# Events sent to the sinks of a model search, in the order they occur
+search_events = [
+    "search_start",
+    "algorithm_start",
+    "candidate_end",
+    "failure",
+    "incumbent",
+    "algorithm_end",
+    "search_end",
+]
+
+
+def _score(value):
+    # NaN scores of failed fits become None so every sink gets plain JSON
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+class SearchEvents:
+    """
+    A class used to send the events of a model search to sinks
+
+    Every event is a dict with its name under "event", the time it
+    occurred under "time" and the fields of the event. A sink is any
+    callable taking the event, sinks with a close method are closed
+    with the SearchEvents.
+
+    ...
+
+    Attributes
+    ----------
+    sinks : list
+        the callables receiving every event
+    incumbent : tuple
+        the (model algorithm, score) of the best model algorithm so
+        far, None before the first one succeeded
+
+    Methods
+    -------
+    emit(event, **fields)
+        Sends an event to every sink
+    search_start(algorithms, n_samples, search)
+        Sends the start of a model search
+    algorithm_start(algorithm, n_candidates)
+        Sends the start of the search of a model algorithm
+    candidate_end(result, candidate, fold, cached=False, ...)
+        Sends the score and durations of a candidate and fold
+    algorithm_end(result)
+        Sends the end of the search of a model algorithm, with its
+        failure or new incumbent
+    failure(algorithm, error)
+        Sends the failure of a model algorithm
+    search_end(results)
+        Sends the end of a model search
+    close()
+        Closes every sink
+    """
+
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks or [])
+        self.incumbent = None
+        self._start = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def emit(self, event, **fields):
+        """Sends an event to every sink
+
+        Parameters
+        ----------
+        event : str
+            The name of the event
+        **fields
+            The fields of the event
+        """
+
+        record = {"event": event, "time": time.time(), **fields}
+        for sink in self.sinks:
+            sink(record)
+
+    def search_start(self, algorithms, n_samples, search):
+        """Sends the start of a model search
+
+        Parameters
+        ----------
+        algorithms : list
+            The name of every model algorithm
+        n_samples : int
+            The number of samples searched on
+        search : str
+            The search strategy
+        """
+
+        self._start = time.time()
+        self.incumbent = None
+        self.emit(
+            "search_start",
+            algorithms=list(algorithms),
+            n_samples=int(n_samples),
+            search=search,
+        )
+
+    def algorithm_start(self, algorithm, n_candidates):
+        """Sends the start of the search of a model algorithm
+
+        Parameters
+        ----------
+        algorithm : str
+            The name of the model algorithm
+        n_candidates : int
+            The number of candidates known at the start, the
+            adaptive search proposes more while it runs
+        """
+
+        self.emit("algorithm_start", algorithm=algorithm, n_candidates=n_candidates)
+
+    def candidate_end(
+        self, result, candidate, fold, cached=False, worker=None, peak_memory=None
+    ):
+        """Sends the score and durations of a candidate and fold
+
+        Parameters
+        ----------
+        result : simple_learn.search.ModelSearchResult
+            The search of the model algorithm
+        candidate : int
+            The index of the candidate
+        fold : int
+            The index of the fold
+        cached : bool, optional
+            Whether the score was read from the score cache
+        worker : int, optional
+            The process id of the worker that evaluated the fold
+        peak_memory : int, optional
+            The peak resident bytes of the worker during the fold
+        """
+
+        self.emit(
+            "candidate_end",
+            algorithm=result.name,
+            candidate=int(candidate),
+            params=result.candidates[candidate],
+            fold=int(fold),
+            score=_score(result.test_scores[candidate, fold]),
+            fit_time=float(result.fit_times[candidate, fold]),
+            score_time=float(result.score_times[candidate, fold]),
+            cached=cached,
+            worker=worker,
+            peak_memory=peak_memory,
+        )
+
+    def algorithm_end(self, result):
+        """Sends the end of the search of a model algorithm,
+        preceded by its failure or by the new incumbent it became
+
+        Parameters
+        ----------
+        result : simple_learn.search.ModelSearchResult
+            The search of the model algorithm
+        """
+
+        if result.error is not None:
+            self.failure(result.name, result.error)
+        elif result.best_score_ is not None and not np.isnan(result.best_score_):
+            if self.incumbent is None or result.best_score_ > self.incumbent[1]:
+                self.incumbent = (result.name, float(result.best_score_))
+                self.emit(
+                    "incumbent",
+                    algorithm=result.name,
+                    score=float(result.best_score_),
+                    params=result.best_params_,
+                )
+        self.emit(
+            "algorithm_end",
+            algorithm=result.name,
+            failed=result.error is not None,
+            truncated=result.truncated,
+            best_score=(
+                None if result.best_score_ is None else _score(result.best_score_)
+            ),
+            best_params=result.best_params_,
+            search_duration=result.search_duration,
+            peak_memory=result.peak_memory,
+        )
+
+    def failure(self, algorithm, error):
+        """Sends the failure of a model algorithm
+
+        Parameters
+        ----------
+        algorithm : str
+            The name of the model algorithm
+        error : BaseException
+            The error the model algorithm failed with
+        """
+
+        self.emit(
+            "failure",
+            algorithm=algorithm,
+            error_type=type(error).__name__,
+            error=str(error),
+        )
+
+    def search_end(self, results):
+        """Sends the end of a model search
+
+        Parameters
+        ----------
+        results : list
+            The ModelSearchResult of every model algorithm
+        """
+
+        self.emit(
+            "search_end",
+            duration=None if self._start is None else time.time() - self._start,
+            best_algorithm=None if self.incumbent is None else self.incumbent[0],
+            best_score=None if self.incumbent is None else self.incumbent[1],
+            n_failed=sum(result.error is not None for result in results),
+        )
+
+    def close(self):
+        """Closes every sink that has a close method"""
+
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
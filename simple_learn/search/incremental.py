@@ -0,0 +1,140 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+import time
+import warnings
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import clone, is_classifier
+
+# The ways a fitted model can take in new data
+update_paths = ["partial_fit", "warm_start", "refit"]
+
+
+def _grown_resource(estimator):
+    # Only resources counting fitted stages grow, a warm started
+    # max_iter of a solver restarts from zero every fit
+    params = estimator.get_params()
+    if "warm_start" not in params:
+        return None
+    if "n_estimators" in params:
+        return "n_estimators"
+    if "max_iter" in params and np.isscalar(getattr(estimator, "n_iter_", None)):
+        return "max_iter"
+    return None
+
+
+def update_path(estimator, new_y):
+    """Chooses how a fitted model takes in new data.
+
+    Models supporting partial_fit keep learning from the new
+    samples and warm started ensembles add new stages fit on them.
+    Classifiers only do so when the new labels are known classes,
+    a warm started ensemble also needs every known class. Every
+    other model is refit with the same hyper-parameters.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The fitted model
+    new_y : numpy.ndarray
+        The labels of the new samples
+
+    Returns
+    -------
+    str
+        One of update_paths
+    """
+
+    labels = known = None
+    if is_classifier(estimator) and hasattr(estimator, "classes_"):
+        labels = set(np.unique(new_y).tolist())
+        known = set(np.asarray(estimator.classes_).tolist())
+
+    if hasattr(estimator, "partial_fit"):
+        if labels is None or labels <= known:
+            return "partial_fit"
+    elif _grown_resource(estimator) is not None:
+        if labels is None or labels == known:
+            return "warm_start"
+    return "refit"
+
+
+def _stack(old, new):
+    if sp.issparse(old) or sp.issparse(new):
+        return sp.vstack([old, new], format="csr")
+    return np.concatenate([np.asarray(old), np.asarray(new)])
+
+
+def update_estimator(estimator, new_x, new_y, growth=0.1, train_x=None, train_y=None):
+    """Updates a fitted model with new samples without
+    searching its hyper-parameters again.
+
+    A model that can only be refit is refit on the previous
+    training data followed by the new samples. Without the
+    previous training data it is refit on the new samples alone
+    and forgets everything it learned before, which is warned
+    about.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The fitted model
+    new_x : numpy.ndarray
+        The features of the new samples
+    new_y : numpy.ndarray
+        The corresponding label for feature array
+    growth : float, optional
+        The fraction of stages a warm started ensemble adds
+    train_x : numpy.ndarray, optional
+        The features the model was trained on so far
+    train_y : numpy.ndarray, optional
+        The corresponding label for the previous feature array
+
+    Returns
+    -------
+    tuple
+        The updated model, the update path taken and the duration
+        of the update
+    """
+
+    path = update_path(estimator, new_y)
+    start = time.time()
+    if path == "partial_fit":
+        estimator.partial_fit(new_x, new_y)
+    elif path == "warm_start":
+        resource = _grown_resource(estimator)
+        size = estimator.get_params()[resource]
+        estimator.set_params(
+            warm_start=True, **{resource: size + max(1, math.ceil(size * growth))}
+        )
+        estimator.fit(new_x, new_y)
+    elif train_x is not None and train_y is not None:
+        estimator = clone(estimator).fit(_stack(train_x, new_x), _stack(train_y, new_y))
+    else:
+        warnings.warn(
+            f"{type(estimator).__name__} can only be refit and no previous "
+            "training data was given, it is refit on the new samples alone",
+            UserWarning,
+        )
+        estimator = clone(estimator).fit(new_x, new_y)
+    return estimator, path, time.time() - start
@@ -0,0 +1,273 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    import resource
+except ImportError:  # resource is only available on Unix
+    resource = None
+
+# Bytes of a fitted tree node, without the values it predicts
+tree_node_bytes = 64
+
+# Model algorithms growing full depth trees, and their default number of trees
+forest_algorithms = {
+    "DecisionTreeClassifier": 1,
+    "DecisionTreeRegressor": 1,
+    "ExtraTreeClassifier": 1,
+    "RandomForestClassifier": 100,
+    "RandomForestRegressor": 100,
+}
+
+# Model algorithms computing blocks of pairwise distances
+neighbor_algorithms = ["KNeighborsClassifier", "KNeighborsRegressor"]
+
+# Bytes of pairwise distances computed at once by sklearn, see working_memory
+default_working_memory = 1024 * 1024**2
+
+
+def _status_bytes(field):
+    # Reads a kB field of /proc/self/status, None where it does not exist
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss():
+    """Returns the resident set size of the current process
+
+    Returns
+    -------
+    int
+        The resident bytes, None where they can't be measured
+    """
+
+    return _status_bytes("VmRSS")
+
+
+def peak_rss():
+    """Returns the peak resident set size of the current process
+    since it started or since reset_peak
+
+    Returns
+    -------
+    int
+        The peak resident bytes, None where they can't be measured
+    """
+
+    peak = _status_bytes("VmHWM")
+    if peak is None and resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        peak = peak if sys.platform == "darwin" else peak * 1024
+    return peak
+
+
+def available_memory():
+    """Returns the memory the operating system can hand out to
+    new allocations without swapping
+
+    Returns
+    -------
+    int
+        The available bytes, None where they can't be measured
+    """
+
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def reset_peak():
+    """Resets the peak resident set size of the current process
+    to its current resident set size, only possible on Linux
+
+    Returns
+    -------
+    bool
+        Whether the peak was reset, otherwise peak_rss keeps the
+        peak since the process started
+    """
+
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _int_param(params, name, default):
+    # Grids may hold numbers as strings, None means unlimited
+    try:
+        return int(params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def estimate_footprint(
+    name,
+    params,
+    n_samples,
+    n_features,
+    n_values=1,
+    working_memory=default_working_memory,
+):
+    """Estimates the bytes a worker needs on top of its baseline
+    to fit and score a single candidate
+
+    The estimate covers the copy of the fold and the largest
+    structure the model algorithm builds, the nodes of fully grown
+    trees or the blocks of pairwise distances of nearest neighbors.
+    The scheduler scales it by the peaks it measures.
+
+    Parameters
+    ----------
+    name : str
+        The name of the model algorithm
+    params : dict
+        The hyper-parameters of the candidate
+    n_samples : int
+        The number of training samples
+    n_features : int
+        The number of features
+    n_values : int, optional
+        The number of values predicted per tree node, the number of
+        classes times the number of outputs
+    working_memory : int, optional
+        The bytes of pairwise distances sklearn computes at once
+
+    Returns
+    -------
+    int
+        The estimated bytes
+    """
+
+    data = n_samples * n_features * 8
+    if name in forest_algorithms:
+        n_trees = _int_param(params, "n_estimators", forest_algorithms[name])
+        n_nodes = 2 * n_samples
+        max_depth = _int_param(params, "max_depth", None)
+        if max_depth is not None:
+            n_nodes = min(n_nodes, 2 ** (max_depth + 1))
+        return data + n_trees * n_nodes * (tree_node_bytes + 8 * n_values)
+    if name in neighbor_algorithms:
+        return data + min(n_samples * n_samples * 8, working_memory)
+    return 2 * data
+
+
+def feature_width(train_x):
+    """Returns the number of 8 byte values stored per sample, the
+    number of features of dense data
+
+    Sparse data stores an index next to every non-zero value, so a
+    sample takes one and a half values per non-zero feature.
+
+    Parameters
+    ----------
+    train_x : numpy.ndarray or scipy.sparse.spmatrix
+        The features for training
+
+    Returns
+    -------
+    int
+        The values stored per sample
+    """
+
+    if sp.issparse(train_x):
+        n_rows = max(1, train_x.shape[0])
+        return max(1, int(np.ceil(1.5 * train_x.nnz / n_rows)))
+    return train_x.shape[1]
+
+
+def plan_rows(
+    name,
+    params,
+    n_samples,
+    n_features,
+    memory,
+    n_values=1,
+    working_memory=default_working_memory,
+):
+    """Plans the number of samples a single fit of a candidate
+    holds in memory at once
+
+    Parameters
+    ----------
+    name : str
+        The name of the model algorithm
+    params : dict
+        The hyper-parameters of the candidate
+    n_samples : int
+        The number of training samples
+    n_features : int
+        The number of values stored per sample
+    memory : int
+        The bytes available to the fit on top of the baseline of
+        its process
+    n_values : int, optional
+        The number of values predicted per tree node, the number of
+        classes times the number of outputs
+    working_memory : int, optional
+        The bytes of pairwise distances sklearn computes at once
+
+    Returns
+    -------
+    int
+        n_samples when the estimated footprint of every sample fits
+        in memory, otherwise the largest number of samples that
+        fits, 0 when not even a single one does
+    """
+
+    def fits(rows):
+        footprint = estimate_footprint(
+            name, params, rows, n_features, n_values, working_memory
+        )
+        return footprint <= memory
+
+    if fits(n_samples):
+        return n_samples
+    # The footprint grows with the number of samples
+    low, high = 0, n_samples
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -0,0 +1,575 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import numpy as np
+from joblib import effective_n_jobs
+from joblib.externals.loky.process_executor import (
+    BrokenProcessPool,
+    ProcessPoolExecutor,
+)
+from sklearn import config_context
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import (
+    GridSearchCV,
+    HalvingGridSearchCV,
+    ParameterGrid,
+    cross_validate,
+)
+from sklearn.utils import _safe_indexing
+
+from simple_learn.search.adaptive import AdaptiveProposer
+from simple_learn.search.events import SearchEvents
+from simple_learn.search.memory import (
+    available_memory,
+    current_rss,
+    estimate_footprint,
+    feature_width,
+    plan_rows,
+)
+from simple_learn.search.neighbors import fastest_algorithm, shares_graph
+from simple_learn.search.scheduler import SearchScheduler
+from simple_learn.search.search_result import ModelSearchResult
+from simple_learn.search.shared_data import (
+    SharedDataset,
+    attach,
+    prepare_data,
+    subsample,
+)
+
+# Supported hyper-parameter search strategies
+search_strategies = ["grid", "halving", "adaptive"]
+
+# Hyper-parameters that can act as the budget of a successive halving search
+iterative_resources = ["n_estimators", "max_iter"]
+
+
+def _plan_samples(name, param_grid, n_samples, n_features, n_values, memory_budget):
+    # Samples the fits of every candidate can hold in the memory of a worker
+    memory = memory_budget
+    if memory_budget is None:
+        available = available_memory()
+        if available is None:
+            return n_samples
+        memory = available // effective_n_jobs(-1)
+    memory -= current_rss() or 0
+    return min(
+        plan_rows(name, params, n_samples, n_features, memory, n_values)
+        for params in ParameterGrid(param_grid)
+    )
+
+
+def _budget_jobs(name, param_grid, n_samples, n_features, n_values, memory_budget):
+    # Workers whose fits of the largest candidate fit in the memory budget
+    footprint = max(
+        estimate_footprint(name, params, n_samples, n_features, n_values)
+        for params in ParameterGrid(param_grid)
+    )
+    return min(
+        effective_n_jobs(-1), memory_budget // ((current_rss() or 0) + footprint)
+    )
+
+
+def _search_algorithm(
+    train_x,
+    train_y,
+    name,
+    EstimatorClass,
+    param_grid,
+    folds,
+    scoring,
+    search,
+    error_score,
+    refit,
+    defer_refit,
+    n_jobs,
+    finite,
+    sample=None,
+):
+    # Runs the halving search of a single model algorithm
+    if sample is not None:
+        train_x = _safe_indexing(train_x, sample)
+        train_y = _safe_indexing(train_y, sample)
+    metrics = None
+    search_scoring = scoring
+    if isinstance(scoring, dict):
+        metrics = list(scoring)
+        search_scoring = scoring[refit]
+    search_cv = build_search(
+        EstimatorClass(),
+        param_grid,
+        folds,
+        search_scoring,
+        search=search,
+        error_score=error_score,
+        refit=not defer_refit,
+        n_jobs=n_jobs,
+    )
+    with config_context(assume_finite=finite):
+        search_cv.fit(train_x, train_y)
+        result = ModelSearchResult.from_search_cv(
+            name,
+            EstimatorClass,
+            search_cv,
+            0.0,
+            metrics=metrics,
+            refit=refit,
+        )
+        if metrics is not None:
+            best_scores = cross_validate(
+                EstimatorClass(**result.best_params_),
+                train_x,
+                train_y,
+                cv=folds,
+                scoring=scoring,
+                error_score=error_score,
+            )
+            for metric in metrics:
+                result.metric_scores[metric][result.best_index_] = best_scores[
+                    f"test_{metric}"
+                ]
+    return result
+
+
+def _search_shared(handles, *args):
+    # Runs the halving search of a model algorithm in an isolated worker
+    train_x, train_y = attach(handles)
+    return _search_algorithm(train_x, train_y, *args)
+
+
+def _isolated_executor():
+    # A single worker that has imported the search before the clock of
+    # any model algorithm starts
+    executor = ProcessPoolExecutor(max_workers=1)
+    executor.submit(build_search, None, {}, 3, None).result()
+    return executor
+
+
+def build_search(
+    estimator,
+    param_grid,
+    folds,
+    scoring,
+    search="grid",
+    error_score=np.nan,
+    refit=True,
+    n_jobs=-1,
+):
+    """Creates the hyper-parameter search used for a single
+    model algorithm.
+
+    With search="halving" every candidate is first evaluated on
+    a small budget and only the top third is promoted to the next,
+    three times larger, budget. Iterative models spend their budget
+    on n_estimators/max_iter, every other model on training samples.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The unfitted estimator to tune
+    param_grid : dict
+        The hyper-parameter grid for the estimator
+    folds : int
+        The number of folds for cross validation
+    scoring : str
+        The sklearn scoring metric for ranking candidates
+    search : str {grid, halving}, optional
+        The search strategy
+    error_score : "raise" or float, optional
+        The score assigned to candidates that fail to fit
+    refit : bool, optional
+        Whether to refit the best candidate on the whole dataset
+    n_jobs : int, optional
+        The number of candidates evaluated in parallel
+
+    Returns
+    -------
+    sklearn.model_selection.BaseSearchCV
+        The unfitted hyper-parameter search
+    """
+
+    if search == "grid":
+        return GridSearchCV(
+            estimator,
+            param_grid,
+            cv=folds,
+            scoring=scoring,
+            verbose=0,
+            n_jobs=n_jobs,
+            error_score=error_score,
+            refit=refit,
+        )
+
+    if search == "halving":
+        param_grid = dict(param_grid)
+        resource = "n_samples"
+        max_resources = "auto"
+        for param in iterative_resources:
+            if param in param_grid and param in estimator.get_params():
+                resource = param
+                max_resources = int(max(param_grid.pop(param)))
+                break
+
+        return HalvingGridSearchCV(
+            estimator,
+            param_grid,
+            factor=3,
+            resource=resource,
+            max_resources=max_resources,
+            min_resources="exhaust",
+            cv=folds,
+            scoring=scoring,
+            verbose=0,
+            n_jobs=n_jobs,
+            error_score=error_score,
+            refit=refit,
+        )
+
+    raise ValueError(
+        f"Unknown search strategy '{search}', use one of {search_strategies}"
+    )
+
+
+def search_models(
+    estimators,
+    param_map,
+    train_x,
+    train_y,
+    folds,
+    scoring,
+    classifier,
+    search="grid",
+    error_score=np.nan,
+    time_budget=None,
+    n_iter=20,
+    cache=None,
+    events=None,
+    refit=None,
+    defer_refit=False,
+    memory_budget=None,
+    algorithm_timeout=None,
+    random_state=0,
+):
+    """Runs the hyper-parameter search of every given
+    model algorithm.
+
+    The grid and adaptive searches share a single work queue
+    between all model algorithms, the halving search runs one
+    model algorithm after the other. The adaptive search treats
+    each grid as a search space and evaluates n_iter candidates
+    per model algorithm, each guided by the scores of the ones
+    before it. Both score the k nearest neighbors candidates from
+    a shared neighbor graph per fold and benchmark the neighbor
+    search algorithm once instead of cross validating it.
+
+    With a time budget the grid search abandons the fits in
+    flight once the budget runs out and keeps the best fully
+    evaluated candidate of each model algorithm. The halving
+    search runs each model algorithm in a separate worker process,
+    kills the one running when the budget runs out and skips the
+    model algorithms it has not started yet. Both keep the
+    estimated duration of the deferred refit of the best model
+    algorithm, or of the refit of every model algorithm, within
+    the budget.
+
+    Every model algorithm holds as many samples in memory at once
+    as the memory of a worker allows, the memory budget or an even
+    share of the available memory. The grid and adaptive searches
+    stream the folds that don't fit to the model algorithms
+    supporting partial_fit in batches and fit every other model
+    algorithm on a random subsample of the fold, the halving search
+    runs each model algorithm on a random subsample of the data.
+
+    With a memory budget the grid and adaptive searches measure
+    the peak memory of every fit and only run as many fits at once
+    as the budget allows, skipping the candidates that can't fit
+    it on their own. The halving search runs each model algorithm
+    on as many workers as its largest candidate allows and skips
+    the model algorithms whose largest candidate can't fit it.
+
+    With an algorithm timeout a model algorithm whose search
+    runs longer fails with a TimeoutError, as does one whose
+    worker crashes with the error of the crash, and the search
+    carries on with the others. The grid and adaptive searches
+    limit the wall-clock time of the fits of each model algorithm,
+    the halving search runs each model algorithm in a separate
+    worker process that is killed once its time is up.
+
+    The training data is validated and converted once for every
+    model algorithm, the grid and adaptive searches share it with
+    their workers as a memory mapped file.
+
+    With a dict of metrics the grid and adaptive searches score
+    every metric from the same predictions of each fold. The
+    halving search only supports the refit metric and cross
+    validates the best candidate on the other metrics afterwards.
+
+    Parameters
+    ----------
+    estimators : list
+        The (name, estimator class) of every model algorithm
+    param_map : dict
+        The hyper-parameter grid of every model algorithm
+    train_x : numpy.ndarray
+        The features for training
+    train_y : numpy.ndarray
+        The corresponding label for feature array
+    folds : int
+        The number of folds for cross validation
+    scoring : str or dict
+        The sklearn scoring metric for ranking candidates, or the
+        sklearn scoring metric of every metric name
+    classifier : bool
+        Whether the model algorithms are classifiers
+    search : str {grid, halving, adaptive}, optional
+        The search strategy
+    error_score : "raise" or float, optional
+        The score assigned to candidates that fail to fit
+    time_budget : float, optional
+        The wall-clock seconds available for the search
+    n_iter : int, optional
+        The number of candidates evaluated per model algorithm by
+        the adaptive search
+    cache : simple_learn.search.ScoreCache, optional
+        The cache of previously evaluated candidates, used by the
+        grid and adaptive searches
+    events : simple_learn.search.SearchEvents, optional
+        The sinks of the start and end of the search, of every
+        model algorithm and of every evaluated candidate and fold
+    refit : str, optional
+        The metric name ranking the candidates, required with a
+        dict of metrics
+    defer_refit : bool, optional
+        Whether to skip the refit of the best candidates, the
+        caller refits the ones it keeps with refit_best
+    memory_budget : int, optional
+        The bytes available to the worker processes of the search
+    algorithm_timeout : float, optional
+        The wall-clock seconds available to the search of every
+        model algorithm, from its first dispatched fit
+    random_state : int, optional
+        The seed of the candidates proposed by the adaptive search
+
+    Returns
+    -------
+    list
+        The ModelSearchResult of every model algorithm, in the
+        order of estimators
+    """
+
+    if search not in search_strategies:
+        raise ValueError(
+            f"Unknown search strategy '{search}', use one of {search_strategies}"
+        )
+
+    metrics = None
+    if isinstance(scoring, dict):
+        if refit not in scoring:
+            raise ValueError(
+                f"refit must be one of the scoring metrics {list(scoring)}"
+            )
+        metrics = list(scoring)
+
+    events = SearchEvents() if events is None else events
+    names = [name for name, _ in estimators]
+    if search in ["grid", "adaptive"]:
+        with SearchScheduler(
+            train_x,
+            train_y,
+            folds,
+            scoring,
+            classifier,
+            error_score=error_score,
+            time_budget=time_budget,
+            cache=cache,
+            memory_budget=memory_budget,
+            algorithm_timeout=algorithm_timeout,
+        ) as scheduler:
+            n_folds = len(scheduler.splits)
+            events.search_start(names, len(scheduler.train_y), search)
+            param_map = dict(param_map)
+            for name, EstimatorClass in estimators:
+                if shares_graph(EstimatorClass):
+                    param_map[name] = fastest_algorithm(
+                        EstimatorClass, param_map[name], scheduler.train_x
+                    )
+            propose = None
+            if search == "adaptive":
+                # One batch per model algorithm keeps every worker busy
+                batch_size = -(
+                    -scheduler.n_workers // (n_folds * max(1, len(estimators)))
+                )
+                propose = AdaptiveProposer(
+                    param_map,
+                    n_iter=n_iter,
+                    batch_size=batch_size,
+                    random_state=random_state,
+                )
+
+            results = []
+            for name, EstimatorClass in estimators:
+                candidates = []
+                if propose is None:
+                    candidates = list(ParameterGrid(param_map[name]))
+                results.append(
+                    ModelSearchResult(
+                        name,
+                        EstimatorClass,
+                        candidates,
+                        n_folds,
+                        metrics=metrics,
+                        refit=refit,
+                    )
+                )
+            scheduler.run(
+                results,
+                events=events,
+                propose=propose,
+                refit=not defer_refit,
+            )
+        events.search_end(results)
+        return results
+
+    train_x, train_y, finite = prepare_data(train_x, train_y)
+    events.search_start(names, len(train_y), search)
+    n_features = feature_width(train_x)
+    n_values = len(np.unique(train_y)) if classifier else 1
+    deadline = None if time_budget is None else time.time() + time_budget
+    dataset, executor = None, None
+    if deadline is not None or algorithm_timeout is not None:
+        dataset = SharedDataset(train_x, train_y)
+    results = []
+    try:
+        for name, EstimatorClass in estimators:
+            # The refit of the best model algorithm runs within the time budget
+            reserve = 0.0
+            searched = [result for result in results if result.error is None]
+            if defer_refit and searched:
+                best = max(searched, key=lambda result: result.best_score_)
+                reserve = best.refit_estimate()
+            if deadline is not None and time.time() >= deadline - reserve:
+                result = ModelSearchResult(
+                    name, EstimatorClass, [], 0, metrics=metrics, refit=refit
+                )
+                result.truncated = True
+                result.error = TimeoutError(
+                    f"time budget of {time_budget}s ran out "
+                    "before any candidate was evaluated"
+                )
+                results.append(result)
+                events.algorithm_start(name, 0)
+                events.algorithm_end(result)
+                continue
+
+            rows = _plan_samples(
+                name, param_map[name], len(train_y), n_features, n_values, memory_budget
+            )
+            n_jobs = -1
+            if memory_budget is not None and rows > 0:
+                n_jobs = _budget_jobs(
+                    name, param_map[name], rows, n_features, n_values, memory_budget
+                )
+            if rows == 0 or n_jobs == 0:
+                result = ModelSearchResult(
+                    name, EstimatorClass, [], 0, metrics=metrics, refit=refit
+                )
+                limit = "the available memory"
+                if memory_budget is not None:
+                    limit = f"the memory budget of {memory_budget / 2**20:.0f} MiB"
+                result.error = MemoryError(
+                    f"{name} can't fit its largest candidate in {limit}"
+                )
+                results.append(result)
+                events.algorithm_start(name, 0)
+                events.algorithm_end(result)
+                continue
+
+            args = (
+                name,
+                EstimatorClass,
+                param_map[name],
+                folds,
+                scoring,
+                search,
+                error_score,
+                refit,
+                defer_refit,
+                n_jobs,
+                finite,
+                (
+                    None
+                    if rows >= len(train_y)
+                    else subsample(np.arange(len(train_y)), rows)
+                ),
+            )
+            events.algorithm_start(name, len(ParameterGrid(param_map[name])))
+            start = time.time()
+            truncated = False
+            try:
+                if dataset is None:
+                    result = _search_algorithm(train_x, train_y, *args)
+                else:
+                    if executor is None:
+                        executor = _isolated_executor()
+                    timeout = algorithm_timeout
+                    if deadline is not None:
+                        left = max(0.0, deadline - reserve - time.time())
+                        truncated = timeout is None or left < timeout
+                        timeout = left if timeout is None else min(timeout, left)
+                    future = executor.submit(_search_shared, dataset.handles, *args)
+                    try:
+                        result = future.result(timeout=timeout)
+                    except (FutureTimeoutError, BrokenProcessPool) as error:
+                        executor.shutdown(wait=False, kill_workers=True)
+                        executor = None
+                        if isinstance(error, BrokenProcessPool):
+                            raise
+                        if truncated:
+                            raise TimeoutError(
+                                f"time budget of {time_budget}s ran out "
+                                f"before the search of {name} completed"
+                            ) from None
+                        raise TimeoutError(
+                            f"{name} ran longer than its timeout of {algorithm_timeout}s"
+                        ) from None
+            except BaseException as error:
+                result = ModelSearchResult(
+                    name, EstimatorClass, [], 0, metrics=metrics, refit=refit
+                )
+                result.truncated = truncated and isinstance(error, TimeoutError)
+                result.error = error
+            else:
+                result.search_duration = time.time() - start
+                if rows < len(train_y):
+                    result.sample_rows = rows
+                for candidate in range(len(result.candidates)):
+                    for fold in range(result.test_scores.shape[1]):
+                        events.candidate_end(result, candidate, fold)
+            results.append(result)
+            events.algorithm_end(result)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if dataset is not None:
+            dataset.close()
+    events.search_end(results)
+    return results
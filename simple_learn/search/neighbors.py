@@ -0,0 +1,198 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+
+import numpy as np
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+from sklearn.utils import _safe_indexing, check_random_state
+
+# Hyper-parameters scored from a shared neighbor graph instead of separate fits
+graph_params = ["n_neighbors", "weights"]
+
+# Weighting schemes that can be applied to a precomputed neighbor graph
+graph_weights = ["uniform", "distance"]
+
+
+def shares_graph(estimator_class):
+    """Checks whether the candidates of a model algorithm can be
+    scored from a shared neighbor graph.
+
+    Parameters
+    ----------
+    estimator_class : type
+        The class of the model algorithm
+
+    Returns
+    -------
+    bool
+        True for the k nearest neighbors estimators
+    """
+
+    return issubclass(estimator_class, (KNeighborsClassifier, KNeighborsRegressor))
+
+
+def group_candidates(candidates):
+    """Groups the candidates that only differ in the number of
+    neighbors and the weighting scheme.
+
+    Parameters
+    ----------
+    candidates : list
+        The hyper-parameters of every candidate
+
+    Returns
+    -------
+    list
+        The candidate indices of every group, candidates with an
+        unsupported weighting scheme form a group of their own
+    """
+
+    groups = {}
+    for index, params in enumerate(candidates):
+        if params.get("weights", "uniform") not in graph_weights:
+            groups[("single", index)] = [index]
+            continue
+        key = tuple(
+            sorted(
+                (param, repr(value))
+                for param, value in params.items()
+                if param not in graph_params
+            )
+        )
+        groups.setdefault(key, []).append(index)
+    return list(groups.values())
+
+
+def graph_predictions(distances, indices, train_y, n_neighbors, weights, classifier):
+    """Predicts the test samples of a neighbor graph the way a
+    fitted k nearest neighbors estimator would.
+
+    Parameters
+    ----------
+    distances : numpy.ndarray
+        The distances to the nearest training samples of every
+        test sample, sorted in increasing order
+    indices : numpy.ndarray
+        The indices of the nearest training samples
+    train_y : numpy.ndarray
+        The labels of the training samples
+    n_neighbors : int
+        The number of neighbors used for the prediction, at most
+        the number of columns of the graph
+    weights : str {uniform, distance}
+        The weighting scheme of the neighbors
+    classifier : bool
+        Whether to vote on class labels or average targets
+
+    Returns
+    -------
+    numpy.ndarray
+        The prediction of every test sample
+    """
+
+    indices = indices[:, :n_neighbors]
+    neighbor_weights = None
+    if weights == "distance":
+        with np.errstate(divide="ignore"):
+            neighbor_weights = 1.0 / distances[:, :n_neighbors]
+        inf_mask = np.isinf(neighbor_weights)
+        inf_row = np.any(inf_mask, axis=1)
+        neighbor_weights[inf_row] = inf_mask[inf_row]
+
+    if not classifier:
+        neighbor_y = np.asarray(train_y)[indices]
+        if neighbor_weights is None:
+            return np.mean(neighbor_y, axis=1)
+        return np.sum(neighbor_y * neighbor_weights, axis=1) / np.sum(
+            neighbor_weights, axis=1
+        )
+
+    classes, encoded_y = np.unique(train_y, return_inverse=True)
+    if neighbor_weights is None:
+        neighbor_weights = np.ones(indices.shape)
+    votes = np.zeros((len(indices), len(classes)))
+    rows = np.repeat(np.arange(len(indices)), indices.shape[1])
+    np.add.at(votes, (rows, encoded_y[indices].ravel()), neighbor_weights.ravel())
+    return classes[np.argmax(votes, axis=1)]
+
+
+def fastest_algorithm(
+    estimator_class, param_grid, train_x, max_samples=2000, random_state=0
+):
+    """Benchmarks the neighbor search algorithms of a grid once
+    and keeps only the fastest.
+
+    The algorithm only changes how the neighbors are found, not
+    which, so cross validating every algorithm repeats the same
+    scores at different speeds.
+
+    Parameters
+    ----------
+    estimator_class : type
+        The class of the k nearest neighbors estimator
+    param_grid : dict
+        The hyper-parameter grid of the estimator
+    train_x : numpy.ndarray
+        The features for training
+    max_samples : int, optional
+        The number of samples the algorithms are benchmarked on
+    random_state : int, optional
+        The seed for drawing the benchmark samples
+
+    Returns
+    -------
+    dict
+        The hyper-parameter grid with a single algorithm
+    """
+
+    algorithms = list(param_grid.get("algorithm", []))
+    if len(algorithms) < 2:
+        return param_grid
+
+    n_samples = len(train_x)
+    sample = np.arange(n_samples)
+    if n_samples > max_samples:
+        rng = check_random_state(random_state)
+        sample = np.sort(rng.choice(n_samples, max_samples, replace=False))
+    sample_x = _safe_indexing(train_x, sample)
+    params = {
+        param: values[0]
+        for param, values in param_grid.items()
+        if param not in ["algorithm", "weights"] and len(values)
+    }
+    params["n_neighbors"] = min(
+        int(max(param_grid.get("n_neighbors", [5]))), len(sample)
+    )
+
+    durations = {}
+    for algorithm in algorithms:
+        estimator = estimator_class(**dict(params, algorithm=algorithm))
+        start = time.time()
+        try:
+            estimator.fit(sample_x, np.zeros(len(sample)))
+            estimator.kneighbors(sample_x)
+        except Exception:
+            continue
+        durations[algorithm] = time.time() - start
+
+    if not durations:
+        return param_grid
+    return dict(param_grid, algorithm=[min(durations, key=durations.get)])
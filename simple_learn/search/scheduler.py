@@ -0,0 +1,891 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import heapq
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+from joblib import cpu_count, effective_n_jobs
+from joblib.externals.loky.process_executor import (
+    BrokenProcessPool,
+    ProcessPoolExecutor,
+)
+from sklearn import set_config
+from sklearn.model_selection import check_cv
+from sklearn.utils import _safe_indexing
+
+from simple_learn.search.events import SearchEvents
+from simple_learn.search.memory import (
+    available_memory,
+    current_rss,
+    default_working_memory,
+    estimate_footprint,
+    feature_width,
+    peak_rss,
+    plan_rows,
+    reset_peak,
+)
+from simple_learn.search.neighbors import (
+    graph_predictions,
+    group_candidates,
+    shares_graph,
+)
+from simple_learn.search.scoring import score_estimator, score_predictions
+from simple_learn.search.shared_data import (
+    SharedDataset,
+    attach,
+    fit_rows,
+    prepare_data,
+    subsample,
+)
+
+# Relative duration of a single fit for each model algorithm, tree
+# ensembles are scaled by their number of estimators
+algorithm_costs = {
+    "AdaBoostRegressor": 5.0,
+    "BernoulliNB": 0.2,
+    "ComplementNB": 0.2,
+    "DecisionTreeClassifier": 1.0,
+    "DecisionTreeRegressor": 1.0,
+    "ExtraTreeClassifier": 0.5,
+    "GradientBoostingClassifier": 10.0,
+    "GradientBoostingRegressor": 10.0,
+    "HistGradientBoostingClassifier": 10.0,
+    "HistGradientBoostingRegressor": 10.0,
+    "KNeighborsClassifier": 3.0,
+    "KNeighborsRegressor": 3.0,
+    "Perceptron": 0.3,
+    "RandomForestClassifier": 20.0,
+    "RandomForestRegressor": 20.0,
+    "RidgeClassifier": 0.3,
+    "SGDClassifier": 1.0,
+    "SGDRegressor": 2.0,
+}
+
+# Dataset of the current worker process, set once by the executor initializer
+_worker_data = {}
+
+
+def estimate_cost(name, params):
+    """Estimates the relative duration of fitting a single
+    candidate of a model algorithm
+
+    Parameters
+    ----------
+    name : str
+        The name of the model algorithm
+    params : dict
+        The hyper-parameters of the candidate
+
+    Returns
+    -------
+    float
+        The relative duration of the fit
+    """
+
+    cost = algorithm_costs.get(name, 1.0)
+    if "n_estimators" in params:
+        cost *= params["n_estimators"] / 100
+    return cost
+
+
+def _init_worker(handles, assume_finite, working_memory=None):
+    _worker_data["x"], _worker_data["y"] = attach(handles)
+    # The dataset was checked for NaN and infinity once before publishing
+    if assume_finite:
+        set_config(assume_finite=True)
+    # Blocks of pairwise distances are kept within the memory budget
+    if working_memory is not None:
+        set_config(working_memory=working_memory)
+    _worker_data["baseline"] = current_rss()
+
+
+def _measured(function, *args):
+    # Runs a task and returns its output with the worker and the memory it used
+    reset_peak()
+    output = function(*args)
+    return output, os.getpid(), _worker_data["baseline"], peak_rss()
+
+
+def _error_scores(scoring, error_score):
+    if isinstance(scoring, dict):
+        return {name: error_score for name in scoring}
+    return error_score
+
+
+def _fit_and_score(
+    estimator_class, params, train, test, scoring, error_score, rows=None, classes=None
+):
+    train_x, train_y = _worker_data["x"], _worker_data["y"]
+    estimator = estimator_class(**params)
+
+    start = time.time()
+    try:
+        fit_rows(estimator, train_x, train_y, train, rows, classes)
+    except Exception:
+        if error_score == "raise":
+            raise
+        return _error_scores(scoring, error_score), time.time() - start, 0.0
+    fit_time = time.time() - start
+
+    start = time.time()
+    score = score_estimator(
+        estimator, scoring, _safe_indexing(train_x, test), _safe_indexing(train_y, test)
+    )
+    return score, fit_time, time.time() - start
+
+
+def _score_neighbor_graph(
+    estimator_class, candidates, train, test, scoring, error_score
+):
+    train_x, train_y = _worker_data["x"], _worker_data["y"]
+    fold_y = _safe_indexing(train_y, train)
+    test_x, test_y = _safe_indexing(train_x, test), _safe_indexing(train_y, test)
+    params = {
+        param: value
+        for param, value in candidates[0].items()
+        if param not in ["n_neighbors", "weights"]
+    }
+    n_neighbors = [candidate.get("n_neighbors", 5) for candidate in candidates]
+    graph_neighbors = min(max(n_neighbors), len(train))
+    estimator = estimator_class(n_neighbors=graph_neighbors, **params)
+
+    start = time.time()
+    try:
+        estimator.fit(_safe_indexing(train_x, train), fold_y)
+        distances, indices = estimator.kneighbors(test_x)
+    except Exception:
+        if error_score == "raise":
+            raise
+        share = (time.time() - start) / len(candidates)
+        return [(_error_scores(scoring, error_score), share, 0.0)] * len(candidates)
+    share = (time.time() - start) / len(candidates)
+
+    outputs = []
+    for candidate, k in zip(candidates, n_neighbors):
+        if k > graph_neighbors:
+            if error_score == "raise":
+                raise ValueError(
+                    f"Expected n_neighbors <= n_samples_fit, but n_neighbors = {k}, "
+                    f"n_samples_fit = {len(train)}"
+                )
+            outputs.append((_error_scores(scoring, error_score), share, 0.0))
+            continue
+        start = time.time()
+        predictions = graph_predictions(
+            distances,
+            indices,
+            fold_y,
+            k,
+            candidate.get("weights", "uniform"),
+            classifier=hasattr(estimator, "classes_"),
+        )
+        score = score_predictions(predictions, scoring, test_x, test_y)
+        outputs.append((score, share, time.time() - start))
+    return outputs
+
+
+def _refit(estimator_class, params, rows=None, classes=None):
+    train_x, train_y = _worker_data["x"], _worker_data["y"]
+    estimator = estimator_class(**params)
+    start = time.time()
+    if rows is None or rows >= len(train_y):
+        estimator.fit(train_x, train_y)
+    else:
+        fit_rows(estimator, train_x, train_y, np.arange(len(train_y)), rows, classes)
+    return estimator, time.time() - start
+
+
+class SearchScheduler:
+    """
+    A class used to run the cross validation of many model
+    algorithms from a single work queue
+
+    Every (algorithm, candidate, fold) fit is a separate task and
+    tasks are started longest first, so small grids fill the gaps
+    left by large ones instead of waiting on a barrier after each
+    algorithm. The candidates of a k nearest neighbors algorithm
+    that only differ in n_neighbors and weights share one task per
+    fold, which scores all of them from a single neighbor graph.
+
+    The dataset is validated and converted once, then published
+    as a memory mapped file that every worker attaches to without
+    copying it.
+
+    The peak resident memory of every task is measured in its
+    worker. With a memory budget a task only starts once the
+    projected memory of the tasks in flight leaves room for it,
+    which cuts the parallelism for large candidates. Candidates
+    projected to exceed the budget on their own are skipped. The
+    projection is estimated from the dataset and the candidate,
+    then scaled by the peaks measured for the model algorithm.
+
+    The number of samples a single fit holds in memory is planned
+    for every model algorithm from the size of the dataset and the
+    memory of a worker, the memory budget or an even share of the
+    available memory. When a fold doesn't fit, model algorithms
+    supporting partial_fit are trained on every sample of the fold
+    streamed in batches that fit, every other model algorithm is
+    fit on the largest random subsample of the fold that fits.
+
+    With an algorithm timeout every model algorithm gets a limited
+    amount of wall-clock time. Its clock starts when its first task
+    is dispatched, however many of its tasks run at once, and stops
+    while the workers restart. The workers of a model algorithm
+    that overruns its time are killed and the model algorithm fails
+    with a TimeoutError. A worker that crashes, on a segmentation
+    fault or when the operating system kills it for its memory,
+    takes down the tasks in flight with it. Those tasks then run
+    again one at a time, so the crash is pinned on a single task
+    whose model algorithm fails while the others carry on.
+
+    ...
+
+    Attributes
+    ----------
+    train_x : numpy.ndarray
+        the features shared with every worker, memory mapped while
+        the scheduler is open
+    train_y : numpy.ndarray
+        the labels shared with every worker, memory mapped while
+        the scheduler is open
+    splits : list
+        the (train, test) indices of every fold
+    scoring : str or dict
+        the sklearn scoring metric, or the sklearn scoring metric
+        of every metric name
+    error_score : "raise" or float
+        the score assigned to candidates that fail to fit
+    n_workers : int
+        the number of worker processes
+    time_budget : float
+        the wall-clock seconds available for cross validation,
+        None for no limit
+    cache : simple_learn.search.ScoreCache
+        the cache of previously evaluated candidates, None to
+        evaluate every candidate
+    memory_budget : int
+        the bytes available to all worker processes, None for no
+        limit
+    worker_peaks : dict
+        the peak resident bytes of every worker process
+    algorithm_timeout : float
+        the wall-clock seconds every model algorithm may run for
+        from the dispatch of its first task, None for no limit
+
+    Methods
+    -------
+    run(results, events=None, propose=None, refit=True)
+        Cross validates every candidate and refits the best
+        candidate of each model algorithm
+    """
+
+    def __init__(
+        self,
+        train_x,
+        train_y,
+        folds,
+        scoring,
+        classifier,
+        error_score=np.nan,
+        n_jobs=-1,
+        time_budget=None,
+        cache=None,
+        memory_budget=None,
+        algorithm_timeout=None,
+    ):
+        self.train_x, self.train_y, self._finite = prepare_data(train_x, train_y)
+        cv = check_cv(folds, self.train_y, classifier=classifier)
+        self.splits = list(cv.split(self.train_x, self.train_y))
+        self.scoring = scoring
+        self.error_score = error_score
+        self.n_workers = effective_n_jobs(n_jobs)
+        self.time_budget = time_budget
+        self.cache = cache
+        self._fingerprint = None
+        if cache is not None:
+            self._fingerprint = cache.fingerprint(
+                self.train_x, self.train_y, self.splits, scoring, error_score
+            )
+        self.memory_budget = memory_budget
+        self.worker_peaks = {}
+        self._n_values = 1
+        if classifier:
+            self._n_values = len(np.unique(self.train_y)) * max(
+                1, np.shape(self.train_y)[1] if np.ndim(self.train_y) > 1 else 1
+            )
+        self._n_features = feature_width(self.train_x)
+        self._classes = None
+        if classifier and np.ndim(self.train_y) == 1:
+            self._classes = np.unique(self.train_y)
+        # Bytes a worker holds, a single fit can use the whole budget
+        # while the available memory is shared by every worker
+        self._memory = memory_budget
+        if memory_budget is None:
+            available = available_memory()
+            if available is not None:
+                self._memory = available // self.n_workers
+        self._working_memory = default_working_memory
+        if memory_budget is not None:
+            # A quarter of every worker's share goes to pairwise distances
+            self._working_memory = max(16 * 2**20, memory_budget // self.n_workers // 4)
+        # Workers import the same libraries, the current process is
+        # the baseline until a worker reports its own
+        self._baseline = current_rss() or 0
+        self._scales = {}
+        self.algorithm_timeout = algorithm_timeout
+        self._dataset = None
+        self._executor = None
+
+    def __enter__(self):
+        self._dataset = SharedDataset(self.train_x, self.train_y)
+        self.train_x, self.train_y = self._dataset.attach()
+        self._executor = self._create_executor()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._executor.shutdown(wait=True, kill_workers=exc_type is not None)
+        self._executor = None
+        self._dataset.close()
+        self._dataset = None
+
+    def _create_executor(self):
+        # Keep native thread pools from oversubscribing the cores
+        threads = str(max(1, cpu_count() // self.n_workers))
+        executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(
+                self._dataset.handles,
+                self._finite,
+                None if self.memory_budget is None else self._working_memory // 2**20,
+            ),
+            env={
+                "OMP_NUM_THREADS": threads,
+                "OPENBLAS_NUM_THREADS": threads,
+                "MKL_NUM_THREADS": threads,
+            },
+        )
+        if self.algorithm_timeout is not None:
+            # Workers start before the clock of any model algorithm does
+            wait([executor.submit(os.getpid) for _ in range(self.n_workers)])
+        return executor
+
+    def _restart(self):
+        # Kills every worker, the tasks in flight are lost
+        self._executor.shutdown(wait=False, kill_workers=True)
+        self._executor = self._create_executor()
+
+    def _submit(self, task, rows):
+        kind, result, candidate, fold = task
+        if kind == "refit":
+            return self._executor.submit(
+                _measured,
+                _refit,
+                result.estimator_class,
+                result.candidates[candidate],
+                rows,
+                self._classes,
+            )
+
+        train, test = self.splits[fold]
+        # Only as many test samples as training samples are held at once
+        test = subsample(test, rows, fold)
+        if kind == "graph":
+            return self._executor.submit(
+                _measured,
+                _score_neighbor_graph,
+                result.estimator_class,
+                [result.candidates[index] for index in candidate],
+                subsample(train, rows, fold),
+                test,
+                self.scoring,
+                self.error_score,
+            )
+
+        params = result.candidates[candidate]
+        return self._executor.submit(
+            _measured,
+            _fit_and_score,
+            result.estimator_class,
+            params,
+            train,
+            test,
+            self.scoring,
+            self.error_score,
+            rows,
+            self._classes,
+        )
+
+    def _n_samples(self, task):
+        kind, result, candidate, fold = task
+        return len(self.train_y) if kind == "refit" else len(self.splits[fold][0])
+
+    def _rows(self, task):
+        # Samples a single fit of a task can hold in memory at once
+        kind, result, candidate, fold = task
+        n_samples = self._n_samples(task)
+        if self._memory is None:
+            return n_samples
+        first = candidate[0] if kind == "graph" else candidate
+        scale = self._scales.get(result.name) or 1.0
+        rows = plan_rows(
+            result.name,
+            result.candidates[first],
+            n_samples,
+            self._n_features,
+            (self._memory - self._baseline) / scale,
+            self._n_values,
+            self._working_memory,
+        )
+        # The selected candidate is refit however little memory is left
+        return max(1, rows) if kind == "refit" else rows
+
+    def _footprint(self, task, rows=None):
+        kind, result, candidate, fold = task
+        first = candidate[0] if kind == "graph" else candidate
+        return estimate_footprint(
+            result.name,
+            result.candidates[first],
+            self._n_samples(task) if rows is None else rows,
+            self._n_features,
+            self._n_values,
+            self._working_memory,
+        )
+
+    def _projected(self, task, rows=None):
+        # Projected peak resident bytes of the worker running a task
+        scale = self._scales.get(task[1].name, 1.0)
+        return self._baseline + self._footprint(task, rows) * scale
+
+    def _measure(self, task, rows, worker, baseline, peak):
+        if peak is None:
+            return
+        result = task[1]
+        self.worker_peaks[worker] = max(self.worker_peaks.get(worker, 0), peak)
+        result.peak_memory = max(result.peak_memory or 0, peak)
+        if baseline is not None:
+            self._baseline = baseline
+            scale = max(peak - baseline, 0) / max(self._footprint(task, rows), 1)
+            self._scales[result.name] = max(self._scales.get(result.name, 0.0), scale)
+
+    def run(self, results, events=None, propose=None, refit=True):
+        """Cross validates every candidate of the given model
+        algorithms and refits the best candidate of each.
+
+        With a time budget the cheapest tasks are started first,
+        so every model algorithm gets evaluated before the largest
+        grids use up the budget. The estimated refit duration of
+        the best candidates evaluated so far is kept in reserve, the
+        refit of every model algorithm or, without refit, of the
+        best model algorithm selected by the caller. Once only the
+        reserve is left no more candidates are started, the fits in
+        flight are abandoned and every unfinished model algorithm
+        keeps the best of its fully evaluated candidates, which are
+        then refit within the reserve.
+
+        A model algorithm that overruns the algorithm timeout or
+        crashes its worker fails with the reason as its error, the
+        tasks of the other model algorithms lost with the killed
+        workers are started again.
+
+        Parameters
+        ----------
+        results : list
+            The ModelSearchResult of every model algorithm, filled
+            in place
+        events : simple_learn.search.SearchEvents, optional
+            The sinks of the start and end of every model algorithm
+            and of every evaluated candidate and fold
+        propose : callable, optional
+            Called with the ModelSearchResult of a model algorithm
+            whenever all of its candidates are evaluated, returns the
+            next candidates to evaluate or an empty list once the
+            search of the model algorithm is complete
+        refit : bool, optional
+            Whether to refit the best candidate of each model
+            algorithm, otherwise the search ends once the best
+            candidate is selected
+        """
+
+        queue = []
+        counter = itertools.count()
+        pending = {}
+        folds_left = {}
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.time() + self.time_budget
+        order = -1 if self.time_budget is None else 1
+        events = SearchEvents() if events is None else events
+        started = set()
+        first_dispatch = {}
+        reserved = {}
+        incumbents = {}
+        uncached = set()
+        memory_errors = {}
+
+        def evaluated(result, candidate):
+            # Tracks the refit duration of the best fully evaluated candidate
+            score = np.mean(result.test_scores[candidate])
+            best = incumbents.get(result.name)
+            if not np.isnan(score) and (best is None or score > best[0]):
+                incumbents[result.name] = (score, result.refit_estimate(candidate))
+
+        def reserve():
+            # Seconds of the time budget kept for refitting the best candidates
+            if refit:
+                estimates = [
+                    estimate
+                    for name, (_, estimate) in incumbents.items()
+                    if pending[name] is not None
+                ]
+                if not estimates:
+                    return 0.0
+                return max(max(estimates), sum(estimates) / self.n_workers)
+            if not incumbents:
+                return 0.0
+            return max(incumbents.values())[1]
+
+        def push(task):
+            kind, result, candidate, fold = task
+            first = candidate[0] if kind == "graph" else candidate
+            cost = estimate_cost(result.name, result.candidates[first])
+            heapq.heappush(queue, (order * cost, next(counter), task))
+
+        def start(result):
+            if result.name not in started:
+                started.add(result.name)
+                events.algorithm_start(result.name, len(result.candidates))
+
+        def end(result, error=None):
+            result.error = error
+            if error is None and result.name in first_dispatch:
+                # Wall-clock time from the first dispatch to the last result
+                result.search_duration = time.time() - first_dispatch[result.name]
+            pending[result.name] = None
+            start(result)
+            events.algorithm_end(result)
+
+        def schedule(result, first):
+            pending[result.name] = 0
+            missing = []
+            for candidate in range(first, len(result.candidates)):
+                if self.cache is not None:
+                    entry = self.cache.get(
+                        self._fingerprint, result.name, result.candidates[candidate]
+                    )
+                    if entry is not None:
+                        scores = entry["scores"]
+                        if isinstance(self.scoring, dict):
+                            scores = [
+                                dict(zip(entry["scores"], fold_scores))
+                                for fold_scores in zip(*entry["scores"].values())
+                            ]
+                        start(result)
+                        for fold, output in enumerate(
+                            zip(scores, entry["fit_times"], entry["score_times"])
+                        ):
+                            result.record(candidate, fold, *output, cached=True)
+                            events.candidate_end(result, candidate, fold, cached=True)
+                        evaluated(result, candidate)
+                        continue
+                missing.append(candidate)
+                folds_left[(result.name, candidate)] = len(self.splits)
+
+            if shares_graph(result.estimator_class) and np.ndim(self.train_y) == 1:
+                groups = group_candidates(
+                    [result.candidates[candidate] for candidate in missing]
+                )
+                for group in groups:
+                    task = tuple(missing[index] for index in group)
+                    for fold in range(len(self.splits)):
+                        push(("graph", result, task, fold))
+                    pending[result.name] += len(task) * len(self.splits)
+            else:
+                for candidate in missing:
+                    for fold in range(len(self.splits)):
+                        push(("fold", result, candidate, fold))
+                    pending[result.name] += len(self.splits)
+
+            if pending[result.name] == 0:
+                advance(result)
+
+        def advance(result):
+            if propose is not None and not result.truncated:
+                candidates = propose(result)
+                if candidates:
+                    first = len(result.candidates)
+                    result.add_candidates(candidates)
+                    schedule(result, first)
+                    return
+
+            try:
+                result.finalize()
+            except ValueError as error:
+                error = memory_errors.get(result.name, error)
+                if result.truncated:
+                    error = TimeoutError(
+                        f"time budget of {self.time_budget}s ran out "
+                        "before any candidate was evaluated"
+                    )
+                end(result, error)
+                return
+            if refit:
+                push(("refit", result, result.best_index_, None))
+            else:
+                end(result)
+
+        def skip(task, projected):
+            kind, result, candidate, fold = task
+            limit = "the memory budget"
+            if self.memory_budget is None:
+                limit = "the memory available to a worker"
+            error = MemoryError(
+                f"{result.name} needs an estimated {projected / 2**20:.0f} MiB, "
+                f"more than {limit} of {self._memory / 2**20:.0f} MiB"
+            )
+            if self.error_score == "raise":
+                end(result, error)
+                return
+            memory_errors[result.name] = error
+            start(result)
+            indices = candidate if kind == "graph" else (candidate,)
+            for index in indices:
+                scores = _error_scores(self.scoring, self.error_score)
+                result.record(index, fold, scores, 0.0, 0.0)
+                events.candidate_end(result, index, fold)
+                uncached.add((result.name, index))
+            pending[result.name] -= len(indices)
+            if pending[result.name] == 0:
+                advance(result)
+
+        for result in results:
+            pending[result.name] = 0
+            if result.candidates:
+                schedule(result, 0)
+            else:
+                advance(result)
+
+        in_flight = {}
+        planned = {}
+        dispatched = {}
+        suspects = []
+        alone = None
+
+        def time_left(now):
+            # Seconds left to the dispatched model algorithms still running
+            return {
+                name: self.algorithm_timeout - (now - began)
+                for name, (_, began) in dispatched.items()
+                if pending[name] is not None
+            }
+
+        def restart():
+            # Respawning the workers isn't charged to any model algorithm
+            began = time.time()
+            self._restart()
+            paused = time.time() - began
+            for name, (result, first) in dispatched.items():
+                dispatched[name] = (result, first + paused)
+
+        def dispatch(task, rows, projected=0):
+            kind, result, candidate, fold = task
+            start(result)
+            dispatched.setdefault(result.name, (result, time.time()))
+            first_dispatch.setdefault(result.name, time.time())
+            if rows < self._n_samples(task):
+                result.sample_rows = min(result.sample_rows or rows, rows)
+                if kind != "refit":
+                    # Scores of streamed or subsampled folds aren't cached
+                    indices = candidate if kind == "graph" else (candidate,)
+                    uncached.update((result.name, index) for index in indices)
+            future = self._submit(task, rows)
+            in_flight[future] = task
+            reserved[future] = projected
+            planned[future] = rows
+            return future
+
+        while queue or in_flight or suspects:
+            if deadline is not None and time.time() >= deadline - reserve():
+                deadline = None
+                refits = [task for task in in_flight.values() if task[0] == "refit"]
+                refits += [task for _, _, task in queue if task[0] == "refit"]
+                refits += [task for task in suspects if task[0] == "refit"]
+                restart()
+                in_flight = {}
+                reserved = {}
+                planned = {}
+                queue = []
+                suspects = []
+
+                for task in refits:
+                    push(task)
+                for result in results:
+                    if pending[result.name] is None or result.best_index_ is not None:
+                        continue
+                    result.truncated = True
+                    advance(result)
+                continue
+
+            if self.algorithm_timeout is not None:
+                expired = {
+                    name for name, left in time_left(time.time()).items() if left <= 0
+                }
+                if expired:
+                    if any(task[1].name in expired for task in in_flight.values()):
+                        lost = [
+                            task
+                            for task in in_flight.values()
+                            if task[1].name not in expired
+                        ]
+                        restart()
+                        in_flight = {}
+                        reserved = {}
+                        planned = {}
+                        alone = None
+                        for task in lost:
+                            push(task)
+                    for name in expired:
+                        end(
+                            dispatched[name][0],
+                            TimeoutError(
+                                f"{name} ran longer than its timeout of "
+                                f"{self.algorithm_timeout}s"
+                            ),
+                        )
+                    continue
+
+            # Tasks lost with a crashed worker run alone to find the culprit
+            while suspects and not in_flight:
+                task = suspects.pop(0)
+                if pending[task[1].name] is None:
+                    continue
+                alone = dispatch(task, self._rows(task))
+
+            while queue and not suspects and len(in_flight) < self.n_workers:
+                task = queue[0][2]
+                if pending[task[1].name] is None:
+                    heapq.heappop(queue)
+                    continue
+                rows = self._rows(task)
+                if rows == 0:
+                    heapq.heappop(queue)
+                    skip(task, self._projected(task))
+                    continue
+                projected = 0
+                if self.memory_budget is not None:
+                    projected = self._projected(task, rows)
+                    if projected > self.memory_budget and task[0] != "refit":
+                        heapq.heappop(queue)
+                        skip(task, projected)
+                        continue
+                    used = sum(reserved.values())
+                    if in_flight and used + projected > self.memory_budget:
+                        break
+                heapq.heappop(queue)
+                dispatch(task, rows, projected)
+
+            if not in_flight:
+                continue
+
+            now = time.time()
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - reserve() - now)
+            left = time_left(now) if self.algorithm_timeout is not None else {}
+            if left:
+                expiry = max(0.0, min(left.values()))
+                timeout = expiry if timeout is None else min(timeout, expiry)
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                task = in_flight.pop(future)
+                reserved.pop(future)
+                rows = planned.pop(future)
+                kind, result, candidate, fold = task
+
+                error = None
+                try:
+                    output, worker, baseline, peak = future.result()
+                except BrokenProcessPool as crash:
+                    broken = True
+                    error = crash
+                    if future is not alone:
+                        # Any task in flight may have crashed the worker
+                        suspects.append(task)
+                        continue
+                except Exception as failure:
+                    error = failure
+                if pending[result.name] is None:
+                    continue
+                if error is not None:
+                    end(result, error)
+                    continue
+                self._measure(task, rows, worker, baseline, peak)
+
+                if kind == "refit":
+                    result.best_estimator_, result.refit_time_ = output
+                    end(result)
+                    continue
+
+                outputs = [(candidate, output)]
+                if kind == "graph":
+                    outputs = list(zip(candidate, output))
+                for index, scores in outputs:
+                    result.record(index, fold, *scores)
+                    events.candidate_end(
+                        result, index, fold, worker=worker, peak_memory=peak
+                    )
+                    folds_left[(result.name, index)] -= 1
+                    if folds_left[(result.name, index)] == 0:
+                        evaluated(result, index)
+                    if (
+                        self.cache is not None
+                        and folds_left[(result.name, index)] == 0
+                        and (result.name, index) not in uncached
+                    ):
+                        self.cache.put(
+                            self._fingerprint,
+                            result.name,
+                            result.candidates[index],
+                            result.fold_scores(index),
+                            result.fit_times[index],
+                            result.score_times[index],
+                        )
+
+                pending[result.name] -= len(outputs)
+                if pending[result.name] == 0:
+                    advance(result)
+
+            if broken:
+                # A crashed worker breaks the whole pool
+                suspects += list(in_flight.values())
+                restart()
+                in_flight = {}
+                reserved = {}
+                planned = {}
+            if alone not in in_flight:
+                alone = None
+
+        if self.cache is not None:
+            self.cache.evict()
@@ -0,0 +1,211 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+import sklearn
+
+
+def _hash_array(digest, array):
+    array = np.asarray(array)
+    digest.update(str((array.shape, array.dtype.str)).encode())
+    if array.dtype.hasobject:
+        digest.update(pickle.dumps(array.tolist()))
+    else:
+        digest.update(np.ascontiguousarray(array).view(np.uint8).data)
+
+
+class ScoreCache:
+    """
+    A class used to persist the cross validation scores of
+    hyper-parameter candidates between searches
+
+    Every entry is keyed by a fingerprint of the dataset, the
+    folds, the scoring and the sklearn version together with the
+    model algorithm and its hyper-parameters. Entries hold the
+    score, fit time and score time of every fold, the least
+    recently used entries are evicted once the cache outgrows
+    its size limit.
+
+    ...
+
+    Attributes
+    ----------
+    directory : str
+        the directory holding the cache entries
+    max_bytes : int
+        the size limit of the cache directory
+
+    Methods
+    -------
+    fingerprint(train_x, train_y, splits, scoring, error_score)
+        Creates the key of a dataset and fold configuration
+    get(fingerprint, name, params)
+        Reads the fold results of a candidate
+    put(fingerprint, name, params, scores, fit_times, score_times)
+        Writes the fold results of a candidate
+    evict()
+        Removes the least recently used entries above the size limit
+    """
+
+    def __init__(self, directory=None, max_bytes=64 * 1024**2):
+        if directory is None:
+            directory = os.environ.get(
+                "SIMPLE_LEARN_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "simple_learn"),
+            )
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def fingerprint(self, train_x, train_y, splits, scoring, error_score):
+        """Creates the key of a dataset and fold configuration
+
+        Parameters
+        ----------
+        train_x : numpy.ndarray
+            The features for training
+        train_y : numpy.ndarray
+            The corresponding label for feature array
+        splits : list
+            The (train, test) indices of every fold
+        scoring : str or dict
+            The sklearn scoring metric, or the sklearn scoring metric
+            of every metric name
+        error_score : "raise" or float
+            The score assigned to candidates that fail to fit
+
+        Returns
+        -------
+        str
+            The fingerprint of the dataset and fold configuration
+        """
+
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((sklearn.__version__, scoring, error_score)).encode())
+        _hash_array(digest, train_x)
+        _hash_array(digest, train_y)
+        for train, test in splits:
+            _hash_array(digest, train)
+            _hash_array(digest, test)
+        return digest.hexdigest()
+
+    def _path(self, fingerprint, name, params):
+        key = repr((fingerprint, name, sorted(params.items())))
+        digest = hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".json")
+
+    def get(self, fingerprint, name, params):
+        """Reads the fold results of a candidate
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the dataset and fold configuration
+        name : str
+            The name of the model algorithm
+        params : dict
+            The hyper-parameters of the candidate
+
+        Returns
+        -------
+        dict
+            The scores, fit_times and score_times of every fold,
+            None if the candidate is not cached
+        """
+
+        path = self._path(fingerprint, name, params)
+        try:
+            with open(path, "r") as fp:
+                entry = json.load(fp)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, fingerprint, name, params, scores, fit_times, score_times):
+        """Writes the fold results of a candidate
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the dataset and fold configuration
+        name : str
+            The name of the model algorithm
+        params : dict
+            The hyper-parameters of the candidate
+        scores : list or dict
+            The score of every fold, or the score of every fold for
+            each metric name
+        fit_times : list
+            The fit duration of every fold
+        score_times : list
+            The scoring duration of every fold
+        """
+
+        path = self._path(fingerprint, name, params)
+        if isinstance(scores, dict):
+            scores = {
+                metric: [float(score) for score in metric_scores]
+                for metric, metric_scores in scores.items()
+            }
+        else:
+            scores = [float(score) for score in scores]
+        entry = {
+            "scores": scores,
+            "fit_times": [float(fit_time) for fit_time in fit_times],
+            "score_times": [float(score_time) for score_time in score_times],
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as fp:
+                json.dump(entry, fp)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Removes the least recently used entries until the
+        cache fits in its size limit
+        """
+
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for file in files:
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
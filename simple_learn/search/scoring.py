@@ -0,0 +1,127 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from sklearn.base import BaseEstimator
+from sklearn.metrics import check_scoring, get_scorer
+
+# Cross validated metrics of the classifiers for each scoring option
+classifier_scoring = {
+    "auto": "accuracy",
+    "jaccard": "jaccard_macro",
+    "f1": "f1_macro",
+}
+
+# Cross validated metrics of the regressors for each scoring option
+regressor_scoring = {
+    "auto": "neg_root_mean_squared_error",
+    "mae": "neg_mean_absolute_error",
+    "mse": "neg_mean_squared_error",
+    "r2": "r2",
+}
+
+
+class PrecomputedPredictor(BaseEstimator):
+    """
+    A class used to score predictions that were computed
+    without a fitted estimator
+
+    ...
+
+    Attributes
+    ----------
+    predictions : numpy.ndarray
+        the predictions returned for the scored samples
+
+    Methods
+    -------
+    predict(pred_x)
+        Returns the precomputed predictions
+    """
+
+    def __init__(self, predictions=None):
+        self.predictions = predictions
+
+    def predict(self, pred_x):
+        """Returns the precomputed predictions.
+
+        Parameters
+        ----------
+        pred_x : numpy.ndarray
+            The feature array the predictions were computed for
+        """
+        return self.predictions
+
+
+def score_estimator(estimator, scoring, test_x, test_y):
+    """Scores a fitted estimator on every metric with a single
+    prediction pass.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The fitted estimator
+    scoring : str or dict
+        The sklearn scoring metric, or the sklearn scoring metric
+        of every metric name, dict metrics are computed from the
+        predicted labels
+    test_x : numpy.ndarray
+        The features of the test samples
+    test_y : numpy.ndarray
+        The labels of the test samples
+
+    Returns
+    -------
+    float or dict
+        The score, or the score of every metric name
+    """
+
+    if not isinstance(scoring, dict):
+        return check_scoring(estimator, scoring)(estimator, test_x, test_y)
+    return score_predictions(estimator.predict(test_x), scoring, test_x, test_y)
+
+
+def score_predictions(predictions, scoring, test_x, test_y):
+    """Scores precomputed predictions on every metric.
+
+    Parameters
+    ----------
+    predictions : numpy.ndarray
+        The predicted labels of the test samples
+    scoring : str or dict
+        The sklearn scoring metric, or the sklearn scoring metric
+        of every metric name
+    test_x : numpy.ndarray
+        The features of the test samples
+    test_y : numpy.ndarray
+        The labels of the test samples
+
+    Returns
+    -------
+    float or dict
+        The score, or the score of every metric name
+    """
+
+    predictor = PrecomputedPredictor(predictions)
+    if not isinstance(scoring, dict):
+        return get_scorer(scoring)(predictor, test_x, test_y)
+    return {
+        name: get_scorer(metric)(predictor, test_x, test_y)
+        for name, metric in scoring.items()
+    }
@@ -0,0 +1,413 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+
+import numpy as np
+from scipy.stats import rankdata
+from sklearn.base import is_classifier
+
+from simple_learn.search.memory import (
+    available_memory,
+    feature_width,
+    plan_rows,
+)
+from simple_learn.search.shared_data import fit_rows
+
+
+class ModelSearchResult:
+    """
+    A class used to keep track of the hyper-parameter search
+    of a single model algorithm
+
+    ...
+
+    Attributes
+    ----------
+    name : str
+        the name of the model algorithm
+    estimator_class : type
+        the sklearn estimator class being tuned
+    candidates : list
+        the hyper-parameter combinations being evaluated
+    metrics : list
+        the names of the metrics scored in the same pass, empty
+        for a single metric search
+    refit : str
+        the metric name ranking the candidates
+    test_scores : numpy.ndarray
+        the cross validation score of every candidate and fold
+    metric_scores : dict
+        the cross validation score of every candidate and fold for
+        each metric name
+    fit_times : numpy.ndarray
+        the fit duration of every candidate and fold
+    score_times : numpy.ndarray
+        the scoring duration of every candidate and fold
+    cached : numpy.ndarray
+        whether the score of every candidate and fold was read from
+        the score cache instead of being evaluated
+    cv_results_ : dict
+        the cross validation results in sklearn format
+    best_index_ : int
+        the index of the best candidate
+    best_score_ : float
+        the mean cross validation score of the best candidate
+    best_params_ : dict
+        the hyper-parameters of the best candidate
+    best_estimator_ : sklearn.base.BaseEstimator
+        the best candidate refit on the whole dataset, None until
+        a deferred refit
+    refit_time_ : float
+        the duration of the refit of the best candidate
+    search_duration : float
+        the wall-clock seconds from the first fit of the search to
+        the refit of its best candidate, a search run in a single
+        process sums its fit, score and refit durations without the
+        durations read from the score cache
+    truncated : bool
+        whether the search was cut short by the time budget
+    error : BaseException
+        the error that made the search fail, None on success
+    peak_memory : int
+        the largest peak resident bytes of a worker running one of
+        the tasks of the search, None when it wasn't measured
+    sample_rows : int
+        the fewest samples a fit of the search held in memory when
+        its samples didn't fit in the memory of a worker, None when
+        every fit held all its samples
+
+    Methods
+    -------
+    from_search_cv(name, estimator_class, search_cv, duration, ...)
+        Creates a ModelSearchResult from a fitted sklearn search
+    add_candidates(candidates)
+        Appends hyper-parameter combinations to be evaluated
+    record(candidate, fold, score, fit_time, score_time, cached=False)
+        Stores the cross validation score of a candidate and fold
+    fold_scores(candidate)
+        Returns the fold scores of a candidate
+    best_scores()
+        Returns the mean score of the best candidate for each metric
+    refit_estimate(candidate=None)
+        Estimates the duration of fitting a candidate on the whole
+        dataset
+    finalize()
+        Ranks the candidates and selects the best candidate
+    refit_best(train_x, train_y)
+        Fits the best candidate on the whole dataset
+    """
+
+    def __init__(
+        self, name, estimator_class, candidates, n_folds, metrics=None, refit=None
+    ):
+        self.name = name
+        self.estimator_class = estimator_class
+        self.candidates = candidates
+        self.metrics = list(metrics or [])
+        self.refit = refit
+        self.test_scores = np.full((len(candidates), n_folds), np.nan)
+        self.metric_scores = {
+            metric: np.full((len(candidates), n_folds), np.nan)
+            for metric in self.metrics
+        }
+        self.fit_times = np.zeros((len(candidates), n_folds))
+        self.score_times = np.zeros((len(candidates), n_folds))
+        self.cached = np.zeros((len(candidates), n_folds), dtype=bool)
+        self.cv_results_ = None
+        self.best_index_ = None
+        self.best_score_ = None
+        self.best_params_ = None
+        self.best_estimator_ = None
+        self.refit_time_ = None
+        self.search_duration = None
+        self.truncated = False
+        self.error = None
+        self.peak_memory = None
+        self.sample_rows = None
+
+    @classmethod
+    def from_search_cv(
+        cls, name, estimator_class, search_cv, duration, metrics=None, refit=None
+    ):
+        """Creates a ModelSearchResult from a fitted sklearn
+        hyper-parameter search
+
+        The search only scores the refit metric, the other metrics
+        are left unscored.
+
+        Parameters
+        ----------
+        name : str
+            The name of the model algorithm
+        estimator_class : type
+            The sklearn estimator class that was tuned
+        search_cv : sklearn.model_selection.BaseSearchCV
+            The fitted hyper-parameter search
+        duration : float
+            The duration of the hyper-parameter search
+        metrics : list, optional
+            The names of the metrics of a multi metric search
+        refit : str, optional
+            The metric name the search was scored on
+
+        Returns
+        -------
+        ModelSearchResult
+            The result of the hyper-parameter search
+        """
+
+        cv_results = search_cv.cv_results_
+        n_folds = search_cv.n_splits_
+        result = cls(
+            name,
+            estimator_class,
+            cv_results["params"],
+            n_folds,
+            metrics=metrics,
+            refit=refit,
+        )
+        for fold in range(n_folds):
+            result.test_scores[:, fold] = cv_results[f"split{fold}_test_score"]
+            if result.metrics:
+                result.metric_scores[refit][:, fold] = result.test_scores[:, fold]
+            result.fit_times[:, fold] = cv_results["mean_fit_time"]
+            result.score_times[:, fold] = cv_results["mean_score_time"]
+        result.cv_results_ = cv_results
+        result.best_index_ = search_cv.best_index_
+        result.best_score_ = search_cv.best_score_
+        result.best_params_ = search_cv.best_params_
+        result.best_estimator_ = getattr(search_cv, "best_estimator_", None)
+        result.refit_time_ = getattr(search_cv, "refit_time_", None)
+        result.search_duration = duration
+        return result
+
+    def add_candidates(self, candidates):
+        """Appends hyper-parameter combinations to be evaluated
+
+        Parameters
+        ----------
+        candidates : list
+            The hyper-parameter combinations to append
+        """
+
+        n_folds = self.test_scores.shape[1]
+        self.candidates = self.candidates + list(candidates)
+        self.test_scores = np.vstack(
+            [self.test_scores, np.full((len(candidates), n_folds), np.nan)]
+        )
+        self.fit_times = np.vstack(
+            [self.fit_times, np.zeros((len(candidates), n_folds))]
+        )
+        self.score_times = np.vstack(
+            [self.score_times, np.zeros((len(candidates), n_folds))]
+        )
+        self.cached = np.vstack(
+            [self.cached, np.zeros((len(candidates), n_folds), dtype=bool)]
+        )
+        for metric, scores in self.metric_scores.items():
+            self.metric_scores[metric] = np.vstack(
+                [scores, np.full((len(candidates), n_folds), np.nan)]
+            )
+
+    def record(self, candidate, fold, score, fit_time, score_time, cached=False):
+        """Stores the cross validation score of a single
+        candidate and fold
+
+        Parameters
+        ----------
+        candidate : int
+            The index of the candidate
+        fold : int
+            The index of the fold
+        score : float or dict
+            The cross validation score, or the cross validation score
+            of every metric name
+        fit_time : float
+            The fit duration
+        score_time : float
+            The scoring duration
+        cached : bool, optional
+            Whether the score was read from the score cache
+        """
+
+        if self.metrics:
+            for metric in self.metrics:
+                self.metric_scores[metric][candidate, fold] = score[metric]
+            score = score[self.refit]
+        self.test_scores[candidate, fold] = score
+        self.fit_times[candidate, fold] = fit_time
+        self.score_times[candidate, fold] = score_time
+        self.cached[candidate, fold] = cached
+
+    def fold_scores(self, candidate):
+        """Returns the fold scores of a candidate
+
+        Parameters
+        ----------
+        candidate : int
+            The index of the candidate
+
+        Returns
+        -------
+        numpy.ndarray or dict
+            The score of every fold, or the score of every fold for
+            each metric name
+        """
+
+        if self.metrics:
+            return {
+                metric: scores[candidate]
+                for metric, scores in self.metric_scores.items()
+            }
+        return self.test_scores[candidate]
+
+    def best_scores(self):
+        """Returns the mean cross validation score of the best
+        candidate for each metric
+
+        Returns
+        -------
+        dict
+            The mean score of every metric name, the single metric
+            of a search is named by its refit metric or "score"
+        """
+
+        if not self.metrics:
+            return {self.refit or "score": self.best_score_}
+        return {
+            metric: float(np.mean(scores[self.best_index_]))
+            for metric, scores in self.metric_scores.items()
+        }
+
+    def refit_estimate(self, candidate=None):
+        """Estimates the duration of fitting a candidate on
+        the whole dataset from the fit durations of its folds
+
+        Parameters
+        ----------
+        candidate : int, optional
+            The index of the candidate, defaults to the best
+            candidate
+
+        Returns
+        -------
+        float
+            The estimated duration of the fit
+        """
+
+        candidate = self.best_index_ if candidate is None else candidate
+        n_folds = self.fit_times.shape[1]
+        # Every fold trains on all but one of the n_folds parts
+        return float(np.mean(self.fit_times[candidate])) * n_folds / max(1, n_folds - 1)
+
+    def finalize(self):
+        """Ranks the candidates once every fold has been
+        scored and selects the best candidate
+
+        Raises
+        ------
+        ValueError
+            If every candidate failed to fit
+        """
+
+        mean_scores = self.test_scores.mean(axis=1)
+        if np.isnan(mean_scores).all():
+            raise ValueError(f"All the {self.test_scores.size} fits failed.")
+
+        ranked = np.where(np.isnan(mean_scores), -np.inf, mean_scores)
+        ranks = rankdata(-ranked, method="min").astype(np.int32)
+
+        self.cv_results_ = {
+            "params": self.candidates,
+            "mean_fit_time": self.fit_times.mean(axis=1),
+            "std_fit_time": self.fit_times.std(axis=1),
+            "mean_score_time": self.score_times.mean(axis=1),
+            "std_score_time": self.score_times.std(axis=1),
+            "mean_test_score": mean_scores,
+            "std_test_score": self.test_scores.std(axis=1),
+            "rank_test_score": ranks,
+        }
+        for fold in range(self.test_scores.shape[1]):
+            self.cv_results_[f"split{fold}_test_score"] = self.test_scores[:, fold]
+        for metric, scores in self.metric_scores.items():
+            self.cv_results_[f"mean_test_{metric}"] = scores.mean(axis=1)
+            self.cv_results_[f"std_test_{metric}"] = scores.std(axis=1)
+            for fold in range(scores.shape[1]):
+                self.cv_results_[f"split{fold}_test_{metric}"] = scores[:, fold]
+
+        self.best_index_ = int(ranks.argmin())
+        self.best_score_ = mean_scores[self.best_index_]
+        self.best_params_ = self.candidates[self.best_index_]
+        spent = ~self.cached
+        self.search_duration = float(
+            self.fit_times[spent].sum() + self.score_times[spent].sum()
+        )
+
+    def refit_best(self, train_x, train_y):
+        """Fits the best candidate on the whole dataset, used
+        when the search deferred the refit
+
+        A dataset larger than the available memory is streamed in
+        batches to a model algorithm supporting partial_fit, every
+        other model algorithm is fit on a random subsample that
+        fits.
+
+        Parameters
+        ----------
+        train_x : numpy.ndarray
+            The features for training
+        train_y : numpy.ndarray
+            The corresponding label for feature array
+
+        Returns
+        -------
+        sklearn.base.BaseEstimator
+            The fitted best candidate
+        """
+
+        estimator = self.estimator_class(**self.best_params_)
+        n_samples = len(train_y)
+        classes = None
+        if is_classifier(estimator) and np.ndim(train_y) == 1:
+            classes = np.unique(train_y)
+        rows = n_samples
+        available = available_memory()
+        if available is not None:
+            n_values = 1 if classes is None else len(classes)
+            rows = plan_rows(
+                self.name,
+                self.best_params_,
+                n_samples,
+                feature_width(train_x),
+                available,
+                n_values,
+            )
+        start = time.time()
+        if rows >= n_samples:
+            estimator.fit(train_x, train_y)
+        else:
+            rows = max(1, rows)
+            self.sample_rows = min(self.sample_rows or rows, rows)
+            fit_rows(estimator, train_x, train_y, np.arange(n_samples), rows, classes)
+        self.refit_time_ = time.time() - start
+        self.search_duration += self.refit_time_
+        self.best_estimator_ = estimator
+        return estimator
@@ -0,0 +1,310 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import mmap
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import scipy.sparse as sp
+from joblib import dump, load
+from sklearn.utils import _safe_indexing, check_random_state, indexable
+
+# Feature dtypes kept as they are, every other dtype is converted to float64
+float_dtypes = [np.dtype(np.float32), np.dtype(np.float64)]
+
+# Bytes of a memory mapped array checked for NaN and infinity at a time
+chunk_bytes = 64 * 1024**2
+
+
+def _num_samples(array):
+    return array.shape[0] if hasattr(array, "shape") else len(array)
+
+
+def _all_finite(values):
+    if not isinstance(values, np.memmap) or values.ndim == 0:
+        return bool(np.isfinite(values).all())
+    row_bytes = max(1, values[:1].nbytes)
+    step = max(1, chunk_bytes // row_bytes)
+    return all(
+        np.isfinite(values[start : start + step]).all()
+        for start in range(0, len(values), step)
+    )
+
+
+def subsample(indices, n_samples, random_state=0):
+    """Draws a random subsample of sample indices, kept in file
+    order so it is read sequentially.
+
+    Parameters
+    ----------
+    indices : numpy.ndarray
+        The indices of the samples to draw from
+    n_samples : int
+        The number of samples to draw, every index is kept when
+        there are fewer
+    random_state : int or numpy.random.RandomState, optional
+        The seed for drawing the subsample
+
+    Returns
+    -------
+    numpy.ndarray
+        The drawn indices
+    """
+
+    indices = np.asarray(indices)
+    if len(indices) <= n_samples:
+        return indices
+    rng = check_random_state(random_state)
+    return np.sort(rng.choice(indices, n_samples, replace=False))
+
+
+def fit_rows(estimator, train_x, train_y, indices, rows, classes=None):
+    """Fits an estimator on the given samples while holding at
+    most rows of them in memory at once.
+
+    Estimators supporting partial_fit are trained on every sample,
+    streamed from the data in batches of rows samples. Every other
+    estimator needs all its samples in memory and is fit on a
+    random subsample of rows samples.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The unfitted estimator
+    train_x : numpy.ndarray
+        The features for training, usually memory mapped
+    train_y : numpy.ndarray
+        The corresponding label for feature array
+    indices : numpy.ndarray
+        The indices of the training samples
+    rows : int
+        The largest number of samples held in memory, None to fit on
+        every sample at once
+    classes : numpy.ndarray, optional
+        The class labels of the whole dataset, passed to the first
+        partial_fit of a classifier
+
+    Returns
+    -------
+    sklearn.base.BaseEstimator
+        The fitted estimator
+    """
+
+    if rows is None or rows >= len(indices):
+        return estimator.fit(
+            _safe_indexing(train_x, indices), _safe_indexing(train_y, indices)
+        )
+    if hasattr(estimator, "partial_fit"):
+        kwargs = {} if classes is None else {"classes": classes}
+        for start in range(0, len(indices), rows):
+            batch = indices[start : start + rows]
+            estimator.partial_fit(
+                _safe_indexing(train_x, batch), _safe_indexing(train_y, batch), **kwargs
+            )
+        return estimator
+    sample = subsample(indices, rows)
+    return estimator.fit(
+        _safe_indexing(train_x, sample), _safe_indexing(train_y, sample)
+    )
+
+
+def open_data(train_x, train_y, max_samples=None, random_state=0):
+    """Opens the training data of a search without loading it
+    into memory.
+
+    Paths of .npy files are memory mapped. The search plans the
+    number of samples every model algorithm holds in memory from
+    the size of the data and the memory of its workers, so data
+    larger than memory needs no max_samples. Data with more than
+    max_samples samples is cut down to a random subsample for
+    every model algorithm alike.
+
+    Parameters
+    ----------
+    train_x : numpy.ndarray or str
+        The features for training, or the path of a .npy file
+    train_y : numpy.ndarray or str
+        The corresponding label for feature array, or the path of
+        a .npy file
+    max_samples : int, optional
+        The largest number of samples to search on
+    random_state : int, optional
+        The seed for drawing the subsample
+
+    Returns
+    -------
+    tuple
+        The features and labels to search on
+    """
+
+    if isinstance(train_x, (str, os.PathLike)):
+        train_x = np.load(train_x, mmap_mode="r")
+    if isinstance(train_y, (str, os.PathLike)):
+        train_y = np.load(train_y, mmap_mode="r")
+
+    n_samples = _num_samples(train_x)
+    if max_samples is not None and n_samples > max_samples:
+        sample = subsample(np.arange(n_samples), max_samples, random_state)
+        train_x = _safe_indexing(train_x, sample)
+        train_y = _safe_indexing(train_y, sample)
+    return train_x, train_y
+
+
+def prepare_data(train_x, train_y):
+    """Validates and converts the training data once for every
+    model algorithm of a search.
+
+    Dense features become a C contiguous float array and sparse
+    features a CSR matrix, so no estimator has to copy them again.
+    Memory mapped arrays are left on disk, every fit only reads
+    the samples of its fold.
+
+    Parameters
+    ----------
+    train_x : numpy.ndarray
+        The features for training
+    train_y : numpy.ndarray
+        The corresponding label for feature array
+
+    Returns
+    -------
+    tuple
+        The converted features and labels, and whether every
+        feature value is finite
+    """
+
+    train_x, train_y = indexable(train_x, train_y)
+    if sp.issparse(train_x):
+        if train_x.dtype not in float_dtypes:
+            train_x = train_x.astype(np.float64)
+        values = train_x.data
+    elif isinstance(train_x, np.memmap):
+        values = train_x
+    else:
+        dtype = getattr(train_x, "dtype", None)
+        if dtype not in float_dtypes:
+            dtype = np.float64
+        train_x = np.ascontiguousarray(train_x, dtype=dtype)
+        values = train_x
+    if not isinstance(train_y, np.memmap):
+        train_y = np.ascontiguousarray(train_y)
+    return train_x, train_y, _all_finite(values)
+
+
+def _share(array, path):
+    # Arrays mapped straight from a file are attached to that file
+    if isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap):
+        order = "F" if not array.flags["C_CONTIGUOUS"] else "C"
+        return (
+            "memmap",
+            array.filename,
+            array.dtype.str,
+            array.shape,
+            array.offset,
+            order,
+        )
+    dump(array, path)
+    return ("joblib", path)
+
+
+def _attach(handle):
+    if handle[0] == "memmap":
+        _, filename, dtype, shape, offset, order = handle
+        return np.memmap(
+            filename, dtype=dtype, mode="r", offset=offset, shape=shape, order=order
+        )
+    return load(handle[1], mmap_mode="r")
+
+
+def attach(handles):
+    """Opens a published dataset without copying it into memory.
+
+    Parameters
+    ----------
+    handles : tuple
+        The handles of the published features and labels
+
+    Returns
+    -------
+    tuple
+        The read-only memory mapped features and labels
+    """
+
+    return tuple(_attach(handle) for handle in handles)
+
+
+class SharedDataset:
+    """
+    A class used to publish the training data once as memory
+    mapped files that every worker process attaches to
+
+    Workers only receive the handles of the files, the operating
+    system shares their pages between all of them. Arrays that are
+    already memory mapped from a file are shared without writing
+    them again.
+
+    ...
+
+    Attributes
+    ----------
+    directory : str
+        the temporary directory holding the published arrays
+    handles : tuple
+        the handles of the published features and labels
+
+    Methods
+    -------
+    attach()
+        Opens the published dataset without copying it
+    close()
+        Removes the published dataset
+    """
+
+    def __init__(self, train_x, train_y, directory=None):
+        self.directory = tempfile.mkdtemp(prefix="simple_learn_", dir=directory)
+        self.handles = (
+            _share(train_x, os.path.join(self.directory, "train_x.joblib")),
+            _share(train_y, os.path.join(self.directory, "train_y.joblib")),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def attach(self):
+        """Opens the published dataset without copying it into
+        memory
+
+        Returns
+        -------
+        tuple
+            The read-only memory mapped features and labels
+        """
+
+        return attach(self.handles)
+
+    def close(self):
+        """Removes the published dataset"""
+
+        shutil.rmtree(self.directory, ignore_errors=True)
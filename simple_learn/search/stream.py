@@ -0,0 +1,237 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+from collections import deque
+
+import numpy as np
+from sklearn.model_selection import ParameterGrid
+from sklearn.utils import _safe_indexing, check_random_state
+
+from simple_learn.search.scoring import score_estimator
+from simple_learn.search.search_result import ModelSearchResult
+
+
+def _mean_score(scores):
+    weights = np.array([weight for weight, _ in scores], dtype=float)
+    if isinstance(scores[0][1], dict):
+        return {
+            metric: float(
+                np.average([score[metric] for _, score in scores], weights=weights)
+            )
+            for metric in scores[0][1]
+        }
+    return float(np.average([score for _, score in scores], weights=weights))
+
+
+class StreamSearch:
+    """
+    A class used to train every candidate of the partial_fit
+    model algorithms together in a single pass over a stream of
+    batches
+
+    A holdout fraction of every batch is scored by each candidate
+    before the rest of the batch is trained on, so candidates are
+    always scored on samples they have not seen. The score of a
+    candidate is the mean over the holdouts of the most recent
+    batches, only those scores are kept and memory stays constant
+    however long the stream is.
+
+    ...
+
+    Attributes
+    ----------
+    results : list
+        the ModelSearchResult of every model algorithm
+    scoring : str or dict
+        the sklearn scoring metric, or the sklearn scoring metric
+        of every metric name
+    classes : numpy.ndarray
+        the class labels of the whole stream, None for regressors
+    holdout : float
+        the fraction of every batch scored instead of trained on
+    window : int
+        the number of most recent holdouts averaged per candidate
+    error_score : "raise" or float
+        the score assigned to candidates that fail to fit, "raise"
+        fails the whole model algorithm
+    n_batches : int
+        the number of batches consumed
+
+    Methods
+    -------
+    partial_fit(batch_x, batch_y)
+        Scores and trains every candidate on a batch
+    run(batches, on_batch_end=None)
+        Consumes a stream of batches and finalizes the search
+    finalize()
+        Selects the best candidate of every model algorithm
+    """
+
+    def __init__(
+        self,
+        estimators,
+        param_map,
+        scoring,
+        classes=None,
+        holdout=0.2,
+        window=10,
+        refit=None,
+        error_score=np.nan,
+        random_state=0,
+    ):
+        if not 0.0 <= holdout < 1.0:
+            raise ValueError(f"holdout must be in [0, 1), got {holdout}")
+
+        metrics = list(scoring) if isinstance(scoring, dict) else None
+        self.results = []
+        self._models = []
+        for name, EstimatorClass in estimators:
+            candidates = list(ParameterGrid(param_map[name]))
+            self.results.append(
+                ModelSearchResult(
+                    name, EstimatorClass, candidates, 1, metrics=metrics, refit=refit
+                )
+            )
+            self._models.append(
+                [
+                    {
+                        "estimator": EstimatorClass(**params),
+                        "fitted": False,
+                        "failed": False,
+                        "scores": deque(maxlen=window),
+                        "fit_time": 0.0,
+                        "score_time": 0.0,
+                    }
+                    for params in candidates
+                ]
+            )
+        self.scoring = scoring
+        self.classes = None if classes is None else np.asarray(classes)
+        self.holdout = holdout
+        self.window = window
+        self.error_score = error_score
+        self.n_batches = 0
+        self._rng = check_random_state(random_state)
+
+    def partial_fit(self, batch_x, batch_y):
+        """Scores every trained candidate on the holdout of a
+        batch, then trains every candidate on the rest of it.
+
+        Parameters
+        ----------
+        batch_x : numpy.ndarray
+            The features of the batch
+        batch_y : numpy.ndarray
+            The corresponding label for feature array
+        """
+
+        n_samples = len(batch_y)
+        order = self._rng.permutation(n_samples)
+        n_holdout = int(round(self.holdout * n_samples))
+        test, train = np.sort(order[:n_holdout]), np.sort(order[n_holdout:])
+        test_x, test_y = _safe_indexing(batch_x, test), _safe_indexing(batch_y, test)
+        train_x = _safe_indexing(batch_x, train)
+        train_y = _safe_indexing(batch_y, train)
+        fit_params = {} if self.classes is None else {"classes": self.classes}
+
+        for result, models in zip(self.results, self._models):
+            if result.error is not None:
+                continue
+            for model in models:
+                if model["failed"]:
+                    continue
+                estimator = model["estimator"]
+                if model["fitted"] and n_holdout:
+                    start = time.time()
+                    score = score_estimator(estimator, self.scoring, test_x, test_y)
+                    model["score_time"] += time.time() - start
+                    model["scores"].append((n_holdout, score))
+                if not len(train):
+                    continue
+
+                start = time.time()
+                try:
+                    estimator.partial_fit(train_x, train_y, **fit_params)
+                except Exception as error:
+                    if self.error_score == "raise":
+                        result.error = error
+                        break
+                    model["failed"] = True
+                model["fit_time"] += time.time() - start
+                model["fitted"] = True
+        self.n_batches += 1
+
+    def run(self, batches, on_batch_end=None):
+        """Consumes a stream of batches and selects the best
+        candidate of every model algorithm.
+
+        Parameters
+        ----------
+        batches : iterable
+            The (features, labels) of every batch
+        on_batch_end : callable, optional
+            Called with the number of consumed batches after each
+            batch
+
+        Returns
+        -------
+        list
+            The ModelSearchResult of every model algorithm
+        """
+
+        for batch_x, batch_y in batches:
+            self.partial_fit(batch_x, batch_y)
+            if on_batch_end is not None:
+                on_batch_end(self.n_batches)
+        return self.finalize()
+
+    def finalize(self):
+        """Selects the best candidate of every model algorithm
+        from the scores of the most recent holdouts. The best
+        candidate is kept as trained on the stream.
+
+        Returns
+        -------
+        list
+            The ModelSearchResult of every model algorithm
+        """
+
+        for result, models in zip(self.results, self._models):
+            if result.error is not None:
+                continue
+            for candidate, model in enumerate(models):
+                score = np.nan if self.error_score == "raise" else self.error_score
+                if model["scores"] and not model["failed"]:
+                    score = _mean_score(model["scores"])
+                elif result.metrics:
+                    score = {metric: score for metric in result.metrics}
+                result.record(
+                    candidate, 0, score, model["fit_time"], model["score_time"]
+                )
+            try:
+                result.finalize()
+            except ValueError as error:
+                result.error = error
+                continue
+            best = models[result.best_index_]
+            result.best_estimator_ = best["estimator"]
+            result.refit_time_ = best["fit_time"]
+        return self.results
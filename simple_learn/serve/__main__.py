@@ -0,0 +1,79 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+import asyncio
+import os
+
+from simple_learn.registry import load_model
+from simple_learn.serve import ModelServer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m simple_learn.serve",
+        description="Serves the predictions of saved simple_learn archives",
+    )
+    parser.add_argument(
+        "archives",
+        nargs="+",
+        metavar="[NAME=]ARCHIVE",
+        help="the archives to serve, named after their file by default",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=2.0,
+        help="milliseconds a batch waits for more rows",
+    )
+    parser.add_argument(
+        "--mmap", action="store_true", help="map the model arrays from disk"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    models = {}
+    for archive in args.archives:
+        name, _, path = archive.rpartition("=")
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        models[name] = load_model(path, mmap=args.mmap)
+
+    server = ModelServer(
+        models,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000,
+    )
+    print(f"Serving {', '.join(models)} on http://{args.host}:{args.port}")
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
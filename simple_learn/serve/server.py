@@ -0,0 +1,266 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import io
+import json
+from http import HTTPStatus
+
+import numpy as np
+
+from simple_learn.inference import AsyncPredictor
+
+# Media type of request and response bodies in the .npy format
+npy_type = "application/x-npy"
+
+# Media type of request and response bodies in JSON
+json_type = "application/json"
+
+
+class HTTPError(Exception):
+    """
+    A class used to answer a request with an error status
+
+    ...
+
+    Attributes
+    ----------
+    status : http.HTTPStatus
+        the status of the response
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def decode_rows(body, content_type):
+    """Reads the rows of a predict request
+
+    Parameters
+    ----------
+    body : bytes
+        The request body, a .npy array or a JSON list
+    content_type : str
+        The media type of the body
+
+    Returns
+    -------
+    numpy.ndarray
+        The rows as a 2D array, a single row becomes one line
+    """
+
+    try:
+        if content_type == npy_type:
+            rows = np.load(io.BytesIO(body), allow_pickle=False)
+        else:
+            rows = np.asarray(json.loads(body))
+    except ValueError as error:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unreadable rows: {error}")
+    if rows.ndim == 1:
+        rows = rows[np.newaxis, :]
+    if rows.ndim != 2 or not len(rows):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Rows must be a 1D or 2D array")
+    return rows
+
+
+def encode_predictions(predictions, content_type):
+    """Writes the predictions of a predict response
+
+    Parameters
+    ----------
+    predictions : numpy.ndarray
+        The predictions of the request rows
+    content_type : str
+        The media type of the response
+
+    Returns
+    -------
+    bytes
+        The response body
+    """
+
+    if content_type == npy_type:
+        buffer = io.BytesIO()
+        np.lib.format.write_array(buffer, np.asarray(predictions), allow_pickle=False)
+        return buffer.getvalue()
+    return json.dumps({"predictions": np.asarray(predictions).tolist()}).encode()
+
+
+class ModelServer:
+    """
+    A class used to serve the predictions of loaded models over
+    HTTP, batching the rows of concurrent requests
+
+    Rows are sent to POST /models/<name>/predict as a JSON list or
+    a .npy array, the response uses the media type of the Accept
+    header or else of the request. GET /models lists the metadata
+    of every model and GET /stats the batching counters.
+
+    ...
+
+    Attributes
+    ----------
+    models : dict
+        the loaded SimpleClassifier or SimpleRegressor of every name
+    max_batch_size : int
+        the number of rows that flushes a batch
+    max_wait : float
+        the seconds a batch waits for more rows
+    predictors : dict
+        the AsyncPredictor batching the requests of every name
+    server : asyncio.Server
+        the listening server, None until start
+
+    Methods
+    -------
+    start(host="127.0.0.1", port=8000)
+        Starts listening for requests
+    serve_forever(host="127.0.0.1", port=8000)
+        Serves requests until cancelled
+    """
+
+    def __init__(self, models, max_batch_size=64, max_wait=0.002):
+        self.models = models
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.predictors = {
+            name: AsyncPredictor(
+                model, max_batch_size=max_batch_size, max_wait=max_wait
+            )
+            for name, model in models.items()
+        }
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8000):
+        """Starts listening for requests
+
+        Parameters
+        ----------
+        host : str, optional
+            The interface to listen on
+        port : int, optional
+            The port to listen on, 0 picks a free port
+
+        Returns
+        -------
+        asyncio.Server
+            The listening server
+        """
+
+        self.server = await asyncio.start_server(self._connection, host, port)
+        return self.server
+
+    async def serve_forever(self, host="127.0.0.1", port=8000):
+        """Serves requests until the task is cancelled
+
+        Parameters
+        ----------
+        host : str, optional
+            The interface to listen on
+        port : int, optional
+            The port to listen on
+        """
+
+        server = await self.start(host, port)
+        try:
+            # asyncio.Server.serve_forever needs Python 3.7
+            await asyncio.get_event_loop().create_future()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    async def _respond(self, method, path, headers, body):
+        parts = path.split("?")[0].strip("/").split("/")
+        if method == "GET" and parts == ["health"]:
+            return HTTPStatus.OK, json_type, b'{"status": "ok"}'
+        if method == "GET" and parts == ["models"]:
+            listing = {
+                name: json.loads(str(model)) for name, model in self.models.items()
+            }
+            return HTTPStatus.OK, json_type, json.dumps(listing).encode()
+        if method == "GET" and parts == ["stats"]:
+            stats = {
+                name: predictor.stats() for name, predictor in self.predictors.items()
+            }
+            return HTTPStatus.OK, json_type, json.dumps(stats).encode()
+        if len(parts) == 3 and parts[0] == "models" and parts[2] == "predict":
+            if method != "POST":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST to predict")
+            if parts[1] not in self.predictors:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"No model named {parts[1]}")
+            content_type = headers.get("content-type", json_type).split(";")[0]
+            accept = headers.get("accept", content_type)
+            accept = npy_type if npy_type in accept else json_type
+            rows = decode_rows(body, content_type)
+            try:
+                predictions = await self.predictors[parts[1]].predict(rows)
+            except ValueError as error:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(error))
+            return HTTPStatus.OK, accept, encode_predictions(predictions, accept)
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No endpoint {path}")
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, value = line.decode("latin-1").split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                try:
+                    status, content_type, payload = await self._respond(
+                        method, path, headers, body
+                    )
+                except HTTPError as error:
+                    status, content_type = error.status, json_type
+                    payload = json.dumps({"error": str(error)}).encode()
+                except Exception as error:
+                    status, content_type = HTTPStatus.INTERNAL_SERVER_ERROR, json_type
+                    payload = json.dumps({"error": str(error)}).encode()
+
+                close = headers.get("connection", "").lower() == "close" or (
+                    version == "HTTP/1.0"
+                    and headers.get("connection", "").lower() != "keep-alive"
+                )
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                        f"Content-Type: {content_type}\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,190 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import os
+from collections import Counter, defaultdict
+
+from tqdm import tqdm
+
+from simple_learn.encoders import simple_model_encoder
+
+
+class _EventEncoder(simple_model_encoder.npEncoder):
+    # NumPy scalars and arrays keep their values, other parameter
+    # values such as estimators are written by their name
+    def default(self, obj):
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+class JsonLinesSink:
+    """
+    A class used to write every search event as a line of JSON
+
+    ...
+
+    Attributes
+    ----------
+    file : file object
+        the file the events are written to
+
+    Methods
+    -------
+    close()
+        Flushes the events and closes a file opened by the sink
+    """
+
+    def __init__(self, file):
+        self._owned = isinstance(file, (str, os.PathLike))
+        self.file = open(file, "a") if self._owned else file
+
+    def __call__(self, event):
+        line = json.dumps(event, cls=_EventEncoder)
+        self.file.write(line + "\n")
+        if event["event"] in ["algorithm_end", "search_end"]:
+            self.file.flush()
+
+    def close(self):
+        """Flushes the events and closes a file opened by the sink"""
+
+        if self._owned:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class CounterSink:
+    """
+    A class used to count the search events in memory and sum the
+    durations of every model algorithm
+
+    ...
+
+    Attributes
+    ----------
+    counts : collections.Counter
+        the number of events of each name
+    folds : collections.Counter
+        the number of evaluated candidate folds of every model
+        algorithm
+    fit_time : collections.defaultdict
+        the summed fit duration of every model algorithm, without
+        the folds read from the score cache
+    score_time : collections.defaultdict
+        the summed scoring duration of every model algorithm,
+        without the folds read from the score cache
+    failures : dict
+        the error message of every failed model algorithm
+    peak_memory : collections.Counter
+        the largest peak resident bytes of a worker for every model
+        algorithm
+    worker_peaks : collections.Counter
+        the largest peak resident bytes of every worker process
+
+    Methods
+    -------
+    summary()
+        Returns the counts and durations of every model algorithm
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.folds = Counter()
+        self.fit_time = defaultdict(float)
+        self.score_time = defaultdict(float)
+        self.failures = {}
+        self.peak_memory = Counter()
+        self.worker_peaks = Counter()
+
+    def __call__(self, event):
+        self.counts[event["event"]] += 1
+        if event["event"] == "candidate_end":
+            algorithm = event["algorithm"]
+            self.folds[algorithm] += 1
+            if not event.get("cached"):
+                self.fit_time[algorithm] += event["fit_time"]
+                self.score_time[algorithm] += event["score_time"]
+            if event.get("peak_memory") is not None:
+                peak = event["peak_memory"]
+                self.peak_memory[algorithm] = max(self.peak_memory[algorithm], peak)
+                worker = event["worker"]
+                self.worker_peaks[worker] = max(self.worker_peaks[worker], peak)
+        elif event["event"] == "failure":
+            self.failures[event["algorithm"]] = event["error"]
+
+    def summary(self):
+        """Returns the counts and durations of every model
+        algorithm, the slowest first
+
+        Returns
+        -------
+        list
+            The (model algorithm, folds, fit duration, scoring
+            duration) of every model algorithm
+        """
+
+        return sorted(
+            (
+                (name, self.folds[name], self.fit_time[name], self.score_time[name])
+                for name in self.folds
+            ),
+            key=lambda row: row[2] + row[3],
+            reverse=True,
+        )
+
+
+class TqdmSink:
+    """
+    A class used to show a progress bar ticked at the end of
+    every model algorithm
+
+    ...
+
+    Attributes
+    ----------
+    progressbar : tqdm.tqdm
+        the progress bar, None before the search starts
+
+    Methods
+    -------
+    close()
+        Closes the progress bar
+    """
+
+    def __init__(self, desc="Fitting Models", unit=" Algorithm", ncols=100):
+        self._options = {"desc": desc, "unit": unit, "ncols": ncols}
+        self.progressbar = None
+
+    def __call__(self, event):
+        if event["event"] == "search_start":
+            self.close()
+            self.progressbar = tqdm(total=len(event["algorithms"]), **self._options)
+        elif event["event"] == "algorithm_end" and self.progressbar is not None:
+            self.progressbar.update(1)
+
+    def close(self):
+        """Closes the progress bar"""
+
+        if self.progressbar is not None:
+            self.progressbar.close()
+            self.progressbar = None
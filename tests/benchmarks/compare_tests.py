@@ -0,0 +1,90 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import tempfile
+import unittest
+
+from benchmarks.__main__ import main
+from benchmarks.compare import compare_results, write_results
+
+
+def _results(**values):
+    units = {"fit": "s", "predict": "rows/s", "size": "bytes"}
+    return {
+        "metadata": {},
+        "benchmarks": {
+            name: {
+                "value": value,
+                "unit": units[name],
+                "higher_is_better": units[name] == "rows/s",
+            }
+            for name, value in values.items()
+        },
+    }
+
+
+class TestCompare(unittest.TestCase):
+    """
+    Tests for comparing benchmark results against a baseline
+    """
+
+    def test_compare_results(self):
+        """
+        Test the direction and threshold of regressions
+
+        Expected
+        -----------------
+        fit : 30% slower, a regression
+        predict : 5% lower throughput, below the threshold
+        size : smaller archive, an improvement
+        """
+        baseline = _results(fit=1.0, predict=1000.0, size=200)
+        results = _results(fit=1.3, predict=950.0, size=100)
+        rows = {row[0]: row[3:] for row in compare_results(baseline, results, 0.1)}
+        self.assertAlmostEqual(rows["fit"][0], 0.3)
+        self.assertTrue(rows["fit"][1])
+        self.assertAlmostEqual(rows["predict"][0], 0.05)
+        self.assertFalse(rows["predict"][1])
+        self.assertAlmostEqual(rows["size"][0], -0.5)
+        self.assertFalse(rows["size"][1])
+
+    def test_compare_command(self):
+        """
+        Test the exit code of the compare command
+
+        Expected
+        -----------------
+        exit code : 1 with a regression, 0 without
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, f"{i}.json") for i in range(3)]
+            write_results(_results(fit=1.0), paths[0])
+            write_results(_results(fit=1.05), paths[1])
+            write_results(_results(fit=2.0), paths[2])
+            self.assertEqual(main(["compare", paths[0], paths[1]]), 0)
+            self.assertEqual(main(["compare", paths[0], paths[2]]), 1)
+            self.assertEqual(
+                main(["compare", paths[0], paths[2], "--threshold", "1.5"]), 0
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
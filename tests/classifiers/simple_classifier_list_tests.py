@@ -100,6 +100,58 @@ class TestSimpleClassifierList(unittest.TestCase):
         self.assertTrue(accuracy_score(true_y, pred0_y) > 0.95)
         self.assertTrue(accuracy_score(true_y, pred1_y) > 0.90)
 
+    def test_rerank(self):
+        """
+        Test reranking SimpleClassifierList by another scoring
+        metric without refitting
+
+        Expected
+        -----------------
+        cv_results : more candidates than ranked models
+        ranked list : sorted by F1 Score
+        top_k : at most k candidates per model algorithm
+        """
+        iris = datasets.load_iris()
+        true_x = iris.data
+        true_y = iris.target
+
+        clf_list = SimpleClassifierList()
+        clf_list.fit(true_x, true_y)
+        self.assertTrue(len(clf_list.cv_results) > len(clf_list.ranked_list))
+
+        clf_list.rerank("f1")
+        scores = [clf.metrics["F1 Score"] for clf in clf_list.ranked_list]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+        top = clf_list.top_k(k=2, scoring="auto")
+        self.assertTrue(len(top) <= 2 * len(clf_list.ranked_list))
+        self.assertEqual(
+            top[0]["Training Accuracy"],
+            max(clf.metrics["Training Accuracy"] for clf in clf_list.ranked_list),
+        )
+
+    def test_deferred_refit(self):
+        """
+        Test deferring the refit of ranked models until one is
+        popped
+
+        Expected
+        -----------------
+        ranked list : no training duration before pop
+        popped model : refit with accuracy score > 0.9
+        """
+        iris = datasets.load_iris()
+        true_x = iris.data
+        true_y = iris.target
+
+        clf_list = SimpleClassifierList()
+        clf_list.fit(true_x, true_y)
+        self.assertTrue(all(clf.train_duration is None for clf in clf_list.ranked_list))
+
+        clf = clf_list.pop()
+        self.assertIsNotNone(clf.train_duration)
+        self.assertTrue(accuracy_score(true_y, clf.predict(true_x)) > 0.9)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -18,11 +18,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import os
+import tempfile
 import unittest
 import warnings
 
 warnings.filterwarnings("ignore")
 
+import numpy as np
 from sklearn import datasets
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics import accuracy_score
@@ -135,6 +138,51 @@ class TestSimpleClassifier(unittest.TestCase):
         pred_y = clf.predict(true_x)
         self.assertTrue(accuracy_score(true_y, pred_y) > 0.95)
 
+    def test_halving(self):
+        """
+        Test SimpleClassifier successive halving search against
+        sklearn iris dataset
+
+        Expected
+        -----------------
+        model : Not None
+        training accuracy : > 0.9
+        """
+        iris = datasets.load_iris()
+        true_x = iris.data
+        true_y = iris.target
+
+        clf = SimpleClassifier()
+        clf.fit(true_x, true_y, search="halving")
+        self.assertIsNotNone(clf.sk_model)
+        self.assertTrue(clf.metrics["Training Accuracy"] > 0.9)
+
+    def test_memory_mapped(self):
+        """
+        Test SimpleClassifier on .npy files of the sklearn digits
+        dataset searched on a subsample
+
+        Expected
+        -----------------
+        model : Not None
+        accuracy : > 0.9
+        """
+        digits = datasets.load_digits()
+        true_x = digits.data
+        true_y = digits.target
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            x_path = os.path.join(tmp_dir, "x.npy")
+            y_path = os.path.join(tmp_dir, "y.npy")
+            np.save(x_path, true_x)
+            np.save(y_path, true_y)
+
+            clf = SimpleClassifier()
+            clf.fit(x_path, y_path, max_samples=600)
+            self.assertIsNotNone(clf.sk_model)
+            pred_y = clf.predict(true_x)
+            self.assertTrue(accuracy_score(true_y, pred_y) > 0.9)
+
 
 if __name__ == "__main__":
     unittest.main()
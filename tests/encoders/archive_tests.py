@@ -0,0 +1,181 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import os
+import struct
+import tempfile
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+from joblib import dump
+from sklearn import datasets
+from sklearn.ensemble import RandomForestClassifier
+
+from simple_learn.classifiers import SimpleClassifier
+from simple_learn.encoders import archive
+from simple_learn.encoders.archive import (
+    buffer_alignment,
+    read_metadata,
+    read_model,
+    write_archive,
+)
+
+
+class TestArchive(unittest.TestCase):
+    """
+    Tests for the model archives
+    """
+
+    def setUp(self):
+        self.x, self.y = datasets.load_digits(return_X_y=True)
+        self.model = RandomForestClassifier(n_estimators=5, random_state=0)
+        self.model.fit(self.x, self.y)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "model.zip")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_memory_mapped(self):
+        """
+        Test mapping the model arrays from the archive
+
+        Expected
+        -----------------
+        directory : only the archive, no temporary files
+        permissions : those of any new file under the umask
+        buffers : aligned and uncompressed
+        mapped model : same predictions
+        """
+        big = np.arange(100000, dtype=np.float64)
+        write_archive(self.path, "model", '{"Type": "RF"}', (self.model, big))
+        self.assertEqual(os.listdir(self.directory.name), ["model.zip"])
+        plain = os.path.join(self.directory.name, "plain")
+        open(plain, "w").close()
+        self.assertEqual(os.stat(self.path).st_mode, os.stat(plain).st_mode)
+        os.remove(plain)
+        self.assertEqual(read_metadata(self.path, "model"), {"Type": "RF"})
+
+        with zipfile.ZipFile(self.path) as zf:
+            buffers = [info for info in zf.infolist() if "_buffers/" in info.filename]
+            self.assertEqual(len(buffers), 1)
+            zf.fp.seek(buffers[0].header_offset + 26)
+            name_size, extra_size = struct.unpack("<HH", zf.fp.read(4))
+            offset = buffers[0].header_offset + 30 + name_size + extra_size
+            self.assertEqual(offset % buffer_alignment, 0)
+
+        model, mapped = read_model(self.path, "model", mmap=True)
+        base = mapped
+        while base.base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        np.testing.assert_array_equal(mapped, big)
+        np.testing.assert_array_equal(model.predict(self.x), self.model.predict(self.x))
+
+    def test_in_band(self):
+        """
+        Test archives written without out-of-band buffers, as on
+        Python versions before 3.8
+
+        Expected
+        -----------------
+        archive : no buffer entries
+        model : same predictions, also when mapped
+        """
+        big = np.arange(100000, dtype=np.float64)
+        with mock.patch.object(archive, "_out_of_band", False):
+            write_archive(self.path, "model", "{}", (self.model, big))
+        with zipfile.ZipFile(self.path) as zf:
+            self.assertFalse(any("_buffers/" in name for name in zf.namelist()))
+        model, loaded = read_model(self.path, "model", mmap=True)
+        np.testing.assert_array_equal(loaded, big)
+        np.testing.assert_array_equal(model.predict(self.x), self.model.predict(self.x))
+
+    def test_file_objects_and_legacy(self):
+        """
+        Test archives in file objects and joblib archives
+
+        Expected
+        -----------------
+        file object : round trip without a path
+        joblib archive : loaded without extracting into the CWD
+        """
+        clf = SimpleClassifier()
+        clf.sk_model = self.model
+        stream = io.BytesIO()
+        clf.save(stream)
+        stream.seek(0)
+        loaded = SimpleClassifier()
+        loaded.load(stream)
+        np.testing.assert_array_equal(
+            loaded.predict(self.x), self.model.predict(self.x)
+        )
+
+        joblib_path = os.path.join(self.directory.name, "simple_classifier.joblib")
+        dump(self.model, joblib_path)
+        with zipfile.ZipFile(self.path, mode="w") as zf:
+            zf.writestr("simple_classifier.json", str(clf))
+            zf.write(joblib_path, "simple_classifier.joblib")
+        os.remove(joblib_path)
+
+        cwd = os.listdir(os.getcwd())
+        loaded = SimpleClassifier()
+        loaded.load(self.path, mmap=True)
+        self.assertEqual(os.listdir(os.getcwd()), cwd)
+        np.testing.assert_array_equal(
+            loaded.predict(self.x), self.model.predict(self.x)
+        )
+
+    def test_lazy(self):
+        """
+        Test deferring the model read to its first use
+
+        Expected
+        -----------------
+        metadata : read by load
+        sklearn model : read once by concurrent predictions
+        """
+        clf = SimpleClassifier()
+        clf.name = "RandomForestClassifier"
+        clf.sk_model = self.model
+        clf.save(self.path[: -len(".zip")])
+
+        loaded = SimpleClassifier()
+        with mock.patch(
+            "simple_learn.classifiers.simple_classifier.read_model",
+            wraps=read_model,
+        ) as reads:
+            loaded.load(self.path, lazy=True)
+            self.assertEqual(loaded.name, "RandomForestClassifier")
+            self.assertEqual(reads.call_count, 0)
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                predictions = list(executor.map(loaded.predict, [self.x] * 4))
+            self.assertEqual(reads.call_count, 1)
+        for prediction in predictions:
+            np.testing.assert_array_equal(prediction, self.model.predict(self.x))
+
+
+if __name__ == "__main__":
+    unittest.main()
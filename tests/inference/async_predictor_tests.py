@@ -0,0 +1,160 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sklearn import datasets
+from sklearn.linear_model import RidgeClassifier
+
+from simple_learn.inference import AsyncPredictor
+
+
+def run_loop(coroutine):
+    # asyncio.run needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class SlowModel:
+    def predict(self, rows):
+        time.sleep(0.3)
+        return rows[:, 0]
+
+
+class TestAsyncPredictor(unittest.TestCase):
+    """
+    Tests for the AsyncPredictor Class
+    """
+
+    def setUp(self):
+        self.x, y = datasets.load_iris(return_X_y=True)
+        self.model = RidgeClassifier().fit(self.x, y)
+
+    def test_batching(self):
+        """
+        Test batching concurrent callers
+
+        Expected
+        -----------------
+        predictions : each caller gets its own rows
+        batches : flushed by size
+        counters : every caller and row counted
+        """
+
+        async def run():
+            async with AsyncPredictor(
+                self.model, max_batch_size=16, max_wait=1.0
+            ) as predictor:
+                singles = await asyncio.gather(
+                    *[predictor.predict_one(row) for row in self.x[:32]]
+                )
+                many = await predictor.predict(self.x[32:40])
+                return singles, many, predictor.stats()
+
+        singles, many, stats = run_loop(run())
+        expected = self.model.predict(self.x)
+        self.assertEqual(list(singles), list(expected[:32]))
+        np.testing.assert_array_equal(many, expected[32:40])
+        self.assertEqual(stats["requests"], 33)
+        self.assertEqual(stats["rows"], 40)
+        self.assertEqual(stats["max_batch_size"], 16)
+
+    def test_failures(self):
+        """
+        Test callers with a wrong number of features
+
+        Expected
+        -----------------
+        bad caller : raises the predict error
+        other callers : still predicted
+        """
+
+        async def run():
+            predictor = AsyncPredictor(self.model, max_wait=0.05)
+            results = await asyncio.gather(
+                predictor.predict(self.x[:3]),
+                predictor.predict(self.x[:3, :2]),
+                return_exceptions=True,
+            )
+            await predictor.close()
+            return results
+
+        good, bad = run_loop(run())
+        np.testing.assert_array_equal(good, self.model.predict(self.x[:3]))
+        self.assertIsInstance(bad, ValueError)
+
+    def test_concurrency(self):
+        """
+        Test predicting batches in parallel on the thread pool
+
+        Expected
+        -----------------
+        batches : four slow batches predicted at once
+        """
+
+        async def run():
+            async with AsyncPredictor(
+                SlowModel(),
+                max_batch_size=1,
+                executor=executor,
+                max_concurrency=4,
+            ) as predictor:
+                start = time.perf_counter()
+                results = await asyncio.gather(
+                    *[predictor.predict(self.x[i : i + 1]) for i in range(4)]
+                )
+                return results, time.perf_counter() - start
+
+        with ThreadPoolExecutor(4) as executor:
+            results, duration = run_loop(run())
+        np.testing.assert_array_equal(np.concatenate(results), self.x[:4, 0])
+        self.assertLess(duration, 0.9)
+
+    def test_wait_from_queued(self):
+        """
+        Test the wait of a caller queued while the loop was busy
+
+        Expected
+        -----------------
+        latency : max_wait from when the caller was queued, not from
+        when the batching task took it
+        """
+
+        async def run():
+            async with AsyncPredictor(self.model, max_wait=0.3) as predictor:
+                start = time.perf_counter()
+                task = asyncio.ensure_future(predictor.predict(self.x[:1]))
+                await asyncio.sleep(0)
+                time.sleep(0.3)
+                await task
+                return time.perf_counter() - start
+
+        self.assertLess(run_loop(run()), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn import datasets
+from sklearn.ensemble import RandomForestClassifier
+
+from simple_learn.inference import predict_chunked, predict_iter
+
+
+class TestChunkedPredict(unittest.TestCase):
+    """
+    Tests for predicting large feature arrays in chunks
+    """
+
+    def setUp(self):
+        digits = datasets.load_digits()
+        self.x = digits.data
+        self.model = RandomForestClassifier(n_estimators=10, random_state=0)
+        self.model.fit(self.x, digits.target)
+
+    def test_predict_chunked(self):
+        """
+        Test predicting in parallel chunks
+
+        Expected
+        -----------------
+        predictions : equal to a single predict call
+        predict_proba : 2D output array
+        """
+        expected = self.model.predict(self.x)
+        for n_jobs in [1, 3]:
+            predictions = predict_chunked(
+                self.model, self.x, chunk_size=100, n_jobs=n_jobs
+            )
+            np.testing.assert_array_equal(predictions, expected)
+
+        probabilities = predict_chunked(
+            self.model, self.x, chunk_size=500, method="predict_proba"
+        )
+        np.testing.assert_allclose(probabilities, self.model.predict_proba(self.x))
+
+    def test_predict_iter(self):
+        """
+        Test yielding the predictions of a memory mapped array
+
+        Expected
+        -----------------
+        chunks : in sample order, at most chunk_size samples each
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "x.npy")
+            np.save(path, self.x)
+            chunks = list(predict_iter(self.model, path, chunk_size=400, n_jobs=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [400, 400, 400, 400, 197])
+        np.testing.assert_array_equal(
+            np.concatenate(chunks), self.model.predict(self.x)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
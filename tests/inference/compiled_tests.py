@@ -0,0 +1,169 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from scipy import sparse
+from sklearn import datasets
+from sklearn.ensemble import (
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import RidgeClassifier, SGDRegressor
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from simple_learn.classifiers import SimpleClassifier
+from simple_learn.inference import compile_model, predict_iter
+from simple_learn.inference.compiled import _flatten_trees
+from simple_learn.regressors import SimpleRegressor
+
+
+class TestCompiledModel(unittest.TestCase):
+    """
+    Tests for compiling models into NumPy arrays
+    """
+
+    def test_exact_predictions(self):
+        """
+        Test compiled predictions against sklearn
+
+        Expected
+        -----------------
+        trees, boosting and linear models : identical predictions
+        NaN features : routed like sklearn
+        other models : raise ValueError
+        """
+        digits_x, digits_y = datasets.load_digits(return_X_y=True)
+        cancer_x, cancer_y = datasets.load_breast_cancer(return_X_y=True)
+        diabetes_x, diabetes_y = datasets.load_diabetes(return_X_y=True)
+        missing_x = diabetes_x.copy()
+        missing_x[::7, 2] = np.nan
+
+        cases = [
+            (DecisionTreeClassifier(random_state=0), digits_x, digits_y),
+            (GradientBoostingClassifier(n_estimators=20), digits_x, digits_y),
+            (GradientBoostingClassifier(n_estimators=20), cancer_x, cancer_y),
+            (RandomForestRegressor(20, random_state=0), missing_x, diabetes_y),
+            (RidgeClassifier(), digits_x, digits_y),
+            (RidgeClassifier(), cancer_x, cancer_y),
+            (SGDRegressor(random_state=0), diabetes_x, diabetes_y),
+        ]
+        for model, train_x, train_y in cases:
+            model.fit(train_x, train_y)
+            np.testing.assert_array_equal(
+                compile_model(model).predict(train_x), model.predict(train_x)
+            )
+
+        with self.assertRaises(ValueError):
+            compile_model(KNeighborsClassifier().fit(digits_x, digits_y))
+
+    def test_compatibility(self):
+        """
+        Test inputs and models from other sklearn versions
+
+        Expected
+        -----------------
+        sparse features : same predictions, also one chunk at a time
+        and through the compiled model of a SimpleClassifier
+        class counts per node : normalized into the same fractions
+        no missing value routing : same predictions without NaN
+        """
+        digits_x, digits_y = datasets.load_digits(return_X_y=True)
+        model = RandomForestClassifier(10, min_samples_leaf=3, random_state=0)
+        model.fit(digits_x, digits_y)
+        compiled = compile_model(model)
+        expected = model.predict(digits_x)
+
+        sparse_x = sparse.csr_matrix(digits_x)
+        np.testing.assert_array_equal(compiled.predict(sparse_x), expected)
+        chunks = predict_iter(compiled, sparse_x, chunk_size=500, n_jobs=1)
+        np.testing.assert_array_equal(np.concatenate(list(chunks)), expected)
+        clf = SimpleClassifier()
+        clf.sk_model = model
+        clf.compile()
+        with mock.patch.object(model, "predict", side_effect=AssertionError):
+            chunks = clf.predict_iter(sparse_x, chunk_size=500, n_jobs=1)
+            np.testing.assert_array_equal(np.concatenate(list(chunks)), expected)
+
+        counts = [
+            SimpleNamespace(
+                **{
+                    name: getattr(tree.tree_, name)
+                    for name in [
+                        "children_left",
+                        "children_right",
+                        "feature",
+                        "threshold",
+                        "node_count",
+                        "max_depth",
+                    ]
+                },
+                value=tree.tree_.value
+                * tree.tree_.weighted_n_node_samples[:, np.newaxis, np.newaxis],
+            )
+            for tree in model.estimators_
+        ]
+        np.testing.assert_allclose(
+            _flatten_trees(counts, True)["value"], compiled.arrays["value"]
+        )
+
+        del compiled.arrays["missing_left"]
+        np.testing.assert_array_equal(compiled.predict(digits_x), expected)
+
+    def test_archive(self):
+        """
+        Test saving the compiled model with the archive
+
+        Expected
+        -----------------
+        loaded model : compiled, same predictions
+        new sk_model : drops the compiled model
+        """
+        train_x, train_y = datasets.load_diabetes(return_X_y=True)
+        rgr = SimpleRegressor()
+        rgr.sk_model = RandomForestRegressor(10, random_state=0).fit(train_x, train_y)
+        rgr.compile()
+        expected = rgr.sk_model.predict(train_x)
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                rgr.save()
+                loaded = SimpleRegressor()
+                loaded.load("simple_regressor.zip")
+            finally:
+                os.chdir(cwd)
+        self.assertIsNotNone(loaded.compiled)
+        np.testing.assert_array_equal(loaded.predict(train_x), expected)
+
+        loaded.sk_model = SGDRegressor().fit(train_x, train_y)
+        self.assertIsNone(loaded.compiled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from sklearn import datasets
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import Ridge
+
+from simple_learn.classifiers import SimpleClassifier
+from simple_learn.registry import ModelRegistry, model_registry
+from simple_learn.regressors import SimpleRegressor
+
+
+class TestModelRegistry(unittest.TestCase):
+    """
+    Tests for the ModelRegistry Class
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        x, y = datasets.load_iris(return_X_y=True)
+        self.clf = SimpleClassifier()
+        self.clf.name = "RandomForestClassifier"
+        self.clf.sk_model = RandomForestClassifier(20, random_state=0).fit(x, y)
+        self.rgr = SimpleRegressor()
+        self.rgr.name = "Ridge"
+        self.rgr.sk_model = Ridge().fit(x, y)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_index(self):
+        """
+        Test indexing archives by name and version
+
+        Expected
+        -----------------
+        versions : numeric order, latest by default
+        metadata : read without loading the model
+        model class : from the archive entries
+        """
+        registry = ModelRegistry(self.directory.name)
+        for version in range(1, 11):
+            self.assertEqual(registry.register("tenant", self.clf), str(version))
+        registry.register("prices", self.rgr, version="v1")
+
+        registry = ModelRegistry(self.directory.name)
+        self.assertEqual(registry.names(), ["prices", "tenant"])
+        self.assertEqual(registry.versions("tenant")[-2:], ["9", "10"])
+        self.assertEqual(registry.metadata("prices")["Type"], "Ridge")
+        self.assertEqual(registry.loaded_bytes, 0)
+        self.assertIsInstance(registry.get("prices"), SimpleRegressor)
+        self.assertIsInstance(registry.get("tenant", 3), SimpleClassifier)
+        with self.assertRaises(KeyError):
+            registry.get("missing")
+
+    def test_budget(self):
+        """
+        Test the least recently used eviction
+
+        Expected
+        -----------------
+        pool : within the byte budget
+        cached model : same object until evicted
+        """
+        registry = ModelRegistry(self.directory.name)
+        for name in ["a", "b", "c"]:
+            registry.register(name, self.clf)
+        model = registry.get("a")
+        registry.max_bytes = int(registry.loaded_bytes * 2.5)
+
+        self.assertIs(registry.get("a"), model)
+        registry.get("b")
+        registry.get("a")
+        evicted = registry.get("c")
+        self.assertLessEqual(registry.loaded_bytes, registry.max_bytes)
+        self.assertIs(registry.get("a"), model)
+        registry.get("b")
+        self.assertIs(registry.get("a"), model)
+        self.assertIsNot(registry.get("c"), evicted)
+
+    def test_refresh(self):
+        """
+        Test refreshing only the changed archives
+
+        Expected
+        -----------------
+        unchanged archives : metadata not read again
+        new or deleted archives : added to or dropped from the index
+        overwritten archive : its pooled model evicted
+        loaded bytes : the size of the pickled model
+        """
+        registry = ModelRegistry(self.directory.name)
+        for name in ["a", "b", "c"]:
+            registry.register(name, self.clf)
+
+        read = mock.Mock(wraps=model_registry.read_metadata)
+        with mock.patch.object(model_registry, "read_metadata", read):
+            registry.refresh()
+            with self.assertRaises(KeyError):
+                registry.get("missing")
+            self.assertEqual(read.call_count, 0)
+            registry.register("d", self.rgr)
+            self.assertEqual(read.call_count, 1)
+
+        os.remove(registry.index[("a", "1")][0])
+        registry.refresh()
+        self.assertEqual(registry.names(), ["b", "c", "d"])
+
+        pooled = registry.get("b")
+        self.assertAlmostEqual(
+            registry.loaded_bytes,
+            len(pickle.dumps(self.clf.sk_model, protocol=pickle.HIGHEST_PROTOCOL)),
+            delta=1024,
+        )
+
+        self.rgr.save(os.path.join(self.directory.name, "b", "1"))
+        registry.refresh()
+        self.assertEqual(registry.loaded_bytes, 0)
+        self.assertIsNot(registry.get("b"), pooled)
+        self.assertIsInstance(registry.get("b"), SimpleRegressor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -79,6 +79,16 @@ class TestSimpleRegressor(unittest.TestCase):
         stat, p = levene(true_y, pred_y)
         self.assertTrue(p > 0.05)
 
+    def test_halving(self):
+        true_x, true_y = make_regression(
+            n_samples=300, n_features=4, n_informative=2, random_state=10
+        )
+
+        clf = SimpleRegressor()
+        clf.fit(true_x, true_y, search="halving")
+        self.assertIsNotNone(clf.sk_model)
+        self.assertTrue(clf.metrics["Training Score"] > 0.0)
+
 
 if __name__ == "__main__":
     unittest.main()
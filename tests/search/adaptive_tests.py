@@ -0,0 +1,125 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+import numpy as np
+from sklearn import datasets
+from sklearn.linear_model import Ridge
+
+from simple_learn.regressors.param_grid import model_param_map
+from simple_learn.search import search_models
+from simple_learn.search.adaptive import TPESampler
+
+
+class TestTPESampler(unittest.TestCase):
+    """
+    Tests for the TPESampler Class
+    """
+
+    def test_unique_proposals(self):
+        """
+        Test proposals on the SGDRegressor grid
+
+        Expected
+        -----------------
+        proposals : unseen and drawn from the grid
+        """
+        param_grid = model_param_map["SGDRegressor"]
+        sampler = TPESampler(param_grid, random_state=0)
+        candidates = []
+        for _ in range(6):
+            scores = np.arange(len(candidates), dtype=float)
+            candidates += sampler.propose(candidates, scores, 4)
+
+        self.assertEqual(len(candidates), 24)
+        encoded = {tuple(sorted(c.items(), key=lambda i: i[0])) for c in candidates}
+        self.assertEqual(len(encoded), len(candidates))
+        for candidate in candidates:
+            for param, value in candidate.items():
+                self.assertIn(value, list(param_grid[param]))
+
+    def test_exhausts_grid(self):
+        """
+        Test proposals beyond the size of a small grid
+
+        Expected
+        -----------------
+        proposals : every grid candidate exactly once
+        """
+        param_grid = {"alpha": [0.1, 1.0], "fit_prior": [True, False]}
+        sampler = TPESampler(param_grid, random_state=0)
+        candidates = sampler.propose([], None, 10)
+        self.assertEqual(len(candidates), 4)
+        self.assertEqual(sampler.propose(candidates, np.zeros(4), 1), [])
+
+    def test_exploits_good_region(self):
+        """
+        Test proposals on a score peaking at a single grid value
+
+        Expected
+        -----------------
+        proposals : close to the peak once the model is used
+        """
+        param_grid = {"x": np.arange(100)}
+        sampler = TPESampler(param_grid, random_state=0)
+        candidates = sampler.propose([], None, 10)
+        for _ in range(10):
+            scores = np.array([-abs(c["x"] - 70) for c in candidates], dtype=float)
+            candidates += sampler.propose(candidates, scores, 1)
+
+        best = min(abs(c["x"] - 70) for c in candidates)
+        self.assertLessEqual(best, 3)
+
+    def test_seeded_search(self):
+        """
+        Test repeating an adaptive search with the same seed
+
+        Expected
+        -----------------
+        candidates : the same on every run
+        """
+        train_x, train_y = datasets.load_diabetes(return_X_y=True)
+        candidates = [
+            search_models(
+                [("Ridge", Ridge)],
+                {
+                    "Ridge": {
+                        "alpha": np.logspace(-3, 3, 13),
+                        "fit_intercept": [True, False],
+                        "solver": ["svd", "cholesky", "lsqr"],
+                    }
+                },
+                train_x,
+                train_y,
+                3,
+                "r2",
+                classifier=False,
+                search="adaptive",
+                n_iter=8,
+            )[0].candidates
+            for _ in range(2)
+        ]
+        self.assertEqual(len(candidates[0]), 8)
+        self.assertEqual(candidates[0], candidates[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
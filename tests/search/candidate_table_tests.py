@@ -0,0 +1,96 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+import numpy as np
+
+from simple_learn.search import CandidateTable
+
+
+class TestCandidateTable(unittest.TestCase):
+    """
+    Tests for the CandidateTable Class
+    """
+
+    def setUp(self):
+        self.table = CandidateTable(
+            ["Ridge", "Ridge", "Ridge", "KNN", "KNN"],
+            [{"alpha": 1}, {"alpha": 2}, {"alpha": 3}, {"k": 3}, {"k": 5}],
+            {
+                "Accuracy": np.array(
+                    [[0.7, 0.7], [0.9, 0.9], [0.8, 0.8], [0.6, 0.6], [np.nan, 0.9]]
+                )
+            },
+            np.ones(5),
+            np.ones(5),
+        )
+
+    def test_sort(self):
+        """
+        Test ordering candidates by mean score
+
+        Expected
+        -----------------
+        order : best first, failed candidates last
+        """
+        table = self.table.sort("Accuracy")
+        self.assertEqual([row["Parameters"] for row in table][0], {"alpha": 2})
+        self.assertEqual(table[len(table) - 1]["Parameters"], {"k": 5})
+
+        table = self.table.sort("Accuracy", greater_is_better=False)
+        self.assertEqual(table[0]["Parameters"], {"k": 3})
+
+    def test_top_k(self):
+        """
+        Test selecting the best candidates per model algorithm
+
+        Expected
+        -----------------
+        candidates : k per model algorithm ordered by score
+        """
+        table = self.table.top_k("Accuracy", k=2)
+        self.assertEqual(len(table), 4)
+        self.assertEqual(list(table.algorithms), ["Ridge", "Ridge", "KNN", "KNN"])
+
+        table = self.table.top_k("Accuracy", k=1)
+        self.assertEqual([row["Parameters"] for row in table], [{"alpha": 2}, {"k": 3}])
+
+    def test_filter(self):
+        """
+        Test selecting candidates by model algorithm and mask
+
+        Expected
+        -----------------
+        candidates : matching both conditions
+        """
+        table = self.table.filter(algorithm="Ridge")
+        self.assertEqual(len(table), 3)
+
+        mask = self.table.mean_scores["Accuracy"] > 0.75
+        table = self.table.filter(algorithm="Ridge", mask=mask)
+        self.assertEqual(len(table), 2)
+
+        with self.assertRaises(ValueError):
+            self.table.sort("F1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import subprocess
+import sys
+import unittest
+
+from sklearn.utils import all_estimators
+
+from simple_learn.classifiers import param_grid as classifier_grid
+from simple_learn.regressors import param_grid as regressor_grid
+from simple_learn.search import import_estimators
+
+
+class TestEstimators(unittest.TestCase):
+    """
+    Tests for importing the searched estimators
+    """
+
+    def test_import_map(self):
+        """
+        Test importing the model algorithms of both param maps
+
+        Expected
+        -----------------
+        estimators : the same classes and order as all_estimators
+        """
+        for grid, type_filter in [
+            (classifier_grid, "classifier"),
+            (regressor_grid, "regressor"),
+        ]:
+            self.assertEqual(set(grid.model_import_map), set(grid.model_param_map))
+            expected = [
+                (name, EstimatorClass)
+                for name, EstimatorClass in all_estimators(type_filter=type_filter)
+                if name in grid.model_param_map
+            ]
+            self.assertEqual(import_estimators(grid.model_import_map), expected)
+
+    def test_partial_fit(self):
+        """
+        Test keeping only the estimators supporting partial_fit
+
+        Expected
+        -----------------
+        estimators : every kept class has partial_fit
+        missing : unknown names are skipped
+        """
+        import_map = dict(classifier_grid.model_import_map)
+        import_map["MissingClassifier"] = "sklearn.linear_model"
+        estimators = import_estimators(import_map, partial_fit=True)
+        self.assertIn("SGDClassifier", dict(estimators))
+        self.assertNotIn("MissingClassifier", dict(estimators))
+        self.assertTrue(all(hasattr(Class, "partial_fit") for _, Class in estimators))
+
+    def test_lazy_import(self):
+        """
+        Test importing the package without its dependencies
+
+        Expected
+        -----------------
+        sklearn : only imported once a model class is used
+        """
+        code = (
+            "import sys, simple_learn\n"
+            "assert 'sklearn' not in sys.modules\n"
+            "simple_learn.SimpleClassifier\n"
+            "assert 'sklearn' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_lazy_search(self):
+        """
+        Test importing the model classes without the search stack
+
+        Expected
+        -----------------
+        simple_learn.search : only imported once a model is fitted
+        """
+        code = (
+            "import sys, simple_learn\n"
+            "simple_learn.SimpleClassifier, simple_learn.SimpleRegressor\n"
+            "assert 'simple_learn.search' not in sys.modules\n"
+            "assert 'sklearn.model_selection' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
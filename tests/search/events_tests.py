@@ -0,0 +1,150 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn import datasets
+from sklearn.linear_model import RidgeClassifier
+from sklearn.naive_bayes import BernoulliNB
+
+from simple_learn.search import SearchEvents, search_models
+from simple_learn.simple_logging.event_sinks import CounterSink, JsonLinesSink
+
+
+class TestSearchEvents(unittest.TestCase):
+    """
+    Tests for the events sent by a model search
+    """
+
+    def setUp(self):
+        iris = datasets.load_iris()
+        self.x = iris.data
+        self.y = iris.target
+        self.estimators = [
+            ("BernoulliNB", BernoulliNB),
+            ("RidgeClassifier", RidgeClassifier),
+        ]
+        self.param_map = {
+            "BernoulliNB": {"alpha": [-1.0]},
+            "RidgeClassifier": {"alpha": [0.1, 1.0, 10.0]},
+        }
+
+    def test_grid_events(self):
+        """
+        Test the events of a grid search with a failing algorithm
+
+        Expected
+        -----------------
+        candidate_end : one per candidate and fold, with durations
+        failure : BernoulliNB with a negative alpha
+        incumbent : RidgeClassifier
+        jsonl : one JSON object per event, first and last the
+        search start and end
+        """
+        counter, stream = CounterSink(), io.StringIO()
+        with SearchEvents([counter, JsonLinesSink(stream)]) as events:
+            search_models(
+                self.estimators,
+                self.param_map,
+                self.x,
+                self.y,
+                3,
+                "accuracy",
+                classifier=True,
+                events=events,
+            )
+
+        self.assertEqual(counter.counts["algorithm_start"], 2)
+        self.assertEqual(counter.counts["algorithm_end"], 2)
+        self.assertEqual(counter.folds, {"BernoulliNB": 3, "RidgeClassifier": 9})
+        self.assertGreater(counter.fit_time["RidgeClassifier"], 0.0)
+        self.assertEqual(list(counter.failures), ["BernoulliNB"])
+        self.assertEqual(events.incumbent[0], "RidgeClassifier")
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(lines), sum(counter.counts.values()))
+        self.assertEqual(lines[0]["event"], "search_start")
+        self.assertEqual(lines[-1]["event"], "search_end")
+        self.assertEqual(lines[-1]["best_algorithm"], "RidgeClassifier")
+        self.assertEqual(lines[-1]["n_failed"], 1)
+        scores = [
+            line["score"]
+            for line in lines
+            if line["event"] == "candidate_end" and line["algorithm"] == "BernoulliNB"
+        ]
+        self.assertEqual(scores, [None] * 3)
+
+    def test_jsonl_file(self):
+        """
+        Test writing the events to a path
+
+        Expected
+        -----------------
+        pathlib.Path : opened and closed by the sink
+        NumPy parameters : written as JSON numbers and lists
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / "events.jsonl"
+            sink = JsonLinesSink(path)
+            sink(
+                {
+                    "event": "incumbent",
+                    "params": {"max_depth": np.int64(3), "alpha": np.arange(2)},
+                }
+            )
+            sink.close()
+            self.assertTrue(sink.file.closed)
+            line = json.loads(path.read_text())
+        self.assertEqual(line["params"], {"max_depth": 3, "alpha": [0, 1]})
+
+    def test_halving_events(self):
+        """
+        Test the events of a halving search
+
+        Expected
+        -----------------
+        events : the same start and end events as the grid search
+        """
+        counter = CounterSink()
+        with SearchEvents([counter]) as events:
+            search_models(
+                self.estimators[1:],
+                self.param_map,
+                self.x,
+                self.y,
+                3,
+                "accuracy",
+                classifier=True,
+                search="halving",
+                events=events,
+            )
+        self.assertEqual(counter.counts["search_start"], 1)
+        self.assertEqual(counter.counts["algorithm_end"], 1)
+        self.assertEqual(counter.counts["incumbent"], 1)
+        self.assertGreater(counter.folds["RidgeClassifier"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
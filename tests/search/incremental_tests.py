@@ -0,0 +1,99 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+import numpy as np
+from sklearn import datasets
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDRegressor
+from sklearn.neighbors import KNeighborsClassifier
+
+from simple_learn.search.incremental import update_estimator, update_path
+
+
+class TestIncremental(unittest.TestCase):
+    """
+    Tests for updating fitted models with new samples
+    """
+
+    def setUp(self):
+        iris = datasets.load_iris()
+        order = np.random.RandomState(0).permutation(len(iris.target))
+        self.x = iris.data[order]
+        self.y = iris.target[order]
+
+    def test_warm_start(self):
+        """
+        Test adding trees to a fitted forest
+
+        Expected
+        -----------------
+        path : warm_start with every known class, refit otherwise
+        forest : grown by the growth fraction, old trees kept
+        """
+        forest = RandomForestClassifier(n_estimators=10, random_state=0)
+        forest.fit(self.x[:100], self.y[:100])
+        trees = list(forest.estimators_)
+
+        forest, path, _ = update_estimator(
+            forest, self.x[100:], self.y[100:], growth=0.5
+        )
+        self.assertEqual(path, "warm_start")
+        self.assertEqual(len(forest.estimators_), 15)
+        self.assertEqual(forest.estimators_[:10], trees)
+
+        self.assertEqual(update_path(forest, self.y[self.y < 2]), "refit")
+
+    def test_partial_fit_and_refit(self):
+        """
+        Test the partial_fit and refit paths
+
+        Expected
+        -----------------
+        SGDRegressor : partial_fit on the same model
+        KNeighborsClassifier : refit clone with the same parameters on
+        the previous and new samples, warned about without the previous
+        samples
+        """
+        sgd = SGDRegressor(random_state=0).fit(self.x[:100], self.y[:100])
+        updated, path, _ = update_estimator(sgd, self.x[100:], self.y[100:])
+        self.assertEqual(path, "partial_fit")
+        self.assertIs(updated, sgd)
+
+        knn = KNeighborsClassifier(n_neighbors=3).fit(self.x[:100], self.y[:100])
+        updated, path, _ = update_estimator(
+            knn,
+            self.x[100:],
+            self.y[100:],
+            train_x=self.x[:100],
+            train_y=self.y[:100],
+        )
+        self.assertEqual(path, "refit")
+        self.assertEqual(updated.n_neighbors, 3)
+        self.assertEqual(updated.n_samples_fit_, 150)
+
+        with self.assertWarns(UserWarning):
+            updated, _, _ = update_estimator(knn, self.x[100:], self.y[100:])
+        self.assertEqual(updated.n_samples_fit_, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
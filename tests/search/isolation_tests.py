@@ -0,0 +1,204 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from sklearn import datasets
+from sklearn.linear_model import RidgeClassifier
+
+from simple_learn.search import SearchScheduler, search_models
+from simple_learn.search.search_result import ModelSearchResult
+
+
+class SlowClassifier(RidgeClassifier):
+    def fit(self, X, y, sample_weight=None):
+        time.sleep(30)
+        return super().fit(X, y, sample_weight=sample_weight)
+
+
+class NapClassifier(RidgeClassifier):
+    def fit(self, X, y, sample_weight=None):
+        time.sleep(1.5)
+        return super().fit(X, y, sample_weight=sample_weight)
+
+
+class CrashClassifier(RidgeClassifier):
+    def fit(self, X, y, sample_weight=None):
+        os._exit(1)
+
+
+class TestIsolation(unittest.TestCase):
+    """
+    Tests for the timeout and crash isolation of model algorithms
+    """
+
+    def setUp(self):
+        iris = datasets.load_iris()
+        self.x = iris.data
+        self.y = iris.target
+        self.param_map = {
+            "SlowClassifier": {"alpha": [1.0]},
+            "CrashClassifier": {"alpha": [1.0]},
+            "RidgeClassifier": {"alpha": [0.1, 1.0]},
+        }
+
+    def search(self, estimators, search):
+        return search_models(
+            estimators,
+            self.param_map,
+            self.x,
+            self.y,
+            3,
+            "accuracy",
+            classifier=True,
+            search=search,
+            algorithm_timeout=2,
+        )
+
+    def test_timeout(self):
+        """
+        Test stopping a model algorithm that overruns its timeout
+
+        Expected
+        -----------------
+        SlowClassifier : fails with a TimeoutError
+        RidgeClassifier : completes its search
+        """
+        for search in ["grid", "halving"]:
+            start = time.time()
+            results = self.search(
+                [
+                    ("SlowClassifier", SlowClassifier),
+                    ("RidgeClassifier", RidgeClassifier),
+                ],
+                search,
+            )
+            self.assertLess(time.time() - start, 25)
+            self.assertIsInstance(results[0].error, TimeoutError)
+            self.assertIsNone(results[1].error)
+            self.assertIsNotNone(results[1].best_estimator_)
+
+    def test_parallel_timeout(self):
+        """
+        Test timing a model algorithm whose folds run in parallel
+
+        Expected
+        -----------------
+        NapClassifier : completes, its folds and refit take less
+        wall-clock time than the timeout
+        search_duration : the wall-clock time, less than the summed
+        durations of the parallel folds and the refit
+        """
+        results = [ModelSearchResult("NapClassifier", NapClassifier, [{}], 3)]
+        with SearchScheduler(
+            self.x, self.y, 3, "accuracy", True, n_jobs=3, algorithm_timeout=4
+        ) as scheduler:
+            scheduler.run(results)
+        self.assertIsNone(results[0].error)
+        self.assertIsNotNone(results[0].best_estimator_)
+        summed = results[0].fit_times.sum() + results[0].refit_time_
+        self.assertGreaterEqual(results[0].search_duration, 3.0)
+        self.assertLess(results[0].search_duration, summed)
+
+    def test_time_budget(self):
+        """
+        Test abandoning a running halving search once the time
+        budget runs out
+
+        Expected
+        -----------------
+        RidgeClassifier : completes its search
+        SlowClassifier : truncated with a TimeoutError
+        duration : bounded by the time budget
+        """
+        start = time.time()
+        results = search_models(
+            [("RidgeClassifier", RidgeClassifier), ("SlowClassifier", SlowClassifier)],
+            self.param_map,
+            self.x,
+            self.y,
+            3,
+            "accuracy",
+            classifier=True,
+            search="halving",
+            time_budget=5,
+        )
+        self.assertLess(time.time() - start, 15)
+        self.assertIsNone(results[0].error)
+        self.assertTrue(results[1].truncated)
+        self.assertIsInstance(results[1].error, TimeoutError)
+
+    def test_shared_cleanup(self):
+        """
+        Test removing the shared dataset of a halving search whose
+        last model algorithm times out
+
+        Expected
+        -----------------
+        shared dataset : removed when the time budget runs out before
+        any worker starts and when the worker of the last model
+        algorithm is killed
+        """
+        for time_budget, algorithm_timeout in [(0, None), (None, 2)]:
+            with tempfile.TemporaryDirectory() as directory:
+                with mock.patch("tempfile.tempdir", directory):
+                    results = search_models(
+                        [("SlowClassifier", SlowClassifier)],
+                        self.param_map,
+                        self.x,
+                        self.y,
+                        3,
+                        "accuracy",
+                        classifier=True,
+                        search="halving",
+                        time_budget=time_budget,
+                        algorithm_timeout=algorithm_timeout,
+                    )
+                self.assertIsInstance(results[0].error, TimeoutError)
+                self.assertEqual(os.listdir(directory), [])
+
+    def test_crash(self):
+        """
+        Test recovering from a model algorithm that crashes its worker
+
+        Expected
+        -----------------
+        CrashClassifier : fails with the error of the crash
+        RidgeClassifier : completes its search
+        """
+        for search in ["grid", "halving"]:
+            results = self.search(
+                [
+                    ("CrashClassifier", CrashClassifier),
+                    ("RidgeClassifier", RidgeClassifier),
+                ],
+                search,
+            )
+            self.assertIsInstance(results[0].error, BrokenProcessPool)
+            self.assertIsNone(results[1].error)
+            self.assertIsNotNone(results[1].best_estimator_)
+
+
+if __name__ == "__main__":
+    unittest.main()
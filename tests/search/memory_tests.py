@@ -0,0 +1,215 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+from unittest import mock
+
+import numpy as np
+from sklearn import datasets
+from sklearn.linear_model import RidgeClassifier, SGDClassifier
+
+from simple_learn.search import SearchScheduler, search_models
+from simple_learn.search.memory import (
+    current_rss,
+    estimate_footprint,
+    peak_rss,
+    plan_rows,
+    reset_peak,
+)
+from simple_learn.search.search_result import ModelSearchResult
+
+
+class TestMemory(unittest.TestCase):
+    """
+    Tests for measuring and budgeting the memory of a search
+    """
+
+    def setUp(self):
+        iris = datasets.load_iris()
+        self.x = iris.data
+        self.y = iris.target
+        self.param_map = {"RidgeClassifier": {"alpha": [0.1, 1.0]}}
+
+    @unittest.skipIf(current_rss() is None, "requires /proc/self/status")
+    def test_peak_rss(self):
+        """
+        Test measuring the peak of the current process
+
+        Expected
+        -----------------
+        peak : includes a 64 MiB array, dropped by reset_peak
+        """
+        before = current_rss()
+        values = np.ones(8 * 2**20)
+        del values
+        self.assertGreaterEqual(peak_rss(), before + 60 * 2**20)
+        if reset_peak():
+            self.assertLess(peak_rss(), before + 60 * 2**20)
+
+    def test_estimate_footprint(self):
+        """
+        Test the footprint estimate of forests
+
+        Expected
+        -----------------
+        n_estimators : the footprint grows with the number of trees
+        max_depth : bounds the number of nodes of every tree
+        """
+        small = estimate_footprint(
+            "RandomForestClassifier", {"n_estimators": 10}, 1000, 10
+        )
+        large = estimate_footprint(
+            "RandomForestClassifier", {"n_estimators": 100}, 1000, 10
+        )
+        shallow = estimate_footprint(
+            "RandomForestClassifier", {"n_estimators": 100, "max_depth": 2}, 1000, 10
+        )
+        self.assertGreater(large, 5 * small)
+        self.assertLess(shallow, small)
+
+    def test_plan_rows(self):
+        """
+        Test planning the samples a fit holds in memory
+
+        Expected
+        -----------------
+        enough memory : every sample
+        less memory : the largest number of samples that fits
+        no memory : no sample
+        """
+        full = estimate_footprint("RidgeClassifier", {}, 1000, 10)
+        self.assertEqual(plan_rows("RidgeClassifier", {}, 1000, 10, full), 1000)
+        rows = plan_rows("RidgeClassifier", {}, 1000, 10, full // 4)
+        self.assertEqual(rows, 250)
+        self.assertEqual(plan_rows("RidgeClassifier", {}, 1000, 10, 0), 0)
+
+    @unittest.skipIf(current_rss() is None, "requires /proc/self/status")
+    def test_larger_than_memory(self):
+        """
+        Test searching folds that don't fit in the memory budget
+
+        Expected
+        -----------------
+        RidgeClassifier : fit on a subsample of the fold
+        SGDClassifier : streamed in batches of the fold
+        results : produced for both
+        """
+        rng = np.random.RandomState(0)
+        train_x = rng.rand(60000, 50)
+        train_y = (train_x[:, 0] > 0.5).astype(int)
+        results = [
+            ModelSearchResult("RidgeClassifier", RidgeClassifier, [{"alpha": 1.0}], 3),
+            ModelSearchResult("SGDClassifier", SGDClassifier, [{"alpha": 1e-4}], 3),
+        ]
+        budget = current_rss() + 16 * 2**20
+        with SearchScheduler(
+            train_x, train_y, 3, "accuracy", True, memory_budget=budget
+        ) as scheduler:
+            scheduler.run(results)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertLess(result.sample_rows, 40000)
+            self.assertGreater(result.best_score_, 0.8)
+
+    def test_peak_memory(self):
+        """
+        Test measuring the peak memory of every model algorithm
+
+        Expected
+        -----------------
+        peak_memory : measured for the model algorithm and its worker
+        """
+        results = [
+            ModelSearchResult("RidgeClassifier", RidgeClassifier, [{"alpha": 1.0}], 3)
+        ]
+        with SearchScheduler(self.x, self.y, 3, "accuracy", True) as scheduler:
+            scheduler.run(results)
+        if current_rss() is not None:
+            self.assertGreater(results[0].peak_memory, 0)
+            self.assertEqual(
+                max(scheduler.worker_peaks.values()), results[0].peak_memory
+            )
+
+    def test_memory_budget(self):
+        """
+        Test skipping the candidates that can't fit the memory budget
+
+        Expected
+        -----------------
+        grid : fails with a MemoryError
+        halving : fails with a MemoryError
+        """
+        for search in ["grid", "halving"]:
+            results = search_models(
+                [("RidgeClassifier", RidgeClassifier)],
+                self.param_map,
+                self.x,
+                self.y,
+                3,
+                "accuracy",
+                classifier=True,
+                search=search,
+                memory_budget=2**20,
+            )
+            self.assertIsInstance(results[0].error, MemoryError)
+
+    @unittest.skipIf(current_rss() is None, "requires /proc/self/status")
+    def test_partial_concurrency(self):
+        """
+        Test a memory budget that fits fewer fits than workers
+
+        Expected
+        -----------------
+        fits in flight : two of the three workers at most
+        results : produced for every candidate
+        """
+        param_grid = [{"alpha": alpha} for alpha in [0.01, 0.1, 1.0, 10.0]]
+        with SearchScheduler(
+            self.x, self.y, 3, "accuracy", True, n_jobs=3
+        ) as scheduler:
+            # A first search measures the workers the budget is set from
+            scheduler.run(
+                [ModelSearchResult("RidgeClassifier", RidgeClassifier, param_grid, 3)]
+            )
+            scheduler.memory_budget = int(2.5 * max(scheduler.worker_peaks.values()))
+
+            futures, in_flight = [], []
+            submit = scheduler._submit
+
+            def counted(task, rows):
+                futures.append(submit(task, rows))
+                in_flight.append(sum(not future.done() for future in futures))
+                return futures[-1]
+
+            results = [
+                ModelSearchResult("RidgeClassifier", RidgeClassifier, param_grid, 3)
+            ]
+            with mock.patch.object(scheduler, "_submit", counted):
+                scheduler.run(results)
+
+        self.assertEqual(scheduler.n_workers, 3)
+        self.assertEqual(max(in_flight), 2)
+        self.assertIsNone(results[0].error)
+        self.assertFalse(np.isnan(results[0].test_scores).any())
+        self.assertGreater(results[0].best_score_, 0.8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import tempfile
+import unittest
+import warnings
+
+warnings.filterwarnings("ignore")
+
+import numpy as np
+from sklearn import datasets
+from sklearn.linear_model import RidgeClassifier
+
+from simple_learn.classifiers.param_grid import model_param_map
+from simple_learn.search import ScoreCache, search_models
+
+
+class TestScoreCache(unittest.TestCase):
+    """
+    Tests for the ScoreCache Class
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ScoreCache(self.tmp_dir.name)
+        self.splits = [(np.arange(5), np.arange(5, 10))]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """
+        Test reading back a cached candidate
+
+        Expected
+        -----------------
+        entry : equal to the stored fold results
+        other params : not cached
+        """
+        key = self.cache.fingerprint(
+            np.ones((10, 2)), np.arange(10), self.splits, "accuracy", np.nan
+        )
+        params = {"alpha": 0.1}
+        self.assertIsNone(self.cache.get(key, "RidgeClassifier", params))
+        self.cache.put(key, "RidgeClassifier", params, [0.5], [0.1], [0.01])
+        entry = self.cache.get(key, "RidgeClassifier", params)
+        self.assertEqual(entry["scores"], [0.5])
+        self.assertIsNone(self.cache.get(key, "RidgeClassifier", {"alpha": 1.0}))
+
+    def test_fingerprint(self):
+        """
+        Test fingerprints of changed data and folds
+
+        Expected
+        -----------------
+        fingerprint : different for every change
+        """
+        train_x = np.ones((10, 2))
+        train_y = np.arange(10)
+        key = self.cache.fingerprint(train_x, train_y, self.splits, "accuracy", np.nan)
+        changed_x = train_x.copy()
+        changed_x[3, 1] = 2.0
+        changed_splits = [(np.arange(1, 6), np.arange(6, 10))]
+        self.assertNotEqual(
+            key,
+            self.cache.fingerprint(changed_x, train_y, self.splits, "accuracy", np.nan),
+        )
+        self.assertNotEqual(
+            key,
+            self.cache.fingerprint(
+                train_x, train_y, changed_splits, "accuracy", np.nan
+            ),
+        )
+        self.assertNotEqual(
+            key, self.cache.fingerprint(train_x, train_y, self.splits, "f1", np.nan)
+        )
+
+    def test_evict(self):
+        """
+        Test eviction of a cache above its size limit
+
+        Expected
+        -----------------
+        most recent entry : kept
+        least recent entry : evicted
+        """
+        for i in range(10):
+            self.cache.put("key", "RidgeClassifier", {"alpha": i}, [0.5], [0.1], [0.0])
+            path = self.cache._path("key", "RidgeClassifier", {"alpha": i})
+            os.utime(path, (i, i))
+        self.cache.max_bytes = os.path.getsize(path) * 3
+        self.cache.evict()
+        self.assertIsNotNone(self.cache.get("key", "RidgeClassifier", {"alpha": 9}))
+        self.assertIsNone(self.cache.get("key", "RidgeClassifier", {"alpha": 0}))
+
+    def test_search_reuses_scores(self):
+        """
+        Test a repeated search on the same data
+
+        Expected
+        -----------------
+        fold results : read from cache on the second search
+        search duration : only the refit of the second search
+        """
+        wine = datasets.load_wine()
+        estimators = [("RidgeClassifier", RidgeClassifier)]
+        first, second = [
+            search_models(
+                estimators,
+                model_param_map,
+                wine.data,
+                wine.target,
+                3,
+                "accuracy",
+                classifier=True,
+                cache=self.cache,
+            )[0]
+            for _ in range(2)
+        ]
+        np.testing.assert_array_equal(first.fit_times, second.fit_times)
+        self.assertEqual(first.best_params_, second.best_params_)
+        self.assertTrue(second.cached.all())
+        self.assertGreaterEqual(second.search_duration, second.refit_time_)
+        self.assertLess(second.search_duration, first.search_duration)
+
+
+if __name__ == "__main__":
+    unittest.main()
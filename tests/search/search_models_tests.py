@@ -0,0 +1,286 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import unittest
+import warnings
+
+warnings.filterwarnings("ignore")
+
+import numpy as np
+from sklearn import datasets
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import Perceptron, RidgeClassifier
+from sklearn.model_selection import GridSearchCV
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+
+from simple_learn.classifiers.param_grid import model_param_map
+from simple_learn.regressors.param_grid import (
+    model_param_map as regressor_param_map,
+)
+from simple_learn.search import search_models
+from simple_learn.search.scoring import classifier_scoring
+
+
+class TestSearchModels(unittest.TestCase):
+    """
+    Tests for the shared model algorithm search
+    """
+
+    def test_matches_grid_search(self):
+        """
+        Test scheduled grid search against sklearn GridSearchCV
+
+        Expected
+        -----------------
+        best params : equal for every model algorithm
+        mean test score : equal for every candidate
+        """
+        wine = datasets.load_wine()
+        estimators = [
+            ("KNeighborsClassifier", KNeighborsClassifier),
+            ("Perceptron", Perceptron),
+            ("RidgeClassifier", RidgeClassifier),
+        ]
+        results = search_models(
+            estimators,
+            model_param_map,
+            wine.data,
+            wine.target,
+            3,
+            "accuracy",
+            classifier=True,
+        )
+        for result, (name, EstimatorClass) in zip(results, estimators):
+            grid = GridSearchCV(
+                EstimatorClass(), model_param_map[name], cv=3, scoring="accuracy"
+            )
+            grid.fit(wine.data, wine.target)
+            self.assertEqual(result.name, name)
+            self.assertIsNone(result.error)
+            self.assertEqual(result.best_params_, grid.best_params_)
+            np.testing.assert_allclose(
+                result.cv_results_["mean_test_score"],
+                grid.cv_results_["mean_test_score"],
+            )
+            self.assertIsNotNone(result.best_estimator_)
+
+    def test_multi_metric(self):
+        """
+        Test single pass multi metric search against sklearn
+        GridSearchCV with the same metrics
+
+        Expected
+        -----------------
+        mean test score : equal for every candidate and metric
+        best scores : the mean scores of the best candidate
+        """
+        wine = datasets.load_wine()
+        estimators = [
+            ("KNeighborsClassifier", KNeighborsClassifier),
+            ("RidgeClassifier", RidgeClassifier),
+        ]
+        results = search_models(
+            estimators,
+            model_param_map,
+            wine.data,
+            wine.target,
+            3,
+            classifier_scoring,
+            classifier=True,
+            refit="auto",
+        )
+        for result, (name, EstimatorClass) in zip(results, estimators):
+            grid = GridSearchCV(
+                EstimatorClass(),
+                model_param_map[name],
+                cv=3,
+                scoring=classifier_scoring,
+                refit="auto",
+            )
+            grid.fit(wine.data, wine.target)
+            self.assertEqual(result.best_params_, grid.best_params_)
+            for metric in classifier_scoring:
+                np.testing.assert_allclose(
+                    result.cv_results_[f"mean_test_{metric}"],
+                    grid.cv_results_[f"mean_test_{metric}"],
+                )
+            best_scores = result.best_scores()
+            self.assertEqual(best_scores["auto"], result.best_score_)
+            self.assertAlmostEqual(
+                best_scores["f1"], grid.cv_results_["mean_test_f1"][grid.best_index_]
+            )
+
+    def test_neighbor_graph(self):
+        """
+        Test neighbor graph scoring of the KNeighborsRegressor grid
+        against sklearn GridSearchCV with the benchmarked algorithm
+
+        Expected
+        -----------------
+        algorithm : a single benchmarked algorithm
+        mean test score : equal for every candidate
+        """
+        diabetes = datasets.load_diabetes()
+        name = "KNeighborsRegressor"
+        result = search_models(
+            [(name, KNeighborsRegressor)],
+            regressor_param_map,
+            diabetes.data,
+            diabetes.target,
+            3,
+            "neg_root_mean_squared_error",
+            classifier=False,
+            error_score="raise",
+        )[0]
+        algorithms = {params["algorithm"] for params in result.candidates}
+        self.assertEqual(len(algorithms), 1)
+
+        param_grid = dict(regressor_param_map[name], algorithm=list(algorithms))
+        grid = GridSearchCV(
+            KNeighborsRegressor(),
+            param_grid,
+            cv=3,
+            scoring="neg_root_mean_squared_error",
+        )
+        grid.fit(diabetes.data, diabetes.target)
+        self.assertEqual(result.best_params_, grid.best_params_)
+        np.testing.assert_allclose(
+            result.cv_results_["mean_test_score"],
+            grid.cv_results_["mean_test_score"],
+        )
+
+    def test_deferred_refit(self):
+        """
+        Test search without refitting the best candidates
+
+        Expected
+        -----------------
+        best estimator : None until refit_best
+        """
+        iris = datasets.load_iris()
+        result = search_models(
+            [("RidgeClassifier", RidgeClassifier)],
+            model_param_map,
+            iris.data,
+            iris.target,
+            3,
+            "accuracy",
+            classifier=True,
+            defer_refit=True,
+        )[0]
+        self.assertIsNone(result.best_estimator_)
+        self.assertIsNone(result.refit_time_)
+
+        estimator = result.refit_best(iris.data, iris.target)
+        self.assertIs(result.best_estimator_, estimator)
+        self.assertEqual(estimator.get_params()["alpha"], result.best_params_["alpha"])
+        self.assertIsNotNone(result.refit_time_)
+
+    def test_failed_model(self):
+        """
+        Test scheduled grid search with an invalid hyper-parameter grid
+
+        Expected
+        -----------------
+        error : Not None
+        """
+        iris = datasets.load_iris()
+        results = search_models(
+            [("Perceptron", Perceptron)],
+            {"Perceptron": {"alpha": [-1.0]}},
+            iris.data,
+            iris.target,
+            3,
+            "accuracy",
+            classifier=True,
+            error_score="raise",
+        )
+        self.assertIsNotNone(results[0].error)
+
+    def test_time_budget(self):
+        """
+        Test scheduled grid search with a time budget far below
+        the duration of the full search
+
+        Expected
+        -----------------
+        truncated : True
+        duration : bounded by the time budget
+        """
+        digits = datasets.load_digits()
+        estimators = [
+            ("RandomForestClassifier", RandomForestClassifier),
+            ("RidgeClassifier", RidgeClassifier),
+        ]
+        start = time.time()
+        results = search_models(
+            estimators,
+            model_param_map,
+            digits.data,
+            digits.target,
+            3,
+            "accuracy",
+            classifier=True,
+            time_budget=5,
+        )
+        self.assertLess(time.time() - start, 60)
+        forest = results[0]
+        self.assertTrue(forest.truncated)
+        if forest.error is None:
+            self.assertIsNotNone(forest.best_estimator_)
+        else:
+            self.assertIsInstance(forest.error, TimeoutError)
+
+    def test_adaptive(self):
+        """
+        Test adaptive search against sklearn wine dataset
+
+        Expected
+        -----------------
+        candidates : at most n_iter per model algorithm
+        best score : > 0.9
+        """
+        wine = datasets.load_wine()
+        estimators = [
+            ("KNeighborsClassifier", KNeighborsClassifier),
+            ("Perceptron", Perceptron),
+            ("RidgeClassifier", RidgeClassifier),
+        ]
+        results = search_models(
+            estimators,
+            model_param_map,
+            wine.data,
+            wine.target,
+            3,
+            "accuracy",
+            classifier=True,
+            search="adaptive",
+            n_iter=8,
+        )
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertLessEqual(len(result.candidates), 8)
+            self.assertIsNotNone(result.best_estimator_)
+        self.assertTrue(results[2].best_score_ > 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+
+from simple_learn.search import SharedDataset
+from simple_learn.search.shared_data import fit_rows, open_data, prepare_data
+
+
+class TestSharedData(unittest.TestCase):
+    """
+    Tests for the shared dataset of the search workers
+    """
+
+    def test_prepare_data(self):
+        """
+        Test converting features once before the search
+
+        Expected
+        -----------------
+        dense features : C contiguous float64
+        sparse features : CSR float64
+        finite : False with a NaN feature
+        """
+        train_x, train_y, finite = prepare_data(
+            np.asfortranarray(np.arange(12).reshape(6, 2)), [0, 1, 0, 1, 0, 1]
+        )
+        self.assertEqual(train_x.dtype, np.float64)
+        self.assertTrue(train_x.flags["C_CONTIGUOUS"])
+        self.assertTrue(finite)
+
+        train_x, _, _ = prepare_data(sp.coo_matrix(np.eye(6, dtype=int)), np.ones(6))
+        self.assertEqual(train_x.format, "csr")
+        self.assertEqual(train_x.dtype, np.float64)
+
+        _, _, finite = prepare_data([[0.0], [np.nan]], [0, 1])
+        self.assertFalse(finite)
+
+    def test_shared_dataset(self):
+        """
+        Test publishing and attaching the dataset
+
+        Expected
+        -----------------
+        attached features : read-only memory map equal to the features
+        close : removes the published dataset
+        """
+        train_x = np.random.RandomState(0).rand(100, 4)
+        train_y = np.arange(100)
+        with SharedDataset(train_x, train_y) as dataset:
+            shared_x, shared_y = dataset.attach()
+            self.assertIsInstance(shared_x, np.memmap)
+            self.assertFalse(shared_x.flags["WRITEABLE"])
+            np.testing.assert_array_equal(shared_x, train_x)
+            np.testing.assert_array_equal(shared_y, train_y)
+        self.assertFalse(os.path.exists(dataset.directory))
+
+    def test_memory_mapped_input(self):
+        """
+        Test searching .npy files without loading them
+
+        Expected
+        -----------------
+        opened features : memory map of the file
+        subsample : max_samples samples in file order
+        published features : attached to the original file
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            x_path = os.path.join(tmp_dir, "x.npy")
+            y_path = os.path.join(tmp_dir, "y.npy")
+            np.save(x_path, np.arange(200.0).reshape(100, 2))
+            np.save(y_path, np.arange(100))
+
+            train_x, train_y = open_data(x_path, y_path)
+            self.assertIsInstance(train_x, np.memmap)
+            train_x, train_y, finite = prepare_data(train_x, train_y)
+            self.assertIsInstance(train_x, np.memmap)
+            self.assertTrue(finite)
+
+            with SharedDataset(train_x, train_y) as dataset:
+                self.assertEqual(dataset.handles[0][0], "memmap")
+                self.assertEqual(os.listdir(dataset.directory), [])
+                shared_x, _ = dataset.attach()
+                np.testing.assert_array_equal(shared_x, train_x)
+
+            sample_x, sample_y = open_data(x_path, y_path, max_samples=10)
+            self.assertEqual(len(sample_x), 10)
+            np.testing.assert_array_equal(sample_x[:, 0], 2 * sample_y)
+            self.assertTrue((np.diff(sample_y) > 0).all())
+            del train_x, train_y, shared_x
+
+    def test_fit_rows(self):
+        """
+        Test fitting on more samples than are held in memory
+
+        Expected
+        -----------------
+        partial_fit : trained on every sample in batches
+        fit : trained on a subsample of rows samples
+        """
+        train_x = np.arange(200.0).reshape(100, 2)
+        train_y = np.arange(100) % 2
+        indices = np.arange(100)
+
+        streamed = fit_rows(
+            GaussianNB(), train_x, train_y, indices, 30, classes=np.array([0, 1])
+        )
+        self.assertEqual(streamed.class_count_.sum(), 100)
+
+        sampled = fit_rows(KNeighborsClassifier(), train_x, train_y, indices, 30)
+        self.assertEqual(sampled.n_samples_fit_, 30)
+
+        full = fit_rows(KNeighborsClassifier(), train_x, train_y, indices, None)
+        self.assertEqual(full.n_samples_fit_, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+import numpy as np
+from sklearn import datasets
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import BernoulliNB
+
+from simple_learn.search import StreamSearch
+from simple_learn.search.scoring import classifier_scoring
+
+
+class TestStreamSearch(unittest.TestCase):
+    """
+    Tests for the single pass search over a stream of batches
+    """
+
+    def setUp(self):
+        iris = datasets.load_iris()
+        order = np.random.RandomState(0).permutation(len(iris.target))
+        self.x = iris.data[order]
+        self.y = iris.target[order]
+        self.batches = [
+            (self.x[i : i + 30], self.y[i : i + 30]) for i in range(0, 150, 30)
+        ]
+
+    def test_stream(self):
+        """
+        Test training every candidate in one pass over the batches
+
+        Expected
+        -----------------
+        candidates : every one scored on the holdouts
+        best estimator : the streamed candidate, no refit
+        failed candidate : error score, the others still ranked
+        """
+        search = StreamSearch(
+            [("SGDClassifier", SGDClassifier), ("BernoulliNB", BernoulliNB)],
+            {
+                "SGDClassifier": {"alpha": [0.0001, 0.01, -1.0]},
+                "BernoulliNB": {"alpha": [0.1, 1.0]},
+            },
+            classifier_scoring,
+            classes=np.unique(self.y),
+            refit="auto",
+        )
+        results = search.run(iter(self.batches))
+        self.assertEqual(search.n_batches, 5)
+
+        sgd, bernoulli = results
+        self.assertIsNone(sgd.error)
+        self.assertTrue(np.isnan(sgd.test_scores[2, 0]))
+        self.assertFalse(np.isnan(sgd.test_scores[:2]).any())
+        self.assertEqual(sorted(sgd.best_scores()), ["auto", "f1", "jaccard"])
+        self.assertIs(
+            sgd.best_estimator_, search._models[0][sgd.best_index_]["estimator"]
+        )
+        self.assertEqual(bernoulli.test_scores.shape, (2, 1))
+
+    def test_holdout(self):
+        """
+        Test the holdout fraction validation
+
+        Expected
+        -----------------
+        holdout of 1 : raises ValueError
+        """
+        with self.assertRaises(ValueError):
+            StreamSearch([], {}, "accuracy", holdout=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
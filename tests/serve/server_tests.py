@@ -0,0 +1,128 @@
+# Copyright (c) 2020 Sharvil Kekre skekre98
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import http.client
+import io
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sklearn import datasets
+from sklearn.ensemble import RandomForestClassifier
+
+from simple_learn.classifiers import SimpleClassifier
+from simple_learn.serve import ModelServer
+from simple_learn.serve.server import npy_type
+
+
+class TestModelServer(unittest.TestCase):
+    """
+    Tests for the micro-batching inference server
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.x, y = datasets.load_iris(return_X_y=True)
+        clf = SimpleClassifier()
+        clf.name = "RandomForestClassifier"
+        clf.sk_model = RandomForestClassifier(10, random_state=0).fit(cls.x, y)
+        cls.expected = clf.predict(cls.x)
+
+        cls.server = ModelServer({"iris": clf}, max_batch_size=32, max_wait=0.05)
+        cls.loop = asyncio.new_event_loop()
+        threading.Thread(target=cls.loop.run_forever, daemon=True).start()
+        server = asyncio.run_coroutine_threadsafe(
+            cls.server.start(port=0), cls.loop
+        ).result()
+        cls.port = server.sockets[0].getsockname()[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.server.server.close)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+
+    def request(self, method, path, body=None, headers={}):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.getheader("Content-Type"), response.read()
+        finally:
+            connection.close()
+
+    def test_batching(self):
+        """
+        Test predicting concurrent single rows
+
+        Expected
+        -----------------
+        predictions : one per row, equal to predict
+        batches : fewer than requests
+        """
+        batches = self.server.predictors["iris"].batches
+
+        def predict(row):
+            _, _, body = self.request(
+                "POST", "/models/iris/predict", json.dumps(row.tolist())
+            )
+            return json.loads(body)["predictions"][0]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            predictions = list(executor.map(predict, self.x[:64]))
+        self.assertEqual(predictions, self.expected[:64].tolist())
+        self.assertLess(self.server.predictors["iris"].batches - batches, 64)
+
+        _, _, body = self.request("GET", "/stats")
+        self.assertGreater(json.loads(body)["iris"]["mean_batch_size"], 1.0)
+
+    def test_binary_and_errors(self):
+        """
+        Test .npy bodies and error statuses
+
+        Expected
+        -----------------
+        .npy request : .npy predictions
+        unknown model : 404
+        wrong number of features : 400
+        """
+        buffer = io.BytesIO()
+        np.save(buffer, self.x[:10])
+        status, content_type, body = self.request(
+            "POST",
+            "/models/iris/predict",
+            buffer.getvalue(),
+            {"Content-Type": npy_type},
+        )
+        self.assertEqual((status, content_type), (200, npy_type))
+        np.testing.assert_array_equal(np.load(io.BytesIO(body)), self.expected[:10])
+
+        status, _, body = self.request("GET", "/models")
+        self.assertEqual(json.loads(body)["iris"]["Type"], "RandomForestClassifier")
+        self.assertEqual(self.request("POST", "/models/none/predict", "[1]")[0], 404)
+        self.assertEqual(
+            self.request("POST", "/models/iris/predict", "[[1, 2]]")[0], 400
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()